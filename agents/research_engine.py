@@ -6,37 +6,18 @@ Research Engine - Simple Tavily Integration
 Basic research engine for the interview prep workflow
 """
 
-import os
 from typing import List, Dict, Any
 
 def search_tavily(query: str, search_depth: str = "basic", max_results: int = 5) -> List[Dict[str, Any]]:
     """
     Simple Tavily search function
-    This is a basic implementation that can be expanded
+    Uses the shared, cached search client in shared/tavily_client.py
     """
     try:
-        # Import tavily client if available
-        from tavily import TavilyClient
+        from shared.tavily_client import get_search_client
         
-        api_key = os.getenv('TAVILY_API_KEY')
-        if not api_key:
-            print("⚠️ TAVILY_API_KEY not found in environment variables")
-            return []
+        return get_search_client().search(query, max_results=max_results, search_depth=search_depth)
         
-        client = TavilyClient(api_key=api_key)
-        
-        # Perform search
-        response = client.search(
-            query=query,
-            search_depth=search_depth,
-            max_results=max_results
-        )
-        
-        return response.get('results', [])
-        
-    except ImportError:
-        print("⚠️ Tavily client not installed. Install with: pip install tavily-python")
-        return []
     except Exception as e:
         print(f"❌ Tavily search error: {str(e)}")
         return []
@@ -19,7 +19,7 @@ from pathlib import Path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from shared.openai_client import get_openai_client, generate_text
-from agents.research_engine.tavily_client import search_tavily
+from shared.tavily_client import get_search_client
 
 class IntelligentResearchEngine:
     """
@@ -219,7 +219,7 @@ Keep queries practical for LinkedIn/professional search."""
         for query in queries:
             try:
                 print(f"   🔍 Intelligent search: {query[:50]}...")
-                search_results = search_tavily(query, max_results=3)
+                search_results = get_search_client().search(query, max_results=3)
                 
                 for result in search_results:
                     if self._validate_enhanced_result(result, query):
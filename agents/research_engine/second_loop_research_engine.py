@@ -5,6 +5,12 @@ Intelligent Second Loop Research System
 
 Analyzes prep guide content to identify gaps and automatically generates
 targeted Tavily searches to fill those gaps. No more manual research recommendations!
+
+The targeted searches run concurrently through the shared cached search
+client. Each gap's results are checked against the URLs already cited in the
+research citations_database (and those added for earlier gaps); a search
+that adds no new URL is skipped, so it produces no citation and, when no
+search adds anything, the prep guide is not regenerated.
 """
 
 import os
@@ -17,7 +23,7 @@ from pathlib import Path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from shared.openai_client import get_openai_client, generate_text
-from agents.research_engine.tavily_client import search_tavily
+from shared.tavily_client import get_search_client
 
 class SecondLoopResearchEngine:
     """
@@ -40,6 +46,7 @@ class SecondLoopResearchEngine:
         enhancement_results = {
             'gaps_identified': [],
             'new_searches_conducted': 0,
+            'searches_skipped': 0,
             'additional_citations': [],
             'content_improvements': [],
             'success': False
@@ -81,11 +88,16 @@ class SecondLoopResearchEngine:
             print(f"   🔍 Generated {len(targeted_queries)} targeted search queries")
             
             # Step 3: Execute targeted searches
-            new_research_results = self._execute_intelligent_searches(targeted_queries)
-            enhancement_results['new_searches_conducted'] = len(new_research_results)
+            search_stats = {}
+            new_research_results = self._execute_intelligent_searches(
+                targeted_queries, research_data.get('citations_database', {}), search_stats
+            )
+            enhancement_results['new_searches_conducted'] = search_stats['searches']
+            enhancement_results['searches_skipped'] = search_stats['skipped']
             print(f"   📊 Found {len(new_research_results)} additional research sources")
             
             # Step 4: Integrate results into research database
+            additional_citations = []
             if new_research_results:
                 additional_citations = self._integrate_new_research(
                     new_research_results, research_data, gaps
@@ -347,31 +359,78 @@ Focus on finding at least 2-4 actionable gaps that can improve the prep guide qu
         
         return targeted_queries[:12]  # Limit total queries
     
-    def _execute_intelligent_searches(self, targeted_queries: List[Dict[str, str]]) -> List[Dict[str, Any]]:
-        """Execute the targeted searches and return quality results"""
+    @staticmethod
+    def _normalize_url(url: str) -> str:
+        return url.strip().lower().rstrip('/')
+    
+    def _cited_urls(self, citations_database: Dict[str, Any]) -> set:
+        """URLs of the citations already in the research citations database"""
+        cited = set()
+        for citation in citations_database.values():
+            for url in re.findall(r'https?://\S+', str(citation.get('source', ''))):
+                cited.add(self._normalize_url(url))
+        return cited
+    
+    def _execute_intelligent_searches(self, targeted_queries: List[Dict[str, str]],
+                                      citations_database: Optional[Dict[str, Any]] = None,
+                                      search_stats: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+        """
+        Execute the targeted searches concurrently and return quality results
+        
+        Each distinct query is searched once, in parallel, through the cached search
+        client. Results are then taken gap by gap in query order: URLs already cited, or
+        already added for an earlier gap, are dropped before validation, and a search
+        left with no new URL is skipped. search_stats (if given) receives the number of
+        searches run, skipped and failed.
+        """
         
         results = []
+        stats = search_stats if search_stats is not None else {}
+        stats.update({'searches': 0, 'skipped': 0, 'failed': 0})
+        
+        unique_queries = list(dict.fromkeys(query_data['query'] for query_data in targeted_queries))
+        if not unique_queries:
+            return results
+        
+        print(f"   🔍 Running {len(unique_queries)} targeted searches in parallel...")
+        search_results = get_search_client().search_many(
+            unique_queries, max_results=3, search_depth="advanced", return_exceptions=True
+        )
+        results_by_query = dict(zip(unique_queries, search_results))
+        stats['searches'] = len(unique_queries)
+        
+        known_urls = self._cited_urls(citations_database or {})
         
         for query_data in targeted_queries:
             query = query_data['query']
             gap_type = query_data['gap_type']
+            search_results = results_by_query[query]
+            
+            if isinstance(search_results, Exception):
+                print(f"      ❌ Search error for '{query[:50]}': {search_results}")
+                stats['failed'] += 1
+                continue
+            
+            new_results = [r for r in search_results if self._normalize_url(r.get('url', '')) not in known_urls]
+            if not new_results:
+                print(f"   ⏭️  Skipped: {query[:50]}... (no new URLs for {gap_type})")
+                stats['skipped'] += 1
+                continue
             
-            try:
-                print(f"   🔍 Targeted search: {query[:50]}...")
-                search_results = search_tavily(query, max_results=3, search_depth="advanced")
-                
-                for result in search_results:
-                    if self._validate_targeted_result(result, gap_type, query):
-                        results.append({
-                            'query_data': query_data,
-                            'result': result,
-                            'gap_type': gap_type,
-                            'second_loop': True
-                        })
-                        print(f"      ✅ Found: {result.get('title', '')[:40]}...")
-                
-            except Exception as e:
-                print(f"      ❌ Search error: {e}")
+            print(f"   🔍 Targeted search: {query[:50]}...")
+            for result in new_results:
+                url = self._normalize_url(result.get('url', ''))
+                if url in known_urls:
+                    continue
+                if self._validate_targeted_result(result, gap_type, query):
+                    known_urls.add(url)
+                    results.append({
+                        'query_data': query_data,
+                        'result': result,
+                        'gap_type': gap_type,
+                        'second_loop': True
+                    })
+                    print(f"      ✅ Found: {result.get('title', '')[:40]}...")
         
         return results
     
@@ -3,67 +3,70 @@
 Simple Tavily Client Compatibility
 =================================
 
-Provides basic compatibility for the tavily client import
+Provides basic compatibility for the tavily client import. Searches go
+through the shared, cached client in shared/tavily_client.py, restricted to
+the domains below as they always have been here.
 """
 
-import os
 from typing import List, Dict, Any
 
+from shared.tavily_client import TavilySearchClient, get_search_client
+
+INCLUDE_DOMAINS = ["linkedin.com", "glassdoor.com", "company websites"]
+EXCLUDE_DOMAINS = ["youtube.com", "tiktok.com", "instagram.com"]
+
 def search_tavily(query: str, max_results: int = 5, search_depth: str = "advanced") -> List[Dict[str, Any]]:
     """
-    Simple Tavily search function
+    Simple Tavily search function (errors are logged and return no results)
     """
     try:
-        from tavily import TavilyClient
-        
-        api_key = os.getenv('TAVILY_API_KEY')
-        if not api_key:
-            return []
-        
-        client = TavilyClient(api_key=api_key)
-        response = client.search(
-            query=query,
-            search_depth=search_depth,
-            max_results=max_results,
-            include_domains=["linkedin.com", "glassdoor.com", "company websites"],
-            exclude_domains=["youtube.com", "tiktok.com", "instagram.com"]
-        )
-        
-        return response.get('results', [])
-        
-    except Exception:
+        return get_search_client().search(query, max_results=max_results, search_depth=search_depth,
+                                          include_domains=INCLUDE_DOMAINS, exclude_domains=EXCLUDE_DOMAINS)
+    except Exception as e:
+        print(f"❌ Tavily search error: {str(e)}")
         return []
 
 class EnhancedTavilyClient:
     """Enhanced Tavily client wrapper for compatibility"""
-    
+
     def __init__(self, api_key: str = None, cache_enabled: bool = True, cache_ttl_hours: int = 168):
-        self.api_key = api_key or os.getenv('TAVILY_API_KEY', '')
+        # A custom key gets its own client; otherwise the shared pooled client is used
+        self.client = TavilySearchClient(api_key=api_key) if api_key else get_search_client()
+        self.api_key = self.client.api_key
         self.cache_enabled = cache_enabled
         self.cache_ttl_hours = cache_ttl_hours
-    
+
+    def _search(self, query: str, search_depth: str, max_results: int) -> List[Dict[str, Any]]:
+        try:
+            return self.client.search(query, max_results=max_results, search_depth=search_depth,
+                                      use_cache=self.cache_enabled, include_domains=INCLUDE_DOMAINS,
+                                      exclude_domains=EXCLUDE_DOMAINS)
+        except Exception as e:
+            print(f"❌ Tavily search error: {str(e)}")
+            return []
+
     def search(self, query: str, search_depth: str = "basic", max_results: int = 5):
         """Search using tavily"""
-        results = search_tavily(query, search_depth, max_results)
+        results = self._search(query, search_depth, max_results)
         return {"results": results}
-    
+
     def search_general(self, query: str, max_results: int = 5):
         """General search method required by research pipeline"""
-        results = search_tavily(query, "basic", max_results)
+        results = self._search(query, "basic", max_results)
         return {"results": results}
-    
+
     def search_linkedin(self, query: str, max_results: int = 5):
         """LinkedIn-specific search method"""
         linkedin_query = f"{query} site:linkedin.com"
-        results = search_tavily(linkedin_query, "basic", max_results)
+        results = self._search(linkedin_query, "basic", max_results)
         return {"results": results}
-    
+
     def search_company(self, company_name: str, max_results: int = 5):
         """Company-specific search method"""
         company_query = f"{company_name} company website about"
-        results = search_tavily(company_query, "basic", max_results)
+        results = self._search(company_query, "basic", max_results)
         return {"results": results}
-    
+
     def get_search_context(self, query: str, search_depth: str = "basic", max_results: int = 5):
         """Get search context"""
-        return self.search(query, search_depth, max_results)
\ No newline at end of file
+        return self.search(query, search_depth, max_results)
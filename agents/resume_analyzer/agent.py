@@ -7,7 +7,7 @@ from agents.base_agent import BaseAgent, AgentInput, AgentOutput
 from agents.resume_analyzer.config import STRUCTURED_SUMMARY_PROMPT
 from agents.keyword_extractor.agent import KeywordExtractorAgent
 
-from shared.llm_client import call_llm
+from shared.llm_client import call_llm_many
 
 from langchain_community.document_loaders import PyPDFLoader, UnstructuredFileLoader, TextLoader
 from langchain.text_splitter import RecursiveCharacterTextSplitter
@@ -88,7 +88,7 @@ class ResumeAnalyzerAgent(BaseAgent):
     async def generate_structured_summary(self, resume_text: str) -> dict:
         """
         Generates a structured summary of the resume text using an LLM.
-        If the resume is too long, it is split into chunks and processed incrementally.
+        If the resume is too long, it is split into chunks that are summarized concurrently.
 
         Parameters
         ----------
@@ -105,9 +105,13 @@ class ResumeAnalyzerAgent(BaseAgent):
 
             intermediate_summaries = []
 
-            for i, chunk in enumerate(chunks):
-                prompt = STRUCTURED_SUMMARY_PROMPT.format(text=chunk)
-                response = await call_llm(prompt)
+            prompts = [STRUCTURED_SUMMARY_PROMPT.format(text=chunk) for chunk in chunks]
+            results = await call_llm_many(prompts)
+
+            for result in results:
+                if not result['success']:
+                    raise Exception(result['error'])
+                response = result['response']
                 parsed = json.loads(response)
                 intermediate_summaries.append(parsed)
 
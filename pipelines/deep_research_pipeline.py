@@ -9,19 +9,55 @@ Handles:
 4. Deep reflection loops for research quality validation
 5. Citations database management with deduplication
 6. Research sufficiency assessment for prep guide generation
+
+Research fan-out: before the agents run, every search they will make for an
+email is fetched in parallel on a bounded pool (RESEARCH_MAX_WORKERS, default
+8; 1 disables the fan-out). The agents then read their results in the fixed
+company -> role -> interviewer order, so sources, validation and citation
+numbering are identical to a sequential run while search wall time falls
+from the sum of the Tavily latencies to roughly the slowest one.
+
+Run-level query plan: plan_run_research() takes the entities of every
+interview email in a workflow run, deduplicates their searches and fetches
+them once; each email's research is then served from that shared result set
+(searches that failed are retried by the email's own fan-out).
+
+Research artifacts: each agent's finished analysis (validated sources,
+confidence, citations) is saved per entity in the research artifact store
+(shared/research_artifacts.py). While an artifact is fresh, the company, role
+or interviewer analysis is reused on its own - its searches are neither
+planned nor fetched and only the remaining dimensions are researched.
+
+Reflection follow-up: when the research is not yet sufficient for a prep
+guide, the reflection stage finds the dimensions under their thresholds
+(company or role confidence, interviewer LinkedIn profiles) and runs only
+those agents' follow-up queries, within REFLECTION_MAX_QUERIES (default 6)
+and REFLECTION_MAX_SECONDS (default 15). Only the new sources are validated
+and only the refined dimension is re-scored.
+
+Research budget: with research_budget (max_seconds, max_queries,
+target_confidence) the searches are issued in priority order, one fan-out
+batch at a time, instead of all at once. After each batch the overall
+confidence the agents would report is computed from the sources so far, and
+research stops once it reaches the target or a limit is hit; queries never
+issued contribute no sources. result['research_budget'] records why it
+stopped.
 """
 
 import os
 import sys
-from typing import Dict, List, Any, Optional
+import time
+from itertools import zip_longest
+from typing import Dict, List, Any, Iterable, Optional, Tuple
 from datetime import datetime
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Import research components
-from agents.research_engine.tavily_client import search_tavily, EnhancedTavilyClient
-from shared.simple_cache import cached_tavily_search
+from shared.research_artifacts import ARTIFACT_KINDS, artifact_key, artifacts_enabled, get_artifact_store
+from shared.tavily_client import get_search_client
+from shared.term_matcher import compile_terms
 
 
 class DeepResearchPipeline:
@@ -29,10 +65,476 @@ class DeepResearchPipeline:
     Deep Research Pipeline: Multi-agent research with reflection loops
     """
     
-    def __init__(self):
-        self.tavily_client = EnhancedTavilyClient()
+    # Tavily results requested per query in each research phase
+    QUERY_RESULT_LIMITS = {
+        'identity': 3,
+        'industry': 3,
+        'requirements': 3,
+        'skills': 2,
+        'linkedin': 4,
+        'background': 2,
+        'followup': 3
+    }
+    
+    # Citations kept per agent
+    CITATION_LIMITS = {'company': 6, 'role': 5, 'interviewer': 6}
+    
+    # Email-keyword bonus cap and validation threshold of the dimensions that score keywords
+    KEYWORD_SCORING = {'company': {'max_bonus': 3, 'threshold': 2}, 'role': {'max_bonus': 2, 'threshold': 6}}
+    
+    # Company/role confidence needed to count as high quality in the sufficiency assessment
+    SUFFICIENT_CONFIDENCE = 0.6
+    
+    # Indicator vocabularies scored by the source validators
+    BUSINESS_INDICATORS = ['company', 'business', 'startup', 'organization', 'corp', 'inc', 'about', 'mission']
+    JOB_INDICATORS = ['job', 'position', 'role', 'career', 'responsibilities', 'skills', 'requirements', 'description', 'internship']
+    JOB_SITE_DOMAINS = ['linkedin.com', 'glassdoor.com', 'indeed.com', 'monster.com', 'wellfound.com']
+    PROFESSIONAL_INDICATORS = ['profile', 'about', 'bio', 'experience', 'background', 'career']
+    
+    def __init__(self, max_workers: Optional[int] = None, research_budget: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            max_workers: Parallel searches in the research fan-out (defaults to RESEARCH_MAX_WORKERS)
+            research_budget: Optional limits per email - 'max_seconds', 'max_queries' and
+                'target_confidence' (defaults to RESEARCH_BUDGET_SECONDS, RESEARCH_BUDGET_QUERIES
+                and RESEARCH_TARGET_CONFIDENCE; unbudgeted if none is set)
+        """
+        self.search_client = get_search_client()
+        self.max_workers = max_workers if max_workers is not None else int(os.getenv('RESEARCH_MAX_WORKERS', '8'))
+        self.research_budget = research_budget if research_budget is not None else self.research_budget_from_env()
+        self._prefetched: Dict[Tuple[str, int], Any] = {}
+        self._prefetch_only = False
+        self.shared_results: Dict[Tuple[str, int], List[Dict[str, Any]]] = {}
+        self.artifact_store = get_artifact_store() if artifacts_enabled() else None
+        self.reflection_max_queries = int(os.getenv('REFLECTION_MAX_QUERIES', '6'))
+        self.reflection_max_seconds = float(os.getenv('REFLECTION_MAX_SECONDS', '15'))
         print("🔬 Deep Research Pipeline initialized with Tavily client")
     
+    def _search(self, query: str, phase: str) -> List[Dict[str, Any]]:
+        """Cached search for one research phase; a failed search yields no sources"""
+        max_results = self.QUERY_RESULT_LIMITS[phase]
+        try:
+            results = self._prefetched.get((query, max_results), self.shared_results.get((query, max_results)))
+            if results is None:
+                if self._prefetch_only:
+                    return []  # Not issued within the research budget
+                results = self.search_client.search(query, max_results=max_results)
+            elif isinstance(results, Exception):
+                raise results
+            return results
+        except Exception as e:
+            print(f"      ❌ Tavily search error: {e}")
+            return []
+    
+    def _prefetch_research(self, company: str, role: str, interviewer: str, skip: Iterable[str] = ()) -> Dict[str, Any]:
+        """
+        Run every agent search for these targets in parallel ahead of the agents
+        
+        Results (or the exception of a failed search) are kept by (query, max_results)
+        for _search; with max_workers <= 1 nothing is prefetched and the agents search
+        one query at a time. Searches already in the run-level result set, and those of
+        the dimensions in `skip`, are skipped.
+        """
+        searches = [
+            search for search in dict.fromkeys(self.research_queries(company, role, interviewer, skip))
+            if search not in self.shared_results
+        ]
+        if self.max_workers <= 1 or not searches:
+            return {'searches': 0, 'workers': 1, 'elapsed': 0.0}
+        
+        start = time.perf_counter()
+        results = self.search_client.search_many(searches, max_workers=self.max_workers, return_exceptions=True)
+        self._prefetched = dict(zip(searches, results))
+        
+        fanout = {
+            'searches': len(searches),
+            'workers': min(self.max_workers, len(searches)),
+            'failed': sum(isinstance(r, Exception) for r in results),
+            'elapsed': time.perf_counter() - start
+        }
+        print(f"\n⚡ Research fan-out: {fanout['searches']} searches on {fanout['workers']} workers "
+              f"in {fanout['elapsed']:.2f}s ({fanout['failed']} failed)")
+        return fanout
+    
+    @staticmethod
+    def company_queries(company: str) -> Dict[str, List[str]]:
+        """Search queries run by the company analysis agent, by phase"""
+        return {
+            'identity': [
+                f'"{company}" official website about',
+                f'"{company}" company overview mission',
+                f'"{company}" linkedin company page',
+                f'"{company}" crunchbase company profile',
+                f"{company} internship program careers",  # Specific for internship context
+                f"{company} startup company information"
+            ],
+            'industry': [
+                f'"{company}" industry sector business',
+                f'"{company}" market trends 2024 2025',
+                f'"{company}" recent news developments',
+                f'"{company}" technology stack products'
+            ]
+        }
+    
+    @staticmethod
+    def role_queries(role: str, company: str) -> Dict[str, List[str]]:
+        """Search queries run by the role analysis agent, by phase"""
+        return {
+            'requirements': [
+                f"{role} job description requirements {company}",
+                f"{role} skills qualifications {company}",
+                f"{role} responsibilities duties {company}",
+                f"{role} interview questions {company}"
+            ],
+            'skills': [
+                f"{role} skills demand 2024 market trends",
+                f"{role} salary range {company} industry",
+                f"{role} career progression path",
+                f"{role} technology stack tools required"
+            ]
+        }
+    
+    @staticmethod
+    def interviewer_queries(interviewer: str, company: str) -> Dict[str, List[str]]:
+        """Search queries run by the interviewer analysis agent, by phase"""
+        return {
+            'linkedin': [
+                f'"{interviewer}" linkedin profile',  # Exact name search
+                f'"{interviewer}" {company} linkedin',  # Name + company
+                f'"{interviewer}" site:linkedin.com/in',  # Direct profile search
+                f"{interviewer} {company} linkedin profile",  # Broader search
+                f"{interviewer} linkedin {company} employee",  # Employee context
+            ],
+            'background': [
+                f"{interviewer} {company} publications articles",
+                f"{interviewer} {company} speaking events",
+                f"{interviewer} {company} professional background",
+                f"{interviewer} {company} expertise experience"
+            ]
+        }
+    
+    @staticmethod
+    def followup_queries(kind: str, company: str, role: str, interviewer: str, analysis: Dict[str, Any]) -> List[str]:
+        """Reflection follow-up queries for one deficient dimension, most promising first"""
+        if kind == 'company':
+            return [
+                f'"{company}" about us team',
+                f'"{company}" founders leadership',
+                f'"{company}" glassdoor reviews'
+            ]
+        if kind == 'role':
+            return [
+                f'"{role}" "{company}" job posting',
+                f"{company} careers {role} openings",
+                f"{role} day to day work {company}"
+            ]
+        # Names extracted from company-relevant LinkedIn posts come first
+        return list(analysis.get('search_suggestions', [])) + [
+            f'"{interviewer}" "{company}" site:linkedin.com/in',
+            f'"{interviewer}" {company} team member',
+            f'"{interviewer}" {company} bio'
+        ]
+    
+    @classmethod
+    def _dimension_searches(cls, company: str, role: str, interviewer: str, skip: Iterable[str] = ()) -> List[List[Tuple[str, int]]]:
+        """(query, max_results) searches of each researched dimension, in the agent's phase order"""
+        dimensions = []
+        if company and 'company' not in skip:
+            dimensions.append(cls.company_queries(company))
+        if role and 'role' not in skip:
+            dimensions.append(cls.role_queries(role, company))
+        if interviewer and 'interviewer' not in skip:
+            dimensions.append(cls.interviewer_queries(interviewer, company))
+        
+        return [
+            [(query, cls.QUERY_RESULT_LIMITS[phase]) for phase, queries in phases.items() for query in queries]
+            for phases in dimensions
+        ]
+    
+    @classmethod
+    def research_queries(cls, company: str, role: str, interviewer: str, skip: Iterable[str] = ()) -> List[Tuple[str, int]]:
+        """
+        Every (query, max_results) Tavily search the agents run for these targets
+        
+        Used by cache_manager.py --warm to prefetch research ahead of a run.
+        Dimensions ('company', 'role', 'interviewer') listed in `skip` are left out.
+        """
+        return [search for searches in cls._dimension_searches(company, role, interviewer, skip) for search in searches]
+    
+    @classmethod
+    def prioritized_queries(cls, company: str, role: str, interviewer: str, skip: Iterable[str] = ()) -> List[Tuple[str, int]]:
+        """
+        research_queries() in research-budget priority order
+        
+        Each dimension keeps its phase order (identity before industry, LinkedIn before
+        background) and the dimensions take turns, so every dimension gets its most
+        specific searches before any gets its broader ones.
+        """
+        rounds = zip_longest(*cls._dimension_searches(company, role, interviewer, skip))
+        return list(dict.fromkeys(search for searches in rounds for search in searches if search is not None))
+    
+    @staticmethod
+    def research_budget_from_env() -> Optional[Dict[str, float]]:
+        """Research budget from RESEARCH_BUDGET_SECONDS / _QUERIES and RESEARCH_TARGET_CONFIDENCE, or None"""
+        budget = {}
+        for key, env, cast in (('max_seconds', 'RESEARCH_BUDGET_SECONDS', float),
+                               ('max_queries', 'RESEARCH_BUDGET_QUERIES', int),
+                               ('target_confidence', 'RESEARCH_TARGET_CONFIDENCE', float)):
+            if os.getenv(env):
+                budget[key] = cast(os.getenv(env))
+        return budget or None
+    
+    def _budgeted_prefetch(self, company: str, role: str, interviewer: str, email_keywords: List[str],
+                           artifacts: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Issue this email's searches in priority order until the research budget says stop
+        
+        Searches run one fan-out batch (max_workers) at a time. Before each batch the
+        overall confidence is computed from the sources so far; research stops when it
+        reaches target_confidence, when max_queries searches were issued or max_seconds
+        elapsed ('target_confidence', 'max_queries', 'max_seconds'), or when every
+        search has run ('all_queries'). Searches in the run-level result set cost nothing.
+        """
+        max_queries = self.research_budget.get('max_queries')
+        max_seconds = self.research_budget.get('max_seconds')
+        target_confidence = self.research_budget.get('target_confidence')
+        
+        pending = self.prioritized_queries(company, role, interviewer, skip=artifacts)
+        budget = {
+            'max_seconds': max_seconds,
+            'max_queries': max_queries,
+            'target_confidence': target_confidence,
+            'queries': 0,
+            'confidence': None,
+            'stop_reason': 'all_queries'
+        }
+        self._prefetch_only = True
+        start = time.perf_counter()
+        
+        while True:
+            if target_confidence is not None:
+                budget['confidence'] = self._provisional_confidence(company, role, interviewer, email_keywords, artifacts)
+                if budget['confidence'] >= target_confidence:
+                    budget['stop_reason'] = 'target_confidence'
+                    break
+            if not pending:
+                break
+            if max_queries is not None and budget['queries'] >= max_queries:
+                budget['stop_reason'] = 'max_queries'
+                break
+            if max_seconds is not None and time.perf_counter() - start >= max_seconds:
+                budget['stop_reason'] = 'max_seconds'
+                break
+            
+            batch_size = max(1, self.max_workers)
+            if max_queries is not None:
+                batch_size = min(batch_size, max_queries - budget['queries'])
+            batch = []
+            while pending and len(batch) < batch_size:
+                search = pending.pop(0)
+                if search not in self.shared_results:
+                    batch.append(search)
+            if batch:
+                results = self.search_client.search_many(batch, max_workers=max(1, self.max_workers), return_exceptions=True)
+                self._prefetched.update(zip(batch, results))
+                budget['queries'] += len(batch)
+        
+        budget['skipped'] = len(pending)
+        budget['elapsed'] = time.perf_counter() - start
+        confidence = f", confidence {budget['confidence']:.2f}" if budget['confidence'] is not None else ""
+        print(f"\n⏱️  Research budget: {budget['queries']} searches in {budget['elapsed']:.2f}s{confidence}, "
+              f"{budget['skipped']} skipped (stopped: {budget['stop_reason']})")
+        return budget
+    
+    def _score_dimension(self, kind: str, company: str, role: str, interviewer: str, email_keywords: List[str]) -> Dict[str, Any]:
+        """What one agent would report from the searches issued so far, computed without its output"""
+        phases = {
+            'company': lambda: self.company_queries(company),
+            'role': lambda: self.role_queries(role, company),
+            'interviewer': lambda: self.interviewer_queries(interviewer, company)
+        }[kind]()
+        sources_by_phase = {}
+        for phase, queries in phases.items():
+            sources_by_phase[phase] = []
+            for query in queries:
+                search = (query, self.QUERY_RESULT_LIMITS[phase])
+                results = self._prefetched.get(search, self.shared_results.get(search, []))
+                if not isinstance(results, Exception):
+                    sources_by_phase[phase].extend(results)
+        all_sources = [source for sources in sources_by_phase.values() for source in sources]
+        
+        validation_log = []
+        linkedin_profiles_found = 0
+        if kind == 'company':
+            validated_sources = self._validate_company_sources_enhanced(all_sources, company, email_keywords, validation_log)
+            confidence_score = self._company_confidence(validated_sources, len(all_sources))
+        elif kind == 'role':
+            validated_sources = self._validate_role_sources_enhanced(all_sources, role, company, email_keywords, validation_log)
+            confidence_score = self._role_confidence(validated_sources, len(all_sources))
+        else:
+            validated_sources = self._validate_interviewer_sources_enhanced(all_sources, interviewer, company, email_keywords, validation_log)
+            linkedin_profiles_found = sum(self._is_linkedin_profile(s.get('url', '')) for s in sources_by_phase['linkedin'])
+            confidence_score = self._interviewer_confidence(validated_sources, len(all_sources), linkedin_profiles_found)
+        
+        return {
+            'confidence_score': confidence_score,
+            'linkedin_profiles_found': linkedin_profiles_found,
+            'citations': validated_sources[:self.CITATION_LIMITS[kind]]
+        }
+    
+    def _provisional_confidence(self, company: str, role: str, interviewer: str, email_keywords: List[str],
+                                artifacts: Dict[str, Dict[str, Any]]) -> float:
+        """_calculate_overall_confidence over the stored analyses and the searches issued so far"""
+        research_data = {}
+        metrics = {'confidence_scores': [], 'linkedin_profiles_found': 0, 'citation_count': 0}
+        for kind, target in zip(ARTIFACT_KINDS, (company, role, interviewer)):
+            if not target:
+                continue
+            analysis = artifacts.get(kind) or self._score_dimension(kind, company, role, interviewer, email_keywords)
+            research_data[f'{kind}_analysis'] = analysis
+            metrics['confidence_scores'].append(analysis['confidence_score'])
+            metrics['linkedin_profiles_found'] += analysis.get('linkedin_profiles_found', 0)
+            metrics['citation_count'] += len(analysis['citations'])
+        return self._calculate_overall_confidence(research_data, metrics)
+    
+    @staticmethod
+    def research_targets(entities: Dict[str, Any]) -> Tuple[str, str, str]:
+        """(company, role, interviewer) from extracted entities, upper- or lowercase keys"""
+        # Handle both string and list values for entities
+        def get_entity_string(entity_value):
+            """Convert entity to string, handling lists"""
+            if isinstance(entity_value, list):
+                return entity_value[0] if entity_value else ''
+            return str(entity_value) if entity_value else ''
+        
+        return tuple(
+            get_entity_string(entities.get(key.upper(), entities.get(key, '')))
+            for key in ('company', 'role', 'interviewer')
+        )
+    
+    def load_research_artifacts(self, company: str, role: str, interviewer: str,
+                                email_keywords: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fresh stored analyses for these targets, by dimension ('company', 'role', 'interviewer')
+        
+        Company and role analyses are stored without the email-keyword bonus and are
+        re-scored here for this email's keywords.
+        """
+        if self.artifact_store is None:
+            return {}
+        
+        targets = dict(zip(ARTIFACT_KINDS, (company, role, interviewer)))
+        artifacts = {}
+        for kind in ARTIFACT_KINDS:
+            if targets[kind]:
+                analysis = self.artifact_store.get(kind, artifact_key(kind, company, role, interviewer))
+                if analysis is not None:
+                    if kind in self.KEYWORD_SCORING:
+                        analysis = self._rescore_artifact(kind, analysis, email_keywords)
+                    artifacts[kind] = analysis
+        return artifacts
+    
+    def _rescore_artifact(self, kind: str, analysis: Dict[str, Any], email_keywords: List[str]) -> Dict[str, Any]:
+        """A stored company/role analysis validated, scored and cited for these email keywords"""
+        validation_log = []
+        validated_sources = self._apply_keyword_bonus(kind, analysis['scored_sources'], email_keywords, validation_log)
+        if kind == 'company':
+            confidence_score = self._company_confidence(validated_sources, analysis['sources_processed'])
+        else:
+            confidence_score = self._role_confidence(validated_sources, analysis['sources_processed'])
+        return dict(analysis, validated_sources=validated_sources, confidence_score=confidence_score,
+                    citations=self._generate_citations(validated_sources[:self.CITATION_LIMITS[kind]], 1),
+                    validation_log=validation_log)
+    
+    def _reuse_artifact(self, kind: str, artifacts: Dict[str, Dict[str, Any]], citation_counter: int) -> Optional[Dict[str, Any]]:
+        """A stored analysis with its citations renumbered from citation_counter, or None"""
+        analysis = artifacts.get(kind)
+        if analysis is None:
+            return None
+        
+        print(f"   ♻️  Reusing stored {kind} analysis ({len(analysis['citations'])} citations, "
+              f"confidence {analysis['confidence_score']:.2f})")
+        reused = dict(analysis)
+        reused['citations'] = [dict(c, id=str(i)) for i, c in enumerate(analysis['citations'], citation_counter)]
+        reused['reused_artifact'] = True
+        return reused
+    
+    def _save_artifact(self, kind: str, analysis: Dict[str, Any], company: str, role: str, interviewer: str) -> bool:
+        """
+        Persist a freshly researched analysis; analyses without validated sources are not kept
+        
+        Company and role analyses keep only their keyword-independent part: the
+        scored sources before the email-keyword bonus, not what was validated with it.
+        """
+        if self.artifact_store is None or analysis.get('reused_artifact') or not analysis.get('validated_sources'):
+            return False
+        if kind in self.KEYWORD_SCORING:
+            analysis = {key: value for key, value in analysis.items()
+                        if key not in ('validated_sources', 'confidence_score', 'citations', 'validation_log')}
+        try:
+            self.artifact_store.put(kind, artifact_key(kind, company, role, interviewer), analysis)
+            return True
+        except Exception as e:
+            print(f"      ⚠️ Could not store {kind} research artifact: {e}")
+            return False
+    
+    def plan_run_research(self, entities_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run-level query plan: every email's searches, deduplicated and fetched once
+        
+        Successful results are kept in shared_results and serve every email's research
+        until clear_run_research(); failed searches are left for the email's own fan-out.
+        Dimensions with a fresh stored analysis are not searched at all.
+        
+        Args:
+            entities_list: Extracted entities of each interview email in the run
+            
+        Returns:
+            Plan statistics (planned, unique, duplicates_avoided, artifacts_reused, failed, elapsed)
+            
+        With a research budget nothing is prefetched: each email spends its own budget and
+        searches shared with an earlier email are served from the Tavily cache.
+        """
+        planned = []
+        artifacts_reused = 0
+        for entities in entities_list:
+            targets = self.research_targets(entities)
+            artifacts = self.load_research_artifacts(*targets, self._extract_email_keywords(entities))
+            artifacts_reused += len(artifacts)
+            planned.extend(self.research_queries(*targets, skip=artifacts))
+        unique = list(dict.fromkeys(planned))
+        fetched = [] if self.research_budget else unique
+        
+        start = time.perf_counter()
+        results = self.search_client.search_many(fetched, max_workers=max(1, self.max_workers), return_exceptions=True)
+        self.shared_results = {
+            search: result for search, result in zip(fetched, results) if not isinstance(result, Exception)
+        }
+        
+        plan = {
+            'emails': len(entities_list),
+            'planned': len(planned),
+            'unique': len(unique),
+            'duplicates_avoided': len(planned) - len(unique),
+            'artifacts_reused': artifacts_reused,
+            'failed': len(fetched) - len(self.shared_results),
+            'budgeted': bool(self.research_budget),
+            'elapsed': time.perf_counter() - start
+        }
+        if plan['budgeted']:
+            print(f"🧭 Run-level query plan: {plan['planned']} searches for {plan['emails']} emails, "
+                  f"{plan['unique']} unique; not prefetched (research budget set)")
+            return plan
+        print(f"🧭 Run-level query plan: {plan['planned']} searches for {plan['emails']} emails, "
+              f"{plan['unique']} unique fetched in {plan['elapsed']:.2f}s "
+              f"({plan['duplicates_avoided']} duplicates avoided, {plan['artifacts_reused']} stored analyses reused, "
+              f"{plan['failed']} failed)")
+        return plan
+    
+    def clear_run_research(self):
+        """Drop the run-level result set"""
+        self.shared_results = {}
+    
     def conduct_deep_research(self, entities: Dict[str, Any], email_index: int) -> Dict[str, Any]:
         """
         Conduct sophisticated deep research with multi-agent analysis
@@ -49,17 +551,7 @@ class DeepResearchPipeline:
         
         research_start_time = datetime.now()
         
-        # Handle both string and list values for entities
-        def get_entity_string(entity_value):
-            """Convert entity to string, handling lists"""
-            if isinstance(entity_value, list):
-                return entity_value[0] if entity_value else ''
-            return str(entity_value) if entity_value else ''
-        
-        # Handle both uppercase and lowercase entity keys
-        company = get_entity_string(entities.get('COMPANY', entities.get('company', '')))
-        role = get_entity_string(entities.get('ROLE', entities.get('role', '')))
-        interviewer = get_entity_string(entities.get('INTERVIEWER', entities.get('interviewer', '')))
+        company, role, interviewer = self.research_targets(entities)
         
         # Extract email keywords for validation
         email_keywords = self._extract_email_keywords(entities)
@@ -85,12 +577,24 @@ class DeepResearchPipeline:
             'overall_confidence': 0.0,
             'research_quality': 'Unknown',
             'reflection_loops': 0,
+            'reflection_followup': {},
             'sufficient_for_prep_guide': False,
             'processing_time': 0,
+            'search_fanout': {},
+            'research_budget': {},
+            'artifact_reuse': {'reused': [], 'saved': []},
             'errors': []
         }
         
         try:
+            artifacts = self.load_research_artifacts(company, role, interviewer, email_keywords)
+            result['artifact_reuse']['reused'] = list(artifacts)
+            budget_start = time.perf_counter()
+            if self.research_budget:
+                result['research_budget'] = self._budgeted_prefetch(company, role, interviewer, email_keywords, artifacts)
+            else:
+                result['search_fanout'] = self._prefetch_research(company, role, interviewer, skip=artifacts)
+            
             research_data = {}
             citations_database = {}
             citation_counter = 1
@@ -99,10 +603,14 @@ class DeepResearchPipeline:
             # ========== COMPANY ANALYSIS AGENT ==========
             if company:
                 print(f"\n🏢 === COMPANY ANALYSIS AGENT ACTIVATED ===")
-                company_analysis = self._company_analysis_agent(company, email_keywords, citations_database, citation_counter)
+                company_analysis = self._reuse_artifact('company', artifacts, citation_counter)
+                if company_analysis is None:
+                    company_analysis = self._company_analysis_agent(company, email_keywords, citations_database, citation_counter)
                 
                 if company_analysis['success']:
                     research_data['company_analysis'] = company_analysis
+                    if self._save_artifact('company', company_analysis, company, role, interviewer):
+                        result['artifact_reuse']['saved'].append('company')
                     validation_metrics['sources_discovered'] += company_analysis['sources_processed']
                     validation_metrics['sources_validated'] += len(company_analysis['validated_sources'])
                     validation_metrics['confidence_scores'].append(company_analysis['confidence_score'])
@@ -115,10 +623,14 @@ class DeepResearchPipeline:
             # ========== ROLE ANALYSIS AGENT ==========
             if role:
                 print(f"\n💼 === ROLE ANALYSIS AGENT ACTIVATED ===")
-                role_analysis = self._role_analysis_agent(role, company, email_keywords, citations_database, citation_counter)
+                role_analysis = self._reuse_artifact('role', artifacts, citation_counter)
+                if role_analysis is None:
+                    role_analysis = self._role_analysis_agent(role, company, email_keywords, citations_database, citation_counter)
                 
                 if role_analysis['success']:
                     research_data['role_analysis'] = role_analysis
+                    if self._save_artifact('role', role_analysis, company, role, interviewer):
+                        result['artifact_reuse']['saved'].append('role')
                     validation_metrics['sources_discovered'] += role_analysis['sources_processed']
                     validation_metrics['sources_validated'] += len(role_analysis['validated_sources'])
                     validation_metrics['confidence_scores'].append(role_analysis['confidence_score'])
@@ -131,10 +643,14 @@ class DeepResearchPipeline:
             # ========== INTERVIEWER ANALYSIS AGENT (LINKEDIN FOCUSED) ==========
             if interviewer:
                 print(f"\n👤 === INTERVIEWER ANALYSIS AGENT (LINKEDIN FOCUS) ===")
-                interviewer_analysis = self._interviewer_analysis_agent(interviewer, company, email_keywords, citations_database, citation_counter)
+                interviewer_analysis = self._reuse_artifact('interviewer', artifacts, citation_counter)
+                if interviewer_analysis is None:
+                    interviewer_analysis = self._interviewer_analysis_agent(interviewer, company, email_keywords, citations_database, citation_counter)
                 
                 if interviewer_analysis['success']:
                     research_data['interviewer_analysis'] = interviewer_analysis
+                    if self._save_artifact('interviewer', interviewer_analysis, company, role, interviewer):
+                        result['artifact_reuse']['saved'].append('interviewer')
                     validation_metrics['sources_discovered'] += interviewer_analysis['sources_processed']
                     validation_metrics['sources_validated'] += len(interviewer_analysis['validated_sources'])
                     validation_metrics['confidence_scores'].append(interviewer_analysis['confidence_score'])
@@ -147,9 +663,15 @@ class DeepResearchPipeline:
             
             # ========== DEEP REFLECTION LOOPS ==========
             print(f"\n🤔 === DEEP REFLECTION ON RESEARCH QUALITY ===")
-            reflection_result = self._conduct_reflection_loops(research_data, entities, citations_database, citation_counter)
+            reflection_result = self._conduct_reflection_loops(research_data, entities, citations_database, citation_counter, validation_metrics,
+                                                               **self._reflection_limits(result['research_budget'], budget_start))
             
             result['reflection_loops'] = reflection_result['loops_conducted']
+            result['reflection_followup'] = reflection_result['followup']
+            for kind in reflection_result['followup']['refined']:
+                if self._save_artifact(kind, research_data[f'{kind}_analysis'], company, role, interviewer) \
+                        and kind not in result['artifact_reuse']['saved']:
+                    result['artifact_reuse']['saved'].append(kind)
             result['sufficient_for_prep_guide'] = reflection_result['sufficient_for_prep_guide']
             
             # Calculate overall confidence
@@ -172,6 +694,10 @@ class DeepResearchPipeline:
             result['processing_time'] = (datetime.now() - research_start_time).total_seconds()
             print(f"❌ DEEP RESEARCH PIPELINE ERROR: {str(e)}")
             return result
+        
+        finally:
+            self._prefetched = {}
+            self._prefetch_only = False
     
     def _extract_email_keywords(self, entities: Dict[str, Any]) -> List[str]:
         """Extract keywords from entities for validation"""
@@ -205,42 +731,29 @@ class DeepResearchPipeline:
             
             # Phase 1: Company Identity & Official Presence
             print(f"   🔍 Phase 1: Company Identity Verification")
-            identity_queries = [
-                f'"{company}" official website about',
-                f'"{company}" company overview mission',
-                f'"{company}" linkedin company page',
-                f'"{company}" crunchbase company profile',
-                f"{company} internship program careers",  # Specific for internship context
-                f"{company} startup company information"
-            ]
+            queries = self.company_queries(company)
             
             identity_sources = []
             validation_log = []
             
-            for query in identity_queries:
-                results = cached_tavily_search(query, max_results=3)
+            for query in queries['identity']:
+                results = self._search(query, 'identity')
                 identity_sources.extend(results)
                 print(f"      🔍 Query: '{query}' → {len(results)} sources")
             
             # Phase 2: Industry & Market Analysis
             print(f"   🔍 Phase 2: Industry & Market Analysis")
-            industry_queries = [
-                f'"{company}" industry sector business',
-                f'"{company}" market trends 2024 2025',
-                f'"{company}" recent news developments',
-                f'"{company}" technology stack products'
-            ]
-            
             industry_sources = []
-            for query in industry_queries:
-                results = cached_tavily_search(query, max_results=3)
+            for query in queries['industry']:
+                results = self._search(query, 'industry')
                 identity_sources.extend(results)
                 print(f"      🔍 Query: '{query}' → {len(results)} sources")
             
             # Enhanced validation with detailed reasoning
             all_sources = identity_sources + industry_sources
-            validated_sources = self._validate_company_sources_enhanced(all_sources, company, email_keywords, validation_log)
-            citations = self._generate_citations(validated_sources[:6], citation_counter)  # Top 6 citations
+            scored_sources = []
+            validated_sources = self._validate_company_sources_enhanced(all_sources, company, email_keywords, validation_log, scored_sources)
+            citations = self._generate_citations(validated_sources[:self.CITATION_LIMITS['company']], citation_counter)
             
             # Display validation reasoning
             print(f"   📊 Company Validation Results:")
@@ -248,9 +761,7 @@ class DeepResearchPipeline:
                 print(f"      {log_entry}")
             
             # Improved confidence calculation
-            base_confidence = len(validated_sources) / max(1, len(all_sources)) * 0.6
-            official_bonus = 0.2 if any('official' in str(s.get('evidence', [])) for s in validated_sources) else 0
-            confidence_score = min(0.95, base_confidence + official_bonus + 0.2)
+            confidence_score = self._company_confidence(validated_sources, len(all_sources))
             
             analysis_summary = f"Validated company identity and analyzed industry position with {len(citations)} citations"
             industry_analysis = f"Analyzed {len(industry_sources)} industry sources for market positioning"
@@ -260,7 +771,9 @@ class DeepResearchPipeline:
                 'analysis_summary': analysis_summary,
                 'industry_analysis': industry_analysis,
                 'validated_sources': validated_sources,
+                'scored_sources': scored_sources,
                 'sources_processed': len(all_sources),
+                'processed_urls': self._source_urls(all_sources),
                 'confidence_score': confidence_score,
                 'citations': citations,
                 'validation_log': validation_log
@@ -276,46 +789,35 @@ class DeepResearchPipeline:
             
             # Phase 1: Role Definition & Requirements
             print(f"   🔍 Phase 1: Role Requirements Analysis")
-            role_queries = [
-                f"{role} job description requirements {company}",
-                f"{role} skills qualifications {company}",
-                f"{role} responsibilities duties {company}",
-                f"{role} interview questions {company}"
-            ]
+            queries = self.role_queries(role, company)
             
             role_sources = []
-            for query in role_queries:
-                results = cached_tavily_search(query, max_results=3)
+            for query in queries['requirements']:
+                results = self._search(query, 'requirements')
                 role_sources.extend(results)
                 print(f"      🔍 Query: '{query}' → {len(results)} sources")
             
             # Phase 2: Skills & Market Analysis
             print(f"   🔍 Phase 2: Skills & Market Analysis")
-            skills_queries = [
-                f"{role} skills demand 2024 market trends",
-                f"{role} salary range {company} industry",
-                f"{role} career progression path",
-                f"{role} technology stack tools required"
-            ]
-            
             skills_sources = []
-            for query in skills_queries:
-                results = cached_tavily_search(query, max_results=2)
+            for query in queries['skills']:
+                results = self._search(query, 'skills')
                 skills_sources.extend(results)
                 print(f"      🔍 Query: '{query}' → {len(results)} sources")
             
             # Validate and process sources with detailed logging
             all_sources = role_sources + skills_sources
             validation_log = []
-            validated_sources = self._validate_role_sources_enhanced(all_sources, role, company, email_keywords, validation_log)
-            citations = self._generate_citations(validated_sources[:5], citation_counter)  # Top 5 citations
+            scored_sources = []
+            validated_sources = self._validate_role_sources_enhanced(all_sources, role, company, email_keywords, validation_log, scored_sources)
+            citations = self._generate_citations(validated_sources[:self.CITATION_LIMITS['role']], citation_counter)
             
             # Display validation reasoning  
             print(f"   📊 Role Validation Results:")
             for log_entry in validation_log[:8]:  # Show first 8 entries
                 print(f"      {log_entry}")
             
-            confidence_score = min(0.95, len(validated_sources) / max(1, len(all_sources)) * 0.7 + 0.3)
+            confidence_score = self._role_confidence(validated_sources, len(all_sources))
             
             analysis_summary = f"Analyzed {role} requirements and responsibilities with {len(citations)} citations"
             role_insights = f"Researched company-specific and industry standards for {role}"
@@ -325,7 +827,9 @@ class DeepResearchPipeline:
                 'analysis_summary': analysis_summary,
                 'role_insights': role_insights,
                 'validated_sources': validated_sources,
+                'scored_sources': scored_sources,
                 'sources_processed': len(all_sources),
+                'processed_urls': self._source_urls(all_sources),
                 'confidence_score': confidence_score,
                 'citations': citations,
                 'validation_log': validation_log
@@ -343,21 +847,15 @@ class DeepResearchPipeline:
             # Phase 1: Specific LinkedIn Profile Discovery (Human-like search)
             print(f"   🔍 Phase 1: Targeted LinkedIn Profile Search")
             # More specific profile searches
-            linkedin_queries = [
-                f'"{interviewer}" linkedin profile',  # Exact name search
-                f'"{interviewer}" {company} linkedin',  # Name + company
-                f'"{interviewer}" site:linkedin.com/in',  # Direct profile search
-                f"{interviewer} {company} linkedin profile",  # Broader search
-                f"{interviewer} linkedin {company} employee",  # Employee context
-            ]
+            queries = self.interviewer_queries(interviewer, company)
             
             linkedin_sources = []
             validation_log = []  # Track validation reasoning
             extracted_names = set()  # Track names found in company-relevant content
             
-            for query in linkedin_queries:
+            for query in queries['linkedin']:
                 print(f"      🔍 LinkedIn Search: '{query}'")
-                results = cached_tavily_search(query, max_results=4)
+                results = self._search(query, 'linkedin')
                 linkedin_sources.extend(results)
                 
                 # Count LinkedIn profiles with validation and name extraction
@@ -388,23 +886,16 @@ class DeepResearchPipeline:
             
             # Phase 2: Professional Background Research
             print(f"   🔍 Phase 2: Professional Background Research")
-            background_queries = [
-                f"{interviewer} {company} publications articles",
-                f"{interviewer} {company} speaking events",
-                f"{interviewer} {company} professional background",
-                f"{interviewer} {company} expertise experience"
-            ]
-            
             background_sources = []
-            for query in background_queries:
-                results = cached_tavily_search(query, max_results=2)
+            for query in queries['background']:
+                results = self._search(query, 'background')
                 background_sources.extend(results)
                 print(f"      🔍 Query: '{query}' → {len(results)} sources")
             
             # Enhanced validation with detailed reasoning
             all_sources = linkedin_sources + background_sources
             validated_sources = self._validate_interviewer_sources_enhanced(all_sources, interviewer, company, email_keywords, validation_log)
-            citations = self._generate_citations(validated_sources[:6], citation_counter)  # Top 6 citations
+            citations = self._generate_citations(validated_sources[:self.CITATION_LIMITS['interviewer']], citation_counter)
             
             # Display validation reasoning
             print(f"   📊 Validation Results:")
@@ -412,9 +903,7 @@ class DeepResearchPipeline:
                 print(f"      {log_entry}")
             
             # Higher confidence for actual LinkedIn profiles
-            base_confidence = len(validated_sources) / max(1, len(all_sources)) * 0.4
-            linkedin_boost = min(0.4, linkedin_profiles_found * 0.25)  # More weight for actual profiles
-            confidence_score = min(0.95, base_confidence + linkedin_boost)
+            confidence_score = self._interviewer_confidence(validated_sources, len(all_sources), linkedin_profiles_found)
             
             analysis_summary = f"Conducted LinkedIn-focused analysis with {len(citations)} citations and {linkedin_profiles_found} profiles found"
             linkedin_analysis = f"Found {linkedin_profiles_found} LinkedIn profiles" if linkedin_profiles_found > 0 else "No verified LinkedIn profiles found"
@@ -437,6 +926,7 @@ class DeepResearchPipeline:
                 'search_suggestions': search_suggestions[:6],  # Top 6 suggestions
                 'validated_sources': validated_sources,
                 'sources_processed': len(all_sources),
+                'processed_urls': self._source_urls(all_sources),
                 'linkedin_profiles_found': linkedin_profiles_found,
                 'confidence_score': confidence_score,
                 'citations': citations,
@@ -446,6 +936,35 @@ class DeepResearchPipeline:
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
+    @staticmethod
+    def _company_confidence(validated_sources: List[Dict], sources_processed: int) -> float:
+        """Company agent confidence: validation rate plus a bonus for official sources"""
+        base_confidence = len(validated_sources) / max(1, sources_processed) * 0.6
+        official_bonus = 0.2 if any('official' in str(s.get('evidence', [])) for s in validated_sources) else 0
+        return min(0.95, base_confidence + official_bonus + 0.2)
+    
+    @staticmethod
+    def _role_confidence(validated_sources: List[Dict], sources_processed: int) -> float:
+        """Role agent confidence: validation rate"""
+        return min(0.95, len(validated_sources) / max(1, sources_processed) * 0.7 + 0.3)
+    
+    @staticmethod
+    def _interviewer_confidence(validated_sources: List[Dict], sources_processed: int, linkedin_profiles_found: int) -> float:
+        """Interviewer agent confidence: validation rate plus a boost per LinkedIn profile"""
+        base_confidence = len(validated_sources) / max(1, sources_processed) * 0.4
+        linkedin_boost = min(0.4, linkedin_profiles_found * 0.25)  # More weight for actual profiles
+        return min(0.95, base_confidence + linkedin_boost)
+    
+    @staticmethod
+    def _source_urls(sources: List[Dict]) -> List[str]:
+        """Distinct URLs of the sources an agent scored, in order"""
+        return list(dict.fromkeys(source.get('url') for source in sources if source.get('url')))
+    
+    @staticmethod
+    def _is_linkedin_profile(url: str) -> bool:
+        url = url.lower()
+        return 'linkedin.com' in url and ('/in/' in url or '/pub/' in url)
+    
     def _extract_names_from_linkedin_post(self, title: str, content: str, company: str, extracted_names: set):
         """Extract potential interviewer names from company-relevant LinkedIn posts"""
         import re
@@ -548,20 +1067,34 @@ class DeepResearchPipeline:
         
         return sorted(validated, key=lambda x: x['relevance_score'], reverse=True)
 
-    def _validate_company_sources_enhanced(self, sources: List[Dict], company: str, keywords: List[str], validation_log: List[str]) -> List[Dict]:
-        """Enhanced company source validation with detailed reasoning"""
-        validated = []
+    @staticmethod
+    def _source_fields(source: Dict) -> Tuple[str, str, str]:
+        """Lowercased (title, content, url) of a search result"""
+        return source.get('title', '').lower(), source.get('content', '').lower(), source.get('url', '').lower()
+    
+    def _validate_company_sources_enhanced(self, sources: List[Dict], company: str, keywords: List[str], validation_log: List[str],
+                                           scored_sources: Optional[List[Dict]] = None) -> List[Dict]:
+        """
+        Enhanced company source validation with detailed reasoning
+        
+        Sources that can pass with the keyword bonus are appended to `scored_sources`
+        with their score before it (see _apply_keyword_bonus).
+        """
+        scored = []
         company_lower = company.lower()
         company_variations = [
             company_lower,
             company_lower.replace(' ', ''),  # Remove spaces
             company_lower.replace('seeds', 'seed') if 'seeds' in company_lower else company_lower,  # Handle plural
         ]
+        keywords = [keyword.lower() for keyword in keywords]
         
-        for source in sources:
-            title = source.get('title', '').lower()
-            content = source.get('content', '').lower()
-            url = source.get('url', '').lower()
+        # Batch scoring: every term found in each distinct title + content in one scan
+        matcher = compile_terms(company_variations, keywords, self.BUSINESS_INDICATORS)
+        fields = [self._source_fields(source) for source in sources]
+        found_terms = matcher.find_any_many([(title, content) for title, content, _ in fields])
+        
+        for source, (title, content, url), found in zip(sources, fields, found_terms):
             
             relevance_score = 0
             evidence = []
@@ -570,14 +1103,13 @@ class DeepResearchPipeline:
             # Company name matching with variations
             name_found = False
             for variation in company_variations:
-                if variation in title:
-                    relevance_score += 4
-                    evidence.append(f"Company '{variation}' in title")
-                    name_found = True
-                    break
-                elif variation in content:
-                    relevance_score += 3
-                    evidence.append(f"Company '{variation}' in content")
+                if variation in found:
+                    if variation in title:
+                        relevance_score += 4
+                        evidence.append(f"Company '{variation}' in title")
+                    else:
+                        relevance_score += 3
+                        evidence.append(f"Company '{variation}' in content")
                     name_found = True
                     break
             
@@ -585,12 +1117,10 @@ class DeepResearchPipeline:
                 rejection_reasons.append(f"Company name '{company}' not found")
             
             # Official domain check
-            domain_found = False
             for variation in company_variations:
                 if variation in url:
                     relevance_score += 5
                     evidence.append("Official company domain")
-                    domain_found = True
                     break
             
             # LinkedIn company page bonus
@@ -598,37 +1128,21 @@ class DeepResearchPipeline:
                 relevance_score += 4
                 evidence.append("LinkedIn company page")
             
-            # Keywords matching
-            keyword_matches = 0
-            for keyword in keywords:
-                if keyword.lower() in content or keyword.lower() in title:
-                    keyword_matches += 1
-            
-            if keyword_matches > 0:
-                relevance_score += min(keyword_matches, 3)
-                evidence.append(f"{keyword_matches} keyword matches")
+            # Keywords matching (added by _apply_keyword_bonus)
+            keyword_position = len(evidence)
             
             # Professional/business indicators
-            business_indicators = ['company', 'business', 'startup', 'organization', 'corp', 'inc', 'about', 'mission']
-            business_matches = sum(1 for indicator in business_indicators if indicator in title or indicator in content)
+            business_matches = sum(map(found.__contains__, self.BUSINESS_INDICATORS))
             if business_matches > 0:
                 relevance_score += min(business_matches, 2)
                 evidence.append(f"{business_matches} business indicators")
             
-            # Validation decision with reasoning
-            threshold = 2  # More lenient threshold
-            if relevance_score >= threshold:
-                validated.append({
-                    'source': source,
-                    'relevance_score': relevance_score,
-                    'evidence': evidence
-                })
-                validation_log.append(f"✅ VALIDATED: {source.get('title', 'Unknown')[:40]}... (Score: {relevance_score}, Evidence: {', '.join(evidence[:2])})")
-            else:
-                validation_log.append(f"❌ REJECTED: {source.get('title', 'Unknown')[:40]}... (Score: {relevance_score}, Reasons: {', '.join(rejection_reasons)})")
+            scored.append({'source': source, 'base_score': relevance_score, 'evidence': evidence,
+                           'keyword_position': keyword_position, 'rejection_reasons': rejection_reasons, 'found': found})
         
-        return sorted(validated, key=lambda x: x['relevance_score'], reverse=True)
+        return self._apply_keyword_bonus('company', scored, keywords, validation_log, scored_sources)
     
+
     def _validate_role_sources(self, sources: List[Dict], role: str, company: str, keywords: List[str]) -> List[Dict]:
         """Validate role sources for relevance"""
         validated = []
@@ -671,29 +1185,41 @@ class DeepResearchPipeline:
         
         return sorted(validated, key=lambda x: x['relevance_score'], reverse=True)
     
-    def _validate_role_sources_enhanced(self, sources: List[Dict], role: str, company: str, keywords: List[str], validation_log: List[str]) -> List[Dict]:
-        """Enhanced role source validation with strict company relevance requirement"""
-        validated = []
+    def _validate_role_sources_enhanced(self, sources: List[Dict], role: str, company: str, keywords: List[str], validation_log: List[str],
+                                        scored_sources: Optional[List[Dict]] = None) -> List[Dict]:
+        """
+        Enhanced role source validation with strict company relevance requirement
+        
+        Sources that can pass with the keyword bonus are appended to `scored_sources`
+        with their score before it (see _apply_keyword_bonus).
+        """
+        scored = []
         role_lower = role.lower()
         company_lower = company.lower()
+        role_parts = role_lower.split()
+        role_terms = [part for part in role_parts if len(part) > 2]  # Skip short words
+        keywords = [keyword.lower() for keyword in keywords]
         
-        for source in sources:
-            title = source.get('title', '').lower()
-            content = source.get('content', '').lower()
-            url = source.get('url', '').lower()
-            
+        # Batch scoring: every term found in each distinct title + content in one scan
+        # (sources without company context are rejected below and not scanned)
+        matcher = compile_terms(role_terms, self.JOB_INDICATORS, keywords)
+        fields = [self._source_fields(source) for source in sources]
+        company_context = [company_lower in title or company_lower in content for title, content, _ in fields]
+        found_terms = matcher.find_any_many([
+            (title, content) if has_company else ('', '')
+            for (title, content, _), has_company in zip(fields, company_context)
+        ])
+        
+        for source, (title, content, url), has_company, found in zip(sources, fields, company_context, found_terms):
             relevance_score = 0
             evidence = []
             rejection_reasons = []
             
             # STRICT REQUIREMENT: Company context is mandatory for role analysis
-            company_in_title = company_lower in title
-            company_in_content = company_lower in content
-            
-            if company_in_title:
+            if has_company and company_lower in title:
                 relevance_score += 8  # High score for company in title
                 evidence.append(f"Company '{company}' in title")
-            elif company_in_content:
+            elif has_company:
                 relevance_score += 5  # Medium score for company in content
                 evidence.append(f"Company '{company}' in content")
             else:
@@ -703,45 +1229,69 @@ class DeepResearchPipeline:
                 continue
             
             # Role/position matching (only if company context exists)
-            role_parts = role_lower.split()
             role_matches = 0
-            for part in role_parts:
-                if len(part) > 2:  # Skip short words
-                    if part in title:
-                        role_matches += 1
-                        relevance_score += 3
-                    elif part in content:
-                        role_matches += 1
-                        relevance_score += 2
+            for part in role_terms:
+                if part in found:
+                    role_matches += 1
+                    relevance_score += 3 if part in title else 2
             
             if role_matches > 0:
                 evidence.append(f"{role_matches}/{len(role_parts)} role terms matched")
             
             # Professional/job-related indicators
-            job_indicators = ['job', 'position', 'role', 'career', 'responsibilities', 'skills', 'requirements', 'description', 'internship']
-            job_matches = sum(1 for indicator in job_indicators if indicator in title or indicator in content)
+            job_matches = sum(map(found.__contains__, self.JOB_INDICATORS))
             if job_matches > 0:
                 relevance_score += min(job_matches, 3)
                 evidence.append(f"{job_matches} job indicators")
             
-            # Keywords matching from email
-            keyword_matches = 0
-            for keyword in keywords:
-                if keyword.lower() in content or keyword.lower() in title:
-                    keyword_matches += 1
-            
-            if keyword_matches > 0:
-                relevance_score += min(keyword_matches, 2)
-                evidence.append(f"{keyword_matches} keyword matches")
+            # Keywords matching from email (added by _apply_keyword_bonus)
+            keyword_position = len(evidence)
             
             # Official domain bonus (for company-connected sources)
-            official_domains = ['linkedin.com', 'glassdoor.com', 'indeed.com', 'monster.com', 'wellfound.com']
-            if any(domain in url for domain in official_domains):
+            if any(domain in url for domain in self.JOB_SITE_DOMAINS):
                 relevance_score += 2
                 evidence.append("Professional/job site")
             
-            # STRICT validation decision - must have company context AND good score
-            threshold = 6  # Higher threshold for role analysis
+            scored.append({'source': source, 'base_score': relevance_score, 'evidence': evidence,
+                           'keyword_position': keyword_position,
+                           'rejection_reasons': ["Below threshold despite company context"], 'found': found})
+        
+        # STRICT validation decision - must have company context AND good score
+        return self._apply_keyword_bonus('role', scored, keywords, validation_log, scored_sources)
+    
+    def _apply_keyword_bonus(self, kind: str, scored: List[Dict], keywords: List[str], validation_log: List[str],
+                             scored_sources: Optional[List[Dict]] = None) -> List[Dict]:
+        """
+        Add the email-keyword bonus to company/role sources scored without it and validate them
+        
+        `scored` holds the source, its 'base_score', 'evidence' (the keyword evidence goes
+        in at 'keyword_position') and 'rejection_reasons', plus the 'found' terms of the validator's scan. Entries without 'found' (a stored
+        analysis re-scored for another email) are scanned for the keywords here. Entries
+        that could pass with the largest bonus are appended, without 'found', to
+        `scored_sources`.
+        """
+        max_bonus, threshold = self.KEYWORD_SCORING[kind]['max_bonus'], self.KEYWORD_SCORING[kind]['threshold']
+        keywords = [keyword.lower() for keyword in keywords]
+        if scored and 'found' not in scored[0]:
+            found_terms = compile_terms(keywords).find_any_many([self._source_fields(entry['source'])[:2] for entry in scored])
+        else:
+            found_terms = [entry['found'] for entry in scored]
+        
+        validated = []
+        for entry, found in zip(scored, found_terms):
+            source = entry['source']
+            relevance_score = entry['base_score']
+            evidence = list(entry['evidence'])
+            
+            # Keywords matching from email
+            keyword_matches = sum(map(found.__contains__, keywords))
+            if keyword_matches > 0:
+                relevance_score += min(keyword_matches, max_bonus)
+                evidence.insert(entry['keyword_position'], f"{keyword_matches} keyword matches")
+            
+            if scored_sources is not None and entry['base_score'] + max_bonus >= threshold:
+                scored_sources.append({key: value for key, value in entry.items() if key != 'found'})
+            
             if relevance_score >= threshold:
                 validated.append({
                     'source': source,
@@ -750,10 +1300,11 @@ class DeepResearchPipeline:
                 })
                 validation_log.append(f"✅ VALIDATED: {source.get('title', 'Unknown')[:40]}... (Score: {relevance_score}, Evidence: {', '.join(evidence[:2])})")
             else:
-                validation_log.append(f"❌ REJECTED: {source.get('title', 'Unknown')[:40]}... (Score: {relevance_score}, Reasons: Below threshold despite company context)")
+                validation_log.append(f"❌ REJECTED: {source.get('title', 'Unknown')[:40]}... (Score: {relevance_score}, Reasons: {', '.join(entry['rejection_reasons'])})")
         
         return sorted(validated, key=lambda x: x['relevance_score'], reverse=True)
     
+
     def _validate_interviewer_sources(self, sources: List[Dict], interviewer: str, company: str, keywords: List[str]) -> List[Dict]:
         """Validate interviewer sources with LinkedIn priority"""
         validated = []
@@ -807,15 +1358,21 @@ class DeepResearchPipeline:
         validated = []
         interviewer_lower = interviewer.lower()
         company_lower = company.lower()
+        name_parts = interviewer_lower.split()
+        name_terms = [part for part in name_parts if len(part) > 2]  # Skip short parts like "Jr"
         
-        for source in sources:
-            title = source.get('title', '').lower()
-            content = source.get('content', '').lower()
-            url = source.get('url', '').lower()
+        # Batch scoring: every term found in each distinct title + content in one scan
+        matcher = compile_terms([company_lower], name_terms, self.PROFESSIONAL_INDICATORS)
+        fields = [self._source_fields(source) for source in sources]
+        found_terms = matcher.find_any_many([(title, content) for title, content, _ in fields])
+        
+        for source, (title, content, url), found in zip(sources, fields, found_terms):
+            company_mentioned = company_lower in found
             
             relevance_score = 0
             evidence = []
             rejection_reasons = []
+            company_already_scored = False
             
             # LinkedIn profile evaluation with smart post assessment
             if 'linkedin.com' in url:
@@ -824,33 +1381,30 @@ class DeepResearchPipeline:
                     evidence.append("LinkedIn profile URL")
                 elif '/posts/' in url or '/feed/' in url:
                     # Smart evaluation of LinkedIn posts - check if they mention target company
-                    if company_lower in title or company_lower in content:
+                    if company_mentioned:
                         relevance_score += 4  # Company-relevant post content
                         evidence.append("LinkedIn post mentioning target company")
+                        company_already_scored = True
                     else:
                         relevance_score += 1  # Generic post
                         evidence.append("LinkedIn post/content")
                         rejection_reasons.append("Post without company context")
                 else:
                     # Other LinkedIn content - evaluate based on company relevance
-                    if company_lower in title or company_lower in content:
+                    if company_mentioned:
                         relevance_score += 4  # Company-relevant content
                         evidence.append("LinkedIn content mentioning target company")
+                        company_already_scored = True
                     else:
                         relevance_score += 2  # Generic LinkedIn content
                         evidence.append("LinkedIn content")
             
             # Name matching with partial matching
-            name_parts = interviewer_lower.split()
             name_matches = 0
-            for part in name_parts:
-                if len(part) > 2:  # Skip short parts like "Jr"
-                    if part in title:
-                        name_matches += 1
-                        relevance_score += 3
-                    elif part in content:
-                        name_matches += 1
-                        relevance_score += 2
+            for part in name_terms:
+                if part in found:
+                    name_matches += 1
+                    relevance_score += 3 if part in title else 2
             
             if name_matches > 0:
                 evidence.append(f"{name_matches}/{len(name_parts)} name parts matched")
@@ -858,31 +1412,30 @@ class DeepResearchPipeline:
                 rejection_reasons.append("Name not found in title or content")
             
             # Company context (avoid double-counting if already scored in LinkedIn evaluation)
-            company_already_scored = any("mentioning target company" in ev for ev in evidence)
+            has_company_context = False
             if not company_already_scored:
                 if company_lower in title:
                     relevance_score += 3
                     evidence.append(f"Company '{company}' in title")
-                elif company_lower in content:
+                    has_company_context = True
+                elif company_mentioned:
                     relevance_score += 2
                     evidence.append(f"Company '{company}' in content")
+                    has_company_context = True
                 else:
                     rejection_reasons.append(f"No '{company}' context found")
             
             # Professional indicators
-            prof_indicators = ['profile', 'about', 'bio', 'experience', 'background', 'career']
-            matches = sum(1 for indicator in prof_indicators if indicator in title or indicator in content)
+            matches = sum(map(found.__contains__, self.PROFESSIONAL_INDICATORS))
             if matches > 0:
                 relevance_score += min(matches, 3)
                 evidence.append(f"{matches} professional indicators")
             
             # Validation decision with reasoning - STRICT COMPANY RELEVANCE REQUIRED
             # Only accept sources that have clear connection to the target company
-            has_company_context = any("Company" in ev for ev in evidence)
-            has_company_relevant_content = any("mentioning target company" in ev for ev in evidence)
             
             # STRICT CRITERIA: Must have company context OR be company-relevant content
-            if has_company_context or has_company_relevant_content:
+            if has_company_context or company_already_scored:
                 threshold = 4  # Stricter threshold for company-connected sources
                 if relevance_score >= threshold:
                     validated.append({
@@ -899,6 +1452,7 @@ class DeepResearchPipeline:
         
         return sorted(validated, key=lambda x: x['relevance_score'], reverse=True)
     
+
     def _generate_citations(self, validated_sources: List[Dict], start_counter: int) -> List[Dict]:
         """Generate citations from validated sources"""
         citations = []
@@ -914,11 +1468,39 @@ class DeepResearchPipeline:
         
         return citations
     
-    def _conduct_reflection_loops(self, research_data: Dict, entities: Dict, citations_db: Dict, citation_counter: int) -> Dict[str, Any]:
-        """Conduct deep reflection loops on research quality"""
+    def _reflection_limits(self, budget: Dict[str, Any], budget_start: float) -> Dict[str, float]:
+        """Reflection query and time budgets, capped by what is left of the research budget"""
+        limits = {'max_queries': self.reflection_max_queries, 'max_seconds': self.reflection_max_seconds}
+        if budget.get('max_queries') is not None:
+            limits['max_queries'] = min(limits['max_queries'], max(0, budget['max_queries'] - budget['queries']))
+        if budget.get('max_seconds') is not None:
+            remaining = budget['max_seconds'] - (time.perf_counter() - budget_start)
+            limits['max_seconds'] = min(limits['max_seconds'], max(0.0, remaining))
+        return limits
+    
+    def _conduct_reflection_loops(self, research_data: Dict, entities: Dict, citations_db: Dict, citation_counter: int,
+                                  validation_metrics: Dict, max_queries: Optional[int] = None,
+                                  max_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Conduct deep reflection loops on research quality
+        
+        A loop that finds the research insufficient runs follow-up queries for the
+        deficient dimensions only, within the reflection query and time budgets (checked
+        before each dimension's follow-up batch), and re-scores just those dimensions.
+        research_data, citations_db and validation_metrics are updated in place.
+        """
         max_loops = 2  # Reduced from 3 to 2 for efficiency
+        max_queries = self.reflection_max_queries if max_queries is None else max_queries
+        max_seconds = self.reflection_max_seconds if max_seconds is None else max_seconds
         loops_conducted = 0
         
+        company, role, interviewer = self.research_targets(entities)
+        targets = dict(zip(ARTIFACT_KINDS, (company, role, interviewer)))
+        email_keywords = self._extract_email_keywords(entities)
+        issued = set()
+        followup = {'queries': 0, 'refined': [], 'elapsed': 0.0, 'stop_reason': 'sufficient'}
+        start = time.perf_counter()
+        
         for loop in range(max_loops):
             print(f"   🔄 Reflection Loop {loop + 1}/{max_loops}")
             
@@ -926,14 +1508,64 @@ class DeepResearchPipeline:
             
             if reflection_result['sufficient_for_prep_guide']:
                 print(f"      ✅ Research Quality SUFFICIENT: {reflection_result['assessment']}")
+                followup['stop_reason'] = 'sufficient'
                 break
-            else:
-                print(f"      ⚠️ Research Quality NEEDS IMPROVEMENT: {reflection_result['assessment']}")
-                if loop < max_loops - 1:  # Don't do additional research on last loop
-                    print(f"      🔍 Conducting additional targeted research...")
-                    # Could add additional research here if needed
+            
+            print(f"      ⚠️ Research Quality NEEDS IMPROVEMENT: {reflection_result['assessment']}")
+            loops_conducted += 1
+            if loop == max_loops - 1:  # Don't do additional research on last loop
+                followup['stop_reason'] = 'max_loops'
+                break
+            
+            followup['stop_reason'] = 'no_followups'
+            for kind in self._deficient_dimensions(research_data, targets):
+                remaining_queries = max_queries - followup['queries']
+                if remaining_queries <= 0:
+                    followup['stop_reason'] = 'query_budget'
+                    break
+                if time.perf_counter() - start >= max_seconds:
+                    followup['stop_reason'] = 'time_budget'
+                    break
+                
+                analysis = research_data[f'{kind}_analysis']
+                queries = [
+                    query for query in self.followup_queries(kind, company, role, interviewer, analysis)
+                    if query not in issued
+                ][:remaining_queries]
+                if not queries:
+                    continue
+                
+                print(f"      🔍 Follow-up research for {kind}: {len(queries)} queries")
+                issued.update(queries)
+                followup['queries'] += len(queries)
+                followup['stop_reason'] = 'max_loops'
                 
-                loops_conducted += 1
+                refined = self._refine_dimension(kind, analysis, self._followup_search(queries), targets, email_keywords, citation_counter)
+                if refined is None:
+                    print(f"      ➖ No improvement for {kind} analysis")
+                    continue
+                
+                new_citations = refined['citations'][len(analysis['citations']):]
+                validation_metrics['sources_discovered'] += refined['sources_processed'] - analysis['sources_processed']
+                validation_metrics['sources_validated'] += len(refined['validated_sources']) - len(analysis['validated_sources'])
+                validation_metrics['citation_count'] += len(new_citations)
+                validation_metrics['linkedin_profiles_found'] += refined.get('linkedin_profiles_found', 0) - analysis.get('linkedin_profiles_found', 0)
+                citation_counter += len(new_citations)
+                
+                research_data[f'{kind}_analysis'] = refined
+                self._store_citations(citations_db, new_citations, f'{kind}_analysis')
+                followup['refined'].append(kind)
+                print(f"      📈 {kind.capitalize()} confidence: {analysis['confidence_score']:.2f} → {refined['confidence_score']:.2f}")
+            
+            if followup['stop_reason'] != 'max_loops':
+                break
+        
+        # Confidence scores follow the company -> role -> interviewer order of the agents
+        validation_metrics['confidence_scores'] = [
+            research_data[f'{kind}_analysis']['confidence_score']
+            for kind in ARTIFACT_KINDS if f'{kind}_analysis' in research_data
+        ]
+        followup['elapsed'] = time.perf_counter() - start
         
         # Final assessment
         final_assessment = self._assess_research_sufficiency(research_data, citations_db)
@@ -941,9 +1573,103 @@ class DeepResearchPipeline:
         return {
             'loops_conducted': loops_conducted,
             'sufficient_for_prep_guide': final_assessment['sufficient_for_prep_guide'],
-            'final_assessment': final_assessment['assessment']
+            'final_assessment': final_assessment['assessment'],
+            'followup': followup,
+            'citation_counter': citation_counter
         }
     
+    def _deficient_dimensions(self, research_data: Dict, targets: Dict[str, str]) -> List[str]:
+        """Researched dimensions under their sufficiency thresholds, largest possible score gain first"""
+        deficient = []
+        interviewer_analysis = research_data.get('interviewer_analysis', {})
+        if targets['interviewer'] and interviewer_analysis.get('success') and not interviewer_analysis.get('linkedin_profiles_found'):
+            deficient.append('interviewer')
+        for kind in ('company', 'role'):
+            analysis = research_data.get(f'{kind}_analysis', {})
+            if targets[kind] and analysis.get('success') and analysis.get('confidence_score', 0) < self.SUFFICIENT_CONFIDENCE:
+                deficient.append(kind)
+        return deficient
+    
+    def _followup_search(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """Sources of the follow-up queries, searched in parallel; failed searches yield none"""
+        limit = self.QUERY_RESULT_LIMITS['followup']
+        results = self.search_client.search_many(
+            [(query, limit) for query in queries], max_workers=max(1, self.max_workers), return_exceptions=True
+        )
+        sources = []
+        for query, result in zip(queries, results):
+            if isinstance(result, Exception):
+                print(f"      ❌ Tavily search error: {result}")
+                continue
+            print(f"      🔍 Query: '{query}' → {len(result)} sources")
+            sources.extend(result)
+        return sources
+    
+    def _refine_dimension(self, kind: str, analysis: Dict[str, Any], sources: List[Dict], targets: Dict[str, str],
+                          email_keywords: List[str], citation_counter: int) -> Optional[Dict[str, Any]]:
+        """
+        Re-score one dimension with follow-up sources
+        
+        Only sources whose URL the agent has not scored yet (validated or rejected,
+        kept in analysis['processed_urls']) are scored, and the agent's confidence
+        formula is re-applied to the merged slice. The newly scored URLs are added to
+        analysis['processed_urls'] even when nothing new is validated. Returns the
+        refined analysis, or None if nothing new was validated or confidence would drop.
+        """
+        processed_urls = analysis.get('processed_urls')
+        if processed_urls is None:
+            processed_urls = [v['source'].get('url') for v in analysis['validated_sources']]
+        seen = set(processed_urls)
+        new_sources = []
+        for source in sources:
+            if source.get('url') not in seen:
+                seen.add(source.get('url'))
+                new_sources.append(source)
+        if not new_sources:
+            return None
+        analysis['processed_urls'] = processed_urls + self._source_urls(new_sources)
+        
+        company, role, interviewer = targets['company'], targets['role'], targets['interviewer']
+        validation_log = []
+        new_scored = []
+        if kind == 'company':
+            new_validated = self._validate_company_sources_enhanced(new_sources, company, email_keywords, validation_log, new_scored)
+        elif kind == 'role':
+            new_validated = self._validate_role_sources_enhanced(new_sources, role, company, email_keywords, validation_log, new_scored)
+        else:
+            new_validated = self._validate_interviewer_sources_enhanced(new_sources, interviewer, company, email_keywords, validation_log)
+        if not new_validated:
+            return None
+        
+        validated_sources = sorted(analysis['validated_sources'] + new_validated, key=lambda x: x['relevance_score'], reverse=True)
+        sources_processed = analysis['sources_processed'] + len(new_sources)
+        refined = dict(analysis, validated_sources=validated_sources, sources_processed=sources_processed,
+                       validation_log=analysis.get('validation_log', []) + validation_log)
+        refined.pop('reused_artifact', None)
+        if kind in self.KEYWORD_SCORING:
+            refined['scored_sources'] = analysis.get('scored_sources', []) + new_scored
+        
+        if kind == 'company':
+            refined['confidence_score'] = self._company_confidence(validated_sources, sources_processed)
+        elif kind == 'role':
+            refined['confidence_score'] = self._role_confidence(validated_sources, sources_processed)
+        else:
+            # Only profiles that passed interviewer validation count
+            linkedin_profiles_found = analysis['linkedin_profiles_found'] + sum(
+                self._is_linkedin_profile(v['source'].get('url', '')) for v in new_validated
+            )
+            refined['linkedin_profiles_found'] = linkedin_profiles_found
+            refined['linkedin_analysis'] = (f"Found {linkedin_profiles_found} LinkedIn profiles" if linkedin_profiles_found > 0
+                                            else "No verified LinkedIn profiles found")
+            refined['confidence_score'] = self._interviewer_confidence(validated_sources, sources_processed, linkedin_profiles_found)
+        
+        if refined['confidence_score'] < analysis['confidence_score']:
+            return None
+        
+        room = max(0, self.CITATION_LIMITS[kind] - len(analysis['citations']))
+        refined['citations'] = analysis['citations'] + self._generate_citations(new_validated[:room], citation_counter)
+        return refined
+    
     def _assess_research_sufficiency(self, research_data: Dict, citations_db: Dict) -> Dict[str, Any]:
         """Assess if research is sufficient for prep guide generation"""
         quality_score = 0
@@ -951,7 +1677,7 @@ class DeepResearchPipeline:
         
         # Company analysis quality
         company_analysis = research_data.get('company_analysis', {})
-        if company_analysis.get('success') and company_analysis.get('confidence_score', 0) >= 0.6:
+        if company_analysis.get('success') and company_analysis.get('confidence_score', 0) >= self.SUFFICIENT_CONFIDENCE:
             quality_score += 3
             assessment_factors.append("Company analysis: HIGH quality")
         elif company_analysis.get('success'):
@@ -962,7 +1688,7 @@ class DeepResearchPipeline:
         
         # Role analysis quality
         role_analysis = research_data.get('role_analysis', {})
-        if role_analysis.get('success') and role_analysis.get('confidence_score', 0) >= 0.6:
+        if role_analysis.get('success') and role_analysis.get('confidence_score', 0) >= self.SUFFICIENT_CONFIDENCE:
             quality_score += 2
             assessment_factors.append("Role analysis: GOOD quality")
         elif role_analysis.get('success'):
@@ -1065,7 +1791,7 @@ class DeepResearchPipeline:
     def _display_role_analysis_results(self, role_analysis: Dict):
         """Display role analysis results"""
         print(f"   ✅ ROLE ANALYSIS: {role_analysis['analysis_summary']}")
-        print(f"   🎯 Skills Analysis: {role_analysis['skills_analysis']}")
+        print(f"   🎯 Role Insights: {role_analysis['role_insights']}")
         print(f"   📈 Confidence: {role_analysis['confidence_score']:.2f}")
         print(f"   📚 Validated Sources: {len(role_analysis['validated_sources'])}/{role_analysis['sources_processed']}")
     
@@ -1086,7 +1812,17 @@ class DeepResearchPipeline:
         print(f"   ✅ Sources Validated: {metrics['sources_validated']}")
         print(f"   📝 Citations Generated: {metrics['citation_count']}")
         print(f"   🔗 LinkedIn Profiles Found: {metrics['linkedin_profiles_found']}")
+        if result['artifact_reuse']['reused']:
+            print(f"   ♻️  Reused Stored Analyses: {', '.join(result['artifact_reuse']['reused'])}")
         print(f"   🔄 Reflection Loops: {result['reflection_loops']}")
+        budget = result.get('research_budget') or {}
+        if budget:
+            print(f"   ⏱️  Research Budget: {budget['queries']} searches, {budget['skipped']} skipped "
+                  f"(stopped: {budget['stop_reason']})")
+        followup = result.get('reflection_followup') or {}
+        if followup.get('queries'):
+            print(f"   🔁 Reflection Follow-up: {followup['queries']} queries in {followup['elapsed']:.2f}s, "
+                  f"refined: {', '.join(followup['refined']) or 'none'} (stopped: {followup['stop_reason']})")
         print(f"   📈 Overall Confidence: {result['overall_confidence']:.2f}")
         print(f"   🏆 Research Quality: {result['research_quality']}")
         print(f"   📚 Sufficient for Prep Guide: {'YES' if result['sufficient_for_prep_guide'] else 'NO'}")
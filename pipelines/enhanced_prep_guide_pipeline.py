@@ -10,30 +10,45 @@ Includes detailed console log capture for validation/rejection details
 import os
 import re
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable
 
 # Import shared components
 from shared.openai_client import get_openai_client, generate_text
 from shared.citation_manager import CitationManager, get_citation_manager
-from shared.prep_guide_prompts import get_complete_prep_guide_prompt, get_entity_value
-from shared.simple_cache import cached_openai_generate
+from shared.prep_guide_prompts import build_prep_guide_prompt, get_entity_value
+from shared.simple_cache import cached_openai_generate, cached_openai_stream
 from shared.console_log_capture import start_log_capture, stop_log_capture, get_validation_logs_for_file
 from agents.research_engine.second_loop_research_engine import enhance_prep_guide_with_second_loop
 
 class EnhancedPrepGuidePipeline:
     """
     Enhanced Prep Guide Pipeline with full integration
+    
+    In streaming mode the prep guide is written to its output file section by
+    section as the completion arrives, and partial content is passed to
+    stream_callback(company_name, content_so_far) for live UI previews.
     """
     
-    def __init__(self):
+    # Minimum seconds between partial-content callbacks
+    STREAM_PUSH_INTERVAL = 0.25
+    
+    def __init__(self, stream: bool = False, stream_callback: Optional[Callable[[str, str], None]] = None):
         self.citation_manager = get_citation_manager()
+        self.stream_callback = stream_callback
+        self.streaming = (stream or stream_callback is not None or
+                          os.getenv('PREP_GUIDE_STREAMING', '').lower() == 'true')
+        # Token budget report for the most recent prep guide prompt
+        self.prompt_context_report: Dict[str, Any] = {}
         
         print("✅ Enhanced Prep Guide Pipeline initialized with:")
         print("   📝 Citation Manager")
         print("   🤖 OpenAI Client")
         print("   📋 Prep Guide Prompts")
+        if self.streaming:
+            print("   📡 Streaming Output")
     
     def generate_prep_guide(self, email: Dict[str, Any], 
                           entities: Dict[str, Any], 
@@ -79,7 +94,7 @@ class EnhancedPrepGuidePipeline:
             
             # Generate main prep guide content using OpenAI (new format)
             prep_guide_content = self._generate_prep_guide_content(
-                personalization_data, email, research_data, entities
+                personalization_data, email, research_data, entities, email_index
             )
             
             # SECOND LOOP: Intelligent gap analysis and additional research
@@ -94,7 +109,7 @@ class EnhancedPrepGuidePipeline:
                 # Regenerate prep guide with enhanced research data
                 print("   🔄 Regenerating prep guide with enhanced research...")
                 prep_guide_content = self._generate_prep_guide_content(
-                    personalization_data, email, research_data, entities
+                    personalization_data, email, research_data, entities, email_index
                 )
             else:
                 print("   ℹ️  Second loop: No additional research needed")
@@ -124,6 +139,7 @@ class EnhancedPrepGuidePipeline:
                 'prep_guide_content': complete_content,
                 'citations_used': citations_used,
                 'generation_time': processing_time,
+                'prompt_context': self.prompt_context_report,
                 'errors': []
             }
             
@@ -423,12 +439,14 @@ class EnhancedPrepGuidePipeline:
     def _generate_prep_guide_content(self, personalization_data: Dict[str, Any], 
                                    email: Dict[str, Any], 
                                    research_data: Dict[str, Any],
-                                   entities: Dict[str, Any]) -> str:
+                                   entities: Dict[str, Any],
+                                   email_index: int = 1) -> str:
         """Generate prep guide content using OpenAI with enhanced data-driven prompt"""
         
         try:
-            # Create comprehensive data-driven prompt
-            prompt = get_complete_prep_guide_prompt(email, entities, research_data)
+            # Create comprehensive data-driven prompt within the token budgets
+            prompt, self.prompt_context_report = build_prep_guide_prompt(email, entities, research_data)
+            self._display_prompt_context_report(self.prompt_context_report)
             
             print("🤖 Generating AI-driven personalized prep guide from email + research data...")
             print(f"   📧 Email contains: 'I'm Rakesh Gohel' -> should extract this name")
@@ -436,11 +454,12 @@ class EnhancedPrepGuidePipeline:
             print(f"   🔗 Research contains: 'Rakesh Gohel LinkedIn' -> should use this URL")
             
             # Always use fresh AI generation - no fallback to hardcoded content
-            content = cached_openai_generate(
-                prompt=prompt,
-                model="gpt-4o",  # Use GPT-4o for better extraction
+            company_name = personalization_data['company_name']
+            content = self._complete_prep_guide(
+                prompt,
                 temperature=0.1,  # Very low temperature for precise extraction
-                max_tokens=3000  # More tokens for detailed content
+                company_name=company_name,
+                email_index=email_index
             )
             
             if not content:
@@ -473,11 +492,11 @@ CRITICAL: Your response MUST start with exactly this structure:
 
 Generate the complete response now with this exact format:"""
                 
-                content = cached_openai_generate(
-                    prompt=strict_prompt,
-                    model="gpt-4o",
+                content = self._complete_prep_guide(
+                    strict_prompt,
                     temperature=0.05,
-                    max_tokens=3000
+                    company_name=company_name,
+                    email_index=email_index
                 )
             
             # Enhanced validation - but don't fail if it doesn't pass
@@ -500,6 +519,85 @@ Generate the complete response now with this exact format:"""
             print("   � OpenAI failed - using research-based fallback...")
             return self._generate_research_based_fallback(personalization_data, entities, research_data)
     
+    def _display_prompt_context_report(self, report: Dict[str, Any]):
+        """Show how the research context fit its token budget"""
+        print(f"   📏 Research context: {report['used_tokens']}/{report['budget_tokens']} tokens, "
+              f"{report['citations_included']}/{report['citations_total']} citations")
+        if report.get('email_truncated'):
+            print(f"   ✂️  Email body truncated to {report['email_tokens']} tokens")
+        if report['section_limited']:
+            print(f"   📚 {report['section_limited']} citations outside the per-section limits")
+        if report['snippets_trimmed']:
+            print(f"   ✂️  Snippets omitted for {len(report['snippets_trimmed'])} citations")
+        for dropped in report['dropped']:
+            print(f"   🗑️  Dropped citation [{dropped['id']}] (quality {dropped['quality_score']}, "
+                  f"{dropped['tokens']} tokens): {dropped['source'][:60]}...")
+    
+    def _complete_prep_guide(self, prompt: str, temperature: float,
+                             company_name: str, email_index: int) -> str:
+        """Run the prep guide completion, streaming it when streaming mode is on"""
+        if not self.streaming:
+            return cached_openai_generate(
+                prompt=prompt,
+                model="gpt-4o",  # Use GPT-4o for better extraction
+                temperature=temperature,
+                max_tokens=3000  # More tokens for detailed content
+            )
+        
+        try:
+            return self._stream_prep_guide_content(prompt, temperature, company_name, email_index)
+        except Exception as e:
+            print(f"   ⚠️  Streaming failed ({e}) - falling back to a blocking completion")
+            return cached_openai_generate(prompt=prompt, model="gpt-4o", temperature=temperature, max_tokens=3000)
+    
+    def _stream_prep_guide_content(self, prompt: str, temperature: float,
+                                   company_name: str, email_index: int) -> str:
+        """
+        Stream the completion into the output file one finished section at a
+        time, pushing partial content to stream_callback as it arrives
+        """
+        file_path = self._prep_guide_file_path(company_name, email_index)
+        start = time.time()
+        first_content_at = None
+        last_push = 0.0
+        content = ''
+        written = 0
+        
+        with open(file_path, 'w', encoding='utf-8') as f:
+            for delta in cached_openai_stream(prompt=prompt, model="gpt-4o",
+                                              temperature=temperature, max_tokens=3000):
+                if first_content_at is None:
+                    first_content_at = time.time() - start
+                    print(f"   📡 First content after {first_content_at:.2f}s - streaming to {file_path}")
+                content += delta
+                
+                # A new "## " heading means every section before it is complete
+                boundary = content.rfind('\n## ', written)
+                if boundary > written:
+                    f.write(content[written:boundary])
+                    f.flush()
+                    written = boundary
+                
+                now = time.time()
+                if now - last_push >= self.STREAM_PUSH_INTERVAL:
+                    self._push_partial_content(company_name, content)
+                    last_push = now
+            
+            f.write(content[written:])
+        
+        self._push_partial_content(company_name, content)
+        print(f"   📡 Streamed {len(content)} characters in {time.time() - start:.2f}s")
+        return content
+    
+    def _push_partial_content(self, company_name: str, content: str):
+        """Send partial prep guide content to the UI callback, if any"""
+        if not self.stream_callback or not content:
+            return
+        try:
+            self.stream_callback(company_name, content)
+        except Exception as e:
+            print(f"   ⚠️  Stream callback error: {e}")
+    
     def _validate_ai_generated_content(self, content: str, email: Dict[str, Any], 
                                      entities: Dict[str, Any], research_data: Dict[str, Any]) -> bool:
         """Validate that AI content uses real data rather than generic content"""
@@ -1199,29 +1297,31 @@ Prep Guide Generated: True"""
                 formatted.append(f"      • {key}: {value}")
         return '\n'.join(formatted) if formatted else "      • No entities extracted"
     
+    def _prep_guide_file_path(self, company_name: str, email_index: int) -> Path:
+        """Output file path for a company's prep guide (creates the directory)"""
+        # Create safe filename
+        safe_company = re.sub(r'[^a-zA-Z0-9\s]', '', company_name)
+        safe_company = re.sub(r'\s+', ' ', safe_company.strip())
+        if not safe_company or safe_company.lower() == 'unknown company':
+            safe_company = f'Company_{email_index}'
+        
+        # Ensure output directory exists
+        output_dir = Path("outputs/fullworkflow")
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        return output_dir / f"{safe_company}.txt"
+    
     def _save_prep_guide_file(self, content, company_name, email_index):
         """Save prep guide to file"""
         
         try:
-            # Create safe filename
-            safe_company = re.sub(r'[^a-zA-Z0-9\s]', '', company_name)
-            safe_company = re.sub(r'\s+', ' ', safe_company.strip())
-            if not safe_company or safe_company.lower() == 'unknown company':
-                safe_company = f'Company_{email_index}'
-            
-            filename = f"{safe_company}.txt"
-            
-            # Ensure output directory exists
-            output_dir = Path("outputs/fullworkflow")
-            output_dir.mkdir(parents=True, exist_ok=True)
-            
-            file_path = output_dir / filename
+            file_path = self._prep_guide_file_path(company_name, email_index)
             
             # Write file
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write(content)
             
-            return filename
+            return file_path.name
             
         except Exception as e:
             print(f"❌ File save error: {str(e)}")
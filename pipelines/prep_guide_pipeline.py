@@ -20,6 +20,8 @@ import re
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from shared.openai_client import get_openai_client
+from shared.openai_cache import count_tokens
+from shared.rate_limiter import get_provider_limiter
 
 
 class PrepGuidePipeline:
@@ -247,16 +249,19 @@ Generate a well-structured prep guide with these sections:
 Make this comprehensive, specific, and immediately actionable for interview success.
 """
 
+        model = "gpt-4"
+        max_tokens = 4000
+        messages = [
+            {"role": "system", "content": "You are an expert interview preparation consultant who creates comprehensive, actionable prep guides."},
+            {"role": "user", "content": prompt}
+        ]
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert interview preparation consultant who creates comprehensive, actionable prep guides."},
-                    {"role": "user", "content": prompt}
-                ],
+            response = get_provider_limiter('openai').call(lambda: self.client.chat.completions.create(
+                model=model,
+                messages=messages,
                 temperature=0.7,
-                max_tokens=4000
-            )
+                max_tokens=max_tokens
+            ), tokens=count_tokens("\n".join(m['content'] for m in messages), model) + max_tokens)
             
             return response.choices[0].message.content
             
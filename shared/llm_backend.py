@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+LLM Backend - Record, replay and synthetic stand-ins for the OpenAI API
+======================================================================
+
+LLM_BACKEND selects what the shared OpenAI clients (openai_client.py) talk to,
+so generate_text, cached_openai_generate, LLMClient and call_llm all follow it:
+
+    openai     real API (default)
+    record     real API; every response is saved with its token usage and latency
+    replay     recorded responses, no network; unrecorded requests fall back to synthetic
+    synthetic  deterministic generated text with modelled latency, no network
+
+Recordings live in llm_recordings.db under CACHE_DIR (LLM_RECORDINGS_PATH). Replay waits
+the recorded latency times LLM_REPLAY_LATENCY_SCALE (0 = instant). Synthetic
+responses are LLM_SYNTHETIC_TOKENS tokens long (capped by max_tokens) and take
+LLM_SYNTHETIC_BASE_LATENCY + tokens / LLM_SYNTHETIC_TOKENS_PER_SECOND seconds.
+Replay and synthetic responses bypass the persistent OpenAI response cache, so
+offline runs never leave fake text behind for a later real run. Record mode
+bypasses it too: a response served from a warm cache would never reach the
+recorder, and replaying the run would then quietly fall back to synthetic text.
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, Any, Optional, Iterator, List
+
+from shared.openai_cache import count_tokens, truncate_to_tokens
+from shared.simple_cache import cache_path
+
+LLM_BACKENDS = ('openai', 'record', 'replay', 'synthetic')
+OFFLINE_BACKENDS = ('replay', 'synthetic')
+# Every request must reach the backend client, never the persistent OpenAI cache
+CACHE_BYPASS_BACKENDS = OFFLINE_BACKENDS + ('record',)
+
+SYNTHETIC_WORDS = (
+    "interview company role team research experience project impact data product customer "
+    "strategy growth platform engineering culture leadership question example result skill"
+).split()
+
+
+def llm_backend_mode() -> str:
+    mode = os.getenv('LLM_BACKEND', 'openai').lower()
+    if mode not in LLM_BACKENDS:
+        raise ValueError(f"Unknown LLM_BACKEND '{mode}' (expected one of {', '.join(LLM_BACKENDS)})")
+    return mode
+
+
+def is_offline_backend() -> bool:
+    """Whether LLM calls are served without the network (and without an API key)"""
+    return llm_backend_mode() in OFFLINE_BACKENDS
+
+
+def bypasses_openai_cache() -> bool:
+    """Whether LLM calls skip the persistent OpenAI response cache (offline and record modes)"""
+    return llm_backend_mode() in CACHE_BYPASS_BACKENDS
+
+
+def llm_backend_settings() -> Dict[str, Any]:
+    return {
+        'mode': llm_backend_mode(),
+        'recordings_path': os.getenv('LLM_RECORDINGS_PATH') or cache_path("llm_recordings.db"),
+        'replay_latency_scale': float(os.getenv('LLM_REPLAY_LATENCY_SCALE', '1.0')),
+        'synthetic_tokens': int(os.getenv('LLM_SYNTHETIC_TOKENS', '300')),
+        'synthetic_base_latency': float(os.getenv('LLM_SYNTHETIC_BASE_LATENCY', '0.5')),
+        'synthetic_tokens_per_second': float(os.getenv('LLM_SYNTHETIC_TOKENS_PER_SECOND', '50')),
+    }
+
+
+def request_key(model: str, messages: List[Dict[str, Any]], max_tokens: Optional[int], temperature: float) -> str:
+    """Canonical hash of a chat completion request"""
+    data = json.dumps({
+        'model': model,
+        'messages': messages,
+        'max_tokens': max_tokens,
+        'temperature': temperature
+    }, sort_keys=True)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def _prompt_text(messages: List[Dict[str, Any]]) -> str:
+    return "\n".join(str(m.get('content', '')) for m in messages)
+
+
+class RecordingStore:
+    """SQLite store of recorded chat completions"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = Path(db_path or cache_path("llm_recordings.db"))
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS recordings (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                prompt_tokens INTEGER NOT NULL,
+                completion_tokens INTEGER NOT NULL,
+                latency REAL NOT NULL,
+                recorded_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, prompt_tokens, completion_tokens, latency FROM recordings WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'text': row[0], 'prompt_tokens': row[1], 'completion_tokens': row[2], 'latency': row[3]}
+
+    def put(self, key: str, model: str, text: str, prompt_tokens: int, completion_tokens: int, latency: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO recordings VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, text, prompt_tokens, completion_tokens, latency, time.time())
+            )
+            self._conn.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM recordings").fetchone()[0]
+
+
+class SyntheticBackend:
+    """Deterministic responses: the same request always gets the same text and latency"""
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        self.settings = settings or llm_backend_settings()
+
+    def respond(self, model: str, messages: List[Dict[str, Any]], max_tokens: Optional[int],
+                temperature: float) -> Dict[str, Any]:
+        key = request_key(model, messages, max_tokens, temperature)
+        rng = random.Random(key)
+        target_tokens = self.settings['synthetic_tokens']
+        if max_tokens:
+            target_tokens = min(target_tokens, max_tokens)
+        # At least one token per word, then cut to the target length
+        words = ' '.join(rng.choice(SYNTHETIC_WORDS) for _ in range(max(1, target_tokens)))
+        text = truncate_to_tokens(words, max(1, target_tokens), model)
+        completion_tokens = count_tokens(text, model)
+        latency = (self.settings['synthetic_base_latency'] +
+                   completion_tokens / max(self.settings['synthetic_tokens_per_second'], 1e-6))
+        return {
+            'text': text,
+            'prompt_tokens': count_tokens(_prompt_text(messages), model),
+            'completion_tokens': completion_tokens,
+            'latency': latency
+        }
+
+
+class ReplayBackend:
+    """Serve recorded responses; unrecorded requests fall back to synthetic ones"""
+
+    def __init__(self, store: RecordingStore, settings: Optional[Dict[str, Any]] = None):
+        self.store = store
+        self.settings = settings or llm_backend_settings()
+        self.fallback = SyntheticBackend(self.settings)
+        self.stats = {'replayed': 0, 'misses': 0}
+
+    def respond(self, model: str, messages: List[Dict[str, Any]], max_tokens: Optional[int],
+                temperature: float) -> Dict[str, Any]:
+        recording = self.store.get(request_key(model, messages, max_tokens, temperature))
+        if recording is None:
+            self.stats['misses'] += 1
+            print(f"⚠️ No recorded LLM response for this request - using synthetic response")
+            response = self.fallback.respond(model, messages, max_tokens, temperature)
+        else:
+            self.stats['replayed'] += 1
+            response = recording
+        return dict(response, latency=response['latency'] * self.settings['replay_latency_scale'])
+
+
+def _completion(text: str, prompt_tokens: int, completion_tokens: int):
+    """Response object shaped like openai's ChatCompletion"""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=text), finish_reason='stop')],
+        usage=SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+                              total_tokens=prompt_tokens + completion_tokens)
+    )
+
+
+def _chunk(text: str):
+    """Stream chunk shaped like openai's ChatCompletionChunk"""
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+def _split_stream(text: str, pieces: int = 20) -> List[str]:
+    words = text.split(' ')
+    size = max(1, len(words) // pieces)
+    return [' '.join(words[i:i + size]) + (' ' if i + size < len(words) else '')
+            for i in range(0, len(words), size)]
+
+
+class _OfflineCompletions:
+    def __init__(self, backend):
+        self._backend = backend
+
+    def create(self, model: str, messages: List[Dict[str, Any]], max_tokens: Optional[int] = None,
+               temperature: float = 0.7, stream: bool = False, **kwargs):
+        response = self._backend.respond(model, messages, max_tokens, temperature)
+        if stream:
+            return self._stream(response)
+        time.sleep(response['latency'])
+        return _completion(response['text'], response['prompt_tokens'], response['completion_tokens'])
+
+    @staticmethod
+    def _stream(response: Dict[str, Any]) -> Iterator:
+        pieces = _split_stream(response['text'])
+        for piece in pieces:
+            time.sleep(response['latency'] / len(pieces))
+            yield _chunk(piece)
+
+
+class _AsyncOfflineCompletions:
+    def __init__(self, backend):
+        self._backend = backend
+
+    async def create(self, model: str, messages: List[Dict[str, Any]], max_tokens: Optional[int] = None,
+                     temperature: float = 0.7, **kwargs):
+        response = self._backend.respond(model, messages, max_tokens, temperature)
+        await asyncio.sleep(response['latency'])
+        return _completion(response['text'], response['prompt_tokens'], response['completion_tokens'])
+
+
+class OfflineClient:
+    """Stand-in for openai.OpenAI / AsyncOpenAI backed by a replay or synthetic backend"""
+
+    def __init__(self, backend, async_client: bool = False):
+        self.backend = backend
+        self._async_client = async_client
+        completions = _AsyncOfflineCompletions(backend) if async_client else _OfflineCompletions(backend)
+        self.chat = SimpleNamespace(completions=completions)
+
+    def close(self):
+        """Nothing to release; awaitable for an async client, like AsyncOpenAI.close"""
+        if self._async_client:
+            return asyncio.sleep(0)
+
+
+class _RecordingCompletions:
+    def __init__(self, completions, store: RecordingStore):
+        self._completions = completions
+        self._store = store
+
+    def create(self, model: str, messages: List[Dict[str, Any]], max_tokens: Optional[int] = None,
+               temperature: float = 0.7, stream: bool = False, **kwargs):
+        key = request_key(model, messages, max_tokens, temperature)
+        start = time.perf_counter()
+        response = self._completions.create(model=model, messages=messages, max_tokens=max_tokens,
+                                            temperature=temperature, stream=stream, **kwargs)
+        if stream:
+            return self._record_stream(response, key, model, messages, start)
+        _save(self._store, key, model, messages, response, time.perf_counter() - start)
+        return response
+
+    def _record_stream(self, stream, key: str, model: str, messages: List[Dict[str, Any]], start: float):
+        parts = []
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+            yield chunk
+        completion = _completion(''.join(parts), None, None)
+        _save(self._store, key, model, messages, completion, time.perf_counter() - start)
+
+
+class _AsyncRecordingCompletions:
+    def __init__(self, completions, store: RecordingStore):
+        self._completions = completions
+        self._store = store
+
+    async def create(self, model: str, messages: List[Dict[str, Any]], max_tokens: Optional[int] = None,
+                     temperature: float = 0.7, **kwargs):
+        start = time.perf_counter()
+        response = await self._completions.create(model=model, messages=messages, max_tokens=max_tokens,
+                                                  temperature=temperature, **kwargs)
+        _save(self._store, request_key(model, messages, max_tokens, temperature), model, messages,
+              response, time.perf_counter() - start)
+        return response
+
+
+def _save(store: RecordingStore, key: str, model: str, messages: List[Dict[str, Any]], response, latency: float):
+    text = response.choices[0].message.content or ''
+    usage = getattr(response, 'usage', None)
+    prompt_tokens = getattr(usage, 'prompt_tokens', None)
+    completion_tokens = getattr(usage, 'completion_tokens', None)
+    if not isinstance(prompt_tokens, int) or not isinstance(completion_tokens, int):
+        prompt_tokens, completion_tokens = count_tokens(_prompt_text(messages), model), count_tokens(text, model)
+    try:
+        store.put(key, model, text, prompt_tokens, completion_tokens, latency)
+    except Exception as e:
+        print(f"⚠️ Failed to record LLM response: {e}")
+
+
+class RecordingClient:
+    """Wraps a real OpenAI client and records every chat completion it returns"""
+
+    def __init__(self, client, store: RecordingStore, async_client: bool = False):
+        self._client = client
+        completions_cls = _AsyncRecordingCompletions if async_client else _RecordingCompletions
+        self.chat = SimpleNamespace(completions=completions_cls(client.chat.completions, store))
+
+    def close(self):
+        """Close the wrapped client; for an AsyncOpenAI client this returns the coroutine to await"""
+        return self._client.close()
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+_stores: Dict[str, RecordingStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_recording_store(db_path: Optional[str] = None) -> RecordingStore:
+    db_path = db_path or llm_backend_settings()['recordings_path']
+    with _stores_lock:
+        if db_path not in _stores:
+            _stores[db_path] = RecordingStore(db_path)
+        return _stores[db_path]
+
+
+def build_backend_client(real_client_factory, async_client: bool = False):
+    """
+    Client for the configured LLM_BACKEND
+
+    Args:
+        real_client_factory: Builds the real OpenAI client (only called for openai/record)
+        async_client: Whether an AsyncOpenAI-compatible client is needed
+    """
+    settings = llm_backend_settings()
+    mode = settings['mode']
+
+    if mode == 'synthetic':
+        return OfflineClient(SyntheticBackend(settings), async_client)
+    if mode == 'replay':
+        return OfflineClient(ReplayBackend(get_recording_store(settings['recordings_path']), settings), async_client)
+
+    client = real_client_factory()
+    if mode == 'record':
+        return RecordingClient(client, get_recording_store(settings['recordings_path']), async_client)
+    return client
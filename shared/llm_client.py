@@ -1,33 +1,45 @@
 # This file is to handle interactions with the OpenAI LLM client.
 # It includes functions to call the LLM with a prompt and return the response.
 import os
-from openai import AsyncOpenAI, OpenAI
+import time
+import asyncio
 from dotenv import load_dotenv
-from .openai_cache import OpenAICache
-from typing import Optional
+from .openai_client import get_openai_client, get_async_openai_client
+from .llm_backend import bypasses_openai_cache, is_offline_backend
+from .openai_cache import OpenAICache, count_tokens
+from .simple_cache import openai_singleflight
+from .rate_limiter import AsyncTokenBucket, get_provider_limiter
+from .telemetry import record_llm_call, record_llm_cache_hit, usage_tokens
+from typing import Optional, List, Dict, Any
 
 # Load .env file 
 load_dotenv()
 
-# Initialize OpenAI client
+# OpenAI clients come from the shared, pooled registry in openai_client.py
 openai_api_key = os.getenv("OPENAI_API_KEY")
 if not openai_api_key:
-  print("⚠️  OPENAI_API_KEY not found in environment variables. Using cache-only mode.")
+  if not is_offline_backend():
+    print("⚠️  OPENAI_API_KEY not found in environment variables. Using cache-only mode.")
   openai_api_key = "dummy-key-for-cache-only"
 
-async_client = AsyncOpenAI(api_key=openai_api_key) if openai_api_key != "dummy-key-for-cache-only" else None
-sync_client = OpenAI(api_key=openai_api_key) if openai_api_key != "dummy-key-for-cache-only" else None
+# Replay/synthetic backends (LLM_BACKEND) serve calls without an API key
+has_api_key = openai_api_key != "dummy-key-for-cache-only" or is_offline_backend()
 
 # Initialize cache
 openai_cache = OpenAICache()
 
 
+def _openai_cache_disabled() -> bool:
+    """DISABLE_OPENAI_CACHE, an offline backend whose text must not be cached as real output, or record mode"""
+    return os.getenv('DISABLE_OPENAI_CACHE', '').lower() == 'true' or bypasses_openai_cache()
+
+
 class LLMClient:
     """Synchronous LLM client wrapper for interview prep intelligence with caching"""
     
     def __init__(self, model: str = "gpt-4o-mini", use_cache: bool = True):
         self.model = model
-        self.client = sync_client
+        self.client = get_openai_client() if has_api_key else None
         self.use_cache = use_cache
         self.cache = openai_cache if use_cache else None
     
@@ -44,11 +56,17 @@ class LLMClient:
         Returns:
             Generated text response
         """
+        start = time.perf_counter()
+        # Offline backends (replay/synthetic) and record mode never read or fill the persistent cache
+        use_cache = bool(self.use_cache and self.cache) and not bypasses_openai_cache()
+        
         # Check cache first if enabled
-        if self.use_cache and self.cache:
+        if use_cache:
             cached_response = self.cache.get(prompt, self.model, max_tokens, temperature)
             if cached_response:
                 print(f"🗄️ Using cached response for {company_name or 'query'}")
+                record_llm_cache_hit('LLMClient.generate_text', self.model, prompt, cached_response,
+                                     time.perf_counter() - start)
                 return cached_response
         
         # If no OpenAI client available and no cache hit, return mock response
@@ -57,7 +75,7 @@ class LLMClient:
             print(f"🤖 Using mock response for {company_name or 'query'} (no API key)")
             
             # Cache the mock response
-            if self.use_cache and self.cache:
+            if use_cache:
                 self.cache.set(prompt, self.model, max_tokens, temperature, mock_response, company_name)
             
             return mock_response
@@ -65,7 +83,7 @@ class LLMClient:
         try:
             # Make API call
             print(f"🌐 Making OpenAI API call for {company_name or 'query'}")
-            response = self.client.chat.completions.create(
+            response = get_provider_limiter('openai').call(lambda: self.client.chat.completions.create(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are a helpful assistant that generates structured responses for interview preparation."},
@@ -73,23 +91,27 @@ class LLMClient:
                 ],
                 max_tokens=max_tokens,
                 temperature=temperature
-            )
+            ), tokens=count_tokens(prompt, self.model) + max_tokens)
             
             response_text = response.choices[0].message.content
+            prompt_tokens, completion_tokens = usage_tokens(response, prompt, response_text, self.model)
+            record_llm_call('LLMClient.generate_text', self.model, prompt_tokens, completion_tokens,
+                            time.perf_counter() - start)
             
             # Cache the response
-            if self.use_cache and self.cache:
+            if use_cache:
                 self.cache.set(prompt, self.model, max_tokens, temperature, response_text, company_name)
             
             return response_text
             
         except Exception as e:
             print(f"❌ OpenAI API error: {str(e)}")
+            record_llm_call('LLMClient.generate_text', self.model, 0, 0, time.perf_counter() - start, success=False)
             # Fallback to mock response
             mock_response = self._generate_mock_response(prompt, company_name)
             
             # Cache the mock response
-            if self.use_cache and self.cache:
+            if use_cache:
                 self.cache.set(prompt, self.model, max_tokens, temperature, mock_response, company_name)
             
             return mock_response
@@ -216,6 +238,38 @@ def get_llm_client(model: str = "gpt-4o-mini") -> LLMClient:
     return LLMClient(model=model)
 
 
+async def _chat_request(client, prompt: str, model: str, max_tokens: int, temperature: float,
+                        operation: str = "call_llm", max_retries: Optional[int] = None) -> str:
+  """
+  Single chat completion request, coalesced with identical in-flight prompts
+  
+  Runs under the shared 'openai' limiter: rate budget, retries with backoff
+  (max_retries overrides OPENAI_RETRIES) and the circuit breaker.
+  """
+  async def _request() -> str:
+    start = time.perf_counter()
+    try:
+      response = await get_provider_limiter('openai').acall(lambda: client.chat.completions.create(
+        model=model,
+        messages=[
+          {"role": "system", "content": "You are a helpful assistant."},
+          {"role": "user", "content": prompt}
+        ],
+        max_tokens=max_tokens,
+        temperature=temperature
+      ), tokens=count_tokens(prompt, model) + max_tokens, max_retries=max_retries)
+    except Exception:
+      record_llm_call(operation, model, 0, 0, time.perf_counter() - start, success=False)
+      raise
+    content = response.choices[0].message.content
+    prompt_tokens, completion_tokens = usage_tokens(response, prompt, content, model)
+    record_llm_call(operation, model, prompt_tokens, completion_tokens, time.perf_counter() - start)
+    return content
+  
+  flight_key = OpenAICache.make_key(prompt, model, max_tokens, temperature)
+  return await openai_singleflight.do_async(flight_key, _request)
+
+
 # Function to call the LLM with a prompt (async version)
 async def call_llm(prompt: str, model: str = "gpt-3.5-turbo", max_tokens: int = 1000, temperature: float = 0.0) -> str:
   """
@@ -231,15 +285,19 @@ async def call_llm(prompt: str, model: str = "gpt-3.5-turbo", max_tokens: int =
       str: The response text from the LLM.
   """
   # Check if caching is disabled via environment variable
-  disable_cache = os.getenv('DISABLE_OPENAI_CACHE', '').lower() == 'true'
+  disable_cache = _openai_cache_disabled()
   
   # Check cache first (unless disabled)
+  start = time.perf_counter()
   if not disable_cache and openai_cache:
       cached_response = openai_cache.get(prompt, model, max_tokens, temperature)
       if cached_response:
           print(f"🗄️ Using cached response for async call")
+          record_llm_cache_hit('call_llm', model, prompt, cached_response, time.perf_counter() - start)
           return cached_response
   
+  async_client = get_async_openai_client() if has_api_key else None
+  
   # If no async client available, use mock response
   if not async_client:
       print(f"🤖 Using mock response for async call (no API key)")
@@ -257,17 +315,8 @@ async def call_llm(prompt: str, model: str = "gpt-3.5-turbo", max_tokens: int =
       else:
           print(f"🌐 Making async OpenAI API call")
       
-      response = await async_client.chat.completions.create(
-        model=model,
-        messages=[
-          {"role": "system", "content": "You are a helpful assistant."},
-          {"role": "user", "content": prompt}
-        ],
-        max_tokens=max_tokens,
-        temperature=temperature
-      )
-      
-      response_text = response.choices[0].message.content
+      # Identical concurrent prompts share one API request
+      response_text = await _chat_request(async_client, prompt, model, max_tokens, temperature)
       
       # Cache the response (unless caching disabled)
       if not disable_cache and openai_cache:
@@ -287,3 +336,70 @@ async def call_llm(prompt: str, model: str = "gpt-3.5-turbo", max_tokens: int =
         openai_cache.set(prompt, model, max_tokens, temperature, mock_response, "async_call_fallback")
     
     return mock_response
+
+
+async def call_llm_many(prompts: List[str], model: str = "gpt-3.5-turbo", max_tokens: int = 1000,
+                        temperature: float = 0.0, max_concurrency: int = 8,
+                        tpm_budget: Optional[int] = None, rpm_budget: Optional[int] = None,
+                        max_retries: int = 5) -> List[Dict[str, Any]]:
+  """
+  Calls the LLM for many prompts concurrently, with caching and rate limiting.
+  
+  Requests run at most `max_concurrency` at a time under the shared 'openai'
+  limiter (OPENAI_TPM_LIMIT / OPENAI_RPM_LIMIT; unlimited if unset), so the
+  batch shares its budget with every other OpenAI call in the process. A 429
+  pauses the budget for every request and is retried with exponential backoff.
+  tpm_budget / rpm_budget add a tighter budget for this batch only.
+  
+  Args:
+      prompts (List[str]): Input prompts.
+      model (str): Model name to use.
+      max_tokens (int): Maximum tokens to generate per prompt.
+      temperature (float): Temperature for response variability.
+      max_concurrency (int): Maximum requests in flight.
+      tpm_budget (int): Tokens per minute budget.
+      rpm_budget (int): Requests per minute budget.
+      max_retries (int): Retries per prompt after a 429 or transient error.
+
+  Returns:
+      List[Dict]: One result per prompt, in order, with 'success', 'response',
+      'cached', 'error' and 'mock' keys. Without an API key every prompt gets
+      an uncached mock response with success False and mock True.
+  """
+  disable_cache = _openai_cache_disabled()
+  batch_budget = AsyncTokenBucket(tokens_per_minute=tpm_budget, requests_per_minute=rpm_budget)
+  semaphore = asyncio.Semaphore(max(1, max_concurrency))
+  async_client = get_async_openai_client() if has_api_key else None
+  
+  def result(response: Optional[str], cached: bool = False, error: Optional[str] = None,
+             mock: bool = False) -> Dict[str, Any]:
+    return {'success': error is None, 'response': response, 'cached': cached, 'error': error, 'mock': mock}
+  
+  async def run_one(prompt: str) -> Dict[str, Any]:
+    if not disable_cache and openai_cache:
+      start = time.perf_counter()
+      cached_response = openai_cache.get(prompt, model, max_tokens, temperature)
+      if cached_response:
+        record_llm_cache_hit('call_llm_many', model, prompt, cached_response, time.perf_counter() - start)
+        return result(cached_response, cached=True)
+    
+    if not async_client:
+      # Not cached: a placeholder must not be served once an API key is configured
+      mock_response = f"Mock keyword extraction result for prompt: {prompt[:100]}..."
+      return result(mock_response, error="No OpenAI API key (mock response)", mock=True)
+    
+    async with semaphore:
+      await batch_budget.acquire(count_tokens(prompt, model) + max_tokens)
+      try:
+        response_text = await _chat_request(async_client, prompt, model, max_tokens, temperature,
+                                            operation="call_llm_many", max_retries=max_retries)
+      except Exception as e:
+        print(f"❌ Async OpenAI API error: {str(e)}")
+        return result(None, error=str(e))
+    
+    if not disable_cache and openai_cache:
+      openai_cache.set(prompt, model, max_tokens, temperature, response_text, "async_call")
+    return result(response_text)
+  
+  print(f"🌐 Running {len(prompts)} LLM calls (max {max_concurrency} concurrent)")
+  return list(await asyncio.gather(*(run_one(prompt) for prompt in prompts)))
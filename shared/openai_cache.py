@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+OpenAI Response Cache - Two-tier cache for LLM responses
+========================================================
+
+Used by shared/llm_client.py (LLMClient and call_llm):
+1. In-process LRU for repeated prompts within a run
+2. Persistent store shared with cache_manager.py (get_openai_cache())
+
+Keys are a canonical hash of (prompt, model, max_tokens, temperature).
+Entries can be tagged with a company name so that every response generated
+for one company can be invalidated at once.
+
+The memory tier is per-process: an entry expires there when its persistent
+TTL (counted from when the response was generated) runs out, and after at
+most OPENAI_MEMORY_CACHE_SECONDS (default 300) in memory, so a clear() or
+invalidate_company() run from another process (cache_manager.py) reaches a
+running process within that window.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from shared.simple_cache import cache_path, get_openai_cache
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    """tiktoken encoding for a model, or None if tiktoken (or its data) is unavailable"""
+    try:
+        import tiktoken
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """Count tokens with tiktoken when available, else ~4 characters per token"""
+    encoding = _encoding(model)
+    if encoding is None:
+        return max(1, len(text) // 4) if text else 0
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = "gpt-4o") -> str:
+    """Cut text to at most max_tokens tokens (same tokenizer and fallback as count_tokens)"""
+    if not text or max_tokens <= 0:
+        return ""
+    encoding = _encoding(model)
+    if encoding is None:
+        return text[:max_tokens * 4]
+    tokens = encoding.encode(text, disallowed_special=())
+    return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+
+
+class OpenAICache:
+    """Memory LRU in front of the persistent OpenAI cache, with company tags"""
+
+    def __init__(self, store=None, memory_size: int = 256, tags_path: Optional[str] = None,
+                 memory_seconds: Optional[float] = None):
+        self.store = store if store is not None else get_openai_cache()
+        tags_path = tags_path or cache_path("openai_tags.db")
+        self.memory_size = memory_size
+        if memory_seconds is None:
+            memory_seconds = float(os.getenv('OPENAI_MEMORY_CACHE_SECONDS', '300'))
+        self.memory_seconds = memory_seconds
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'tokens_saved': 0
+        }
+
+        Path(tags_path).parent.mkdir(parents=True, exist_ok=True)
+        self._tags = sqlite3.connect(tags_path, timeout=30, check_same_thread=False)
+        self._tags.execute("PRAGMA journal_mode=WAL")
+        self._tags.execute("""
+            CREATE TABLE IF NOT EXISTS company_tags (
+                key_data TEXT PRIMARY KEY,
+                company TEXT NOT NULL
+            )
+        """)
+        self._tags.execute("CREATE INDEX IF NOT EXISTS idx_company_tags ON company_tags(company)")
+        self._tags.commit()
+
+    @staticmethod
+    def make_key(prompt: str, model: str, max_tokens: Optional[int], temperature: Optional[float]) -> str:
+        """Canonical key string for a set of generation parameters"""
+        params = {
+            'prompt': prompt,
+            'model': model,
+            'max_tokens': max_tokens,
+            'temperature': float(temperature) if temperature is not None else None
+        }
+        return "llm:" + json.dumps(params, sort_keys=True, separators=(',', ':'))
+
+    def _ttl_seconds(self) -> float:
+        return getattr(self.store, 'ttl_hours', 168) * 3600
+
+    def _remember(self, key: str, entry: Dict[str, Any], created_at: float):
+        """Insert into the memory tier, evicting the least recently used entry"""
+        with self._lock:
+            self._memory[key] = (entry, created_at, time.time())
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def get(self, prompt: str, model: str, max_tokens: Optional[int], temperature: Optional[float]) -> Optional[str]:
+        """Return a cached response or None"""
+        key = self.make_key(prompt, model, max_tokens, temperature)
+
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                entry, created_at, loaded_at = cached
+                now = time.time()
+                if (now - created_at <= self._ttl_seconds()
+                        and now - loaded_at <= self.memory_seconds):
+                    self._memory.move_to_end(key)
+                    self.stats['memory_hits'] += 1
+                    self.stats['tokens_saved'] += entry.get('tokens', 0)
+                    return entry.get('response')
+                del self._memory[key]
+
+        found = self.store.get_entry(key)
+        entry, age = found if found is not None else (None, 0.0)
+        if not isinstance(entry, dict) or 'response' not in entry:
+            self.stats['misses'] += 1
+            return None
+
+        self._remember(key, entry, time.time() - age)
+        self.stats['disk_hits'] += 1
+        self.stats['tokens_saved'] += entry.get('tokens', 0)
+        return entry['response']
+
+    def set(self, prompt: str, model: str, max_tokens: Optional[int], temperature: Optional[float],
+            response: str, company_name: Optional[str] = None):
+        """Store a response in both tiers and tag it with its company"""
+        key = self.make_key(prompt, model, max_tokens, temperature)
+        entry = {
+            'response': response,
+            'model': model,
+            'company': company_name,
+            'tokens': count_tokens(prompt, model) + count_tokens(response or '', model)
+        }
+
+        self.store.set(key, entry)
+        self._remember(key, entry, time.time())
+
+        if company_name:
+            with self._lock:
+                self._tags.execute(
+                    "INSERT OR REPLACE INTO company_tags (key_data, company) VALUES (?, ?)",
+                    (key, company_name.strip().lower())
+                )
+                self._tags.commit()
+
+    def invalidate_company(self, company_name: str) -> int:
+        """Remove every cached response tagged with a company"""
+        company = company_name.strip().lower()
+        with self._lock:
+            keys = [row[0] for row in self._tags.execute(
+                "SELECT key_data FROM company_tags WHERE company = ?", (company,)
+            )]
+            for key in keys:
+                self._memory.pop(key, None)
+            self._tags.execute("DELETE FROM company_tags WHERE company = ?", (company,))
+            self._tags.commit()
+
+        return sum(1 for key in keys if self.store.delete(key))
+
+    def clear(self) -> int:
+        """Clear both tiers and all company tags"""
+        with self._lock:
+            self._memory.clear()
+            self._tags.execute("DELETE FROM company_tags")
+            self._tags.commit()
+        return self.store.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate and tokens saved for this process, plus persistent store stats"""
+        hits = self.stats['memory_hits'] + self.stats['disk_hits']
+        lookups = hits + self.stats['misses']
+
+        return {
+            **self.stats,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'memory_entries': len(self._memory),
+            'store': self.store.get_stats()
+        }
@@ -3,35 +3,197 @@
 OpenAI Client - Centralized OpenAI API Interface
 ===============================================
 
-Provides a centralized OpenAI client with caching and error handling
+Provides a centralized OpenAI client with caching and error handling.
+
+Clients are process-wide singletons with keep-alive connection pooling, so
+every caller (generate_text, cached_openai_generate, LLMClient, call_llm)
+reuses warm connections instead of opening a new pool per request. Pool
+limits and timeouts are read from the environment:
+
+    OPENAI_MAX_CONNECTIONS            (default 20)
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS  (default 10)
+    OPENAI_KEEPALIVE_EXPIRY           seconds (default 30)
+    OPENAI_TIMEOUT                    seconds (default 60)
+    OPENAI_CONNECT_TIMEOUT            seconds (default 10)
+    OPENAI_MAX_RETRIES                SDK retries (default 0)
+
+Requests go through the 'openai' provider limiter in rate_limiter.py
+(OPENAI_RPM_LIMIT / OPENAI_TPM_LIMIT, OPENAI_RETRIES with backoff and
+Retry-After, circuit breaker), so the SDK's own retries are off by default.
+
+LLM_BACKEND swaps the clients for recording, replaying or synthetic
+stand-ins (see llm_backend.py) for offline benchmarking.
 """
 
 import os
-from typing import Dict, Any, Optional
+import time
+import asyncio
+import threading
+import weakref
+from typing import Dict, Any, Optional, Iterator
 from dotenv import load_dotenv
 
+from shared.llm_backend import build_backend_client
+from shared.openai_cache import count_tokens
+from shared.rate_limiter import get_provider_limiter
+from shared.telemetry import record_llm_call, usage_tokens
+
 # Load environment variables
 load_dotenv()
 
+# Process-wide client registry
+_client_lock = threading.Lock()
+_sync_client = None
+# httpx async pools are bound to the event loop that opened them
+_async_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_unbound_async_client = None
+
+def openai_pool_settings() -> Dict[str, Any]:
+    """Connection pool limits and timeouts for the shared clients"""
+    return {
+        'max_connections': int(os.getenv('OPENAI_MAX_CONNECTIONS', '20')),
+        'max_keepalive_connections': int(os.getenv('OPENAI_MAX_KEEPALIVE_CONNECTIONS', '10')),
+        'keepalive_expiry': float(os.getenv('OPENAI_KEEPALIVE_EXPIRY', '30')),
+        'timeout': float(os.getenv('OPENAI_TIMEOUT', '60')),
+        'connect_timeout': float(os.getenv('OPENAI_CONNECT_TIMEOUT', '10')),
+        'max_retries': int(os.getenv('OPENAI_MAX_RETRIES', '0')),
+    }
+
+def _build_client(async_client: bool = False):
+    """Construct the client for the configured LLM backend"""
+    return build_backend_client(lambda: _build_openai_client(async_client), async_client)
+
+def _build_openai_client(async_client: bool = False):
+    """Construct an OpenAI client with a pooled keep-alive HTTP client"""
+    try:
+        import httpx
+        import openai
+    except ImportError:
+        raise ImportError("OpenAI library not installed. Install with: pip install openai")
+    
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY not found in environment variables")
+    
+    settings = openai_pool_settings()
+    limits = httpx.Limits(
+        max_connections=settings['max_connections'],
+        max_keepalive_connections=settings['max_keepalive_connections'],
+        keepalive_expiry=settings['keepalive_expiry']
+    )
+    timeout = httpx.Timeout(settings['timeout'], connect=settings['connect_timeout'])
+    
+    if async_client:
+        http_client = openai.DefaultAsyncHttpxClient(limits=limits, timeout=timeout)
+        return openai.AsyncOpenAI(api_key=api_key, http_client=http_client,
+                                  timeout=timeout, max_retries=settings['max_retries'])
+    
+    http_client = openai.DefaultHttpxClient(limits=limits, timeout=timeout)
+    return openai.OpenAI(api_key=api_key, http_client=http_client,
+                         timeout=timeout, max_retries=settings['max_retries'])
+
 def get_openai_client():
     """
-    Get configured OpenAI client
+    Get the shared, configured OpenAI client
     """
+    global _sync_client
+    
+    if _sync_client is not None:
+        return _sync_client
+    
     try:
-        from openai import OpenAI
-        
-        api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY not found in environment variables")
-        
-        client = OpenAI(api_key=api_key)
-        return client
+        with _client_lock:
+            if _sync_client is None:
+                _sync_client = _build_client()
+            return _sync_client
         
     except ImportError:
-        raise ImportError("OpenAI library not installed. Install with: pip install openai")
+        raise
     except Exception as e:
         raise Exception(f"Failed to initialize OpenAI client: {str(e)}")
 
+def get_async_openai_client():
+    """
+    Get the shared AsyncOpenAI client for the running event loop
+    
+    One client is kept per event loop, since pooled async connections
+    cannot be reused from a different loop.
+    """
+    global _unbound_async_client
+    
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    
+    try:
+        with _client_lock:
+            if loop is None:
+                if _unbound_async_client is None:
+                    _unbound_async_client = _build_client(async_client=True)
+                return _unbound_async_client
+            
+            client = _async_clients.get(loop)
+            if client is None:
+                client = _build_client(async_client=True)
+                _async_clients[loop] = client
+            return client
+        
+    except ImportError:
+        raise
+    except Exception as e:
+        raise Exception(f"Failed to initialize async OpenAI client: {str(e)}")
+
+def _close_async_client(client, loop: Optional[asyncio.AbstractEventLoop]):
+    """
+    Close an AsyncOpenAI client, on the event loop its connections belong to
+    
+    A client of a loop running in another thread is closed there (waiting up
+    to 5 seconds); one of the calling loop is closed by a task, since the
+    loop cannot block on itself; one whose loop has finished is closed on a
+    temporary loop. Clients whose loop was garbage-collected have already
+    left the registry with it.
+    """
+    closing = client.close()
+    if not asyncio.iscoroutine(closing):
+        return
+    
+    try:
+        current = asyncio.get_running_loop()
+    except RuntimeError:
+        current = None
+    
+    try:
+        if loop is not None and loop is not current and loop.is_running():
+            asyncio.run_coroutine_threadsafe(closing, loop).result(timeout=5)
+        elif current is not None:
+            current.create_task(closing)
+        elif loop is not None and not loop.is_closed():
+            loop.run_until_complete(closing)
+        else:
+            asyncio.run(closing)
+    except Exception as e:
+        print(f"⚠️ Failed to close async OpenAI client: {e}")
+
+def reset_openai_clients():
+    """Close and drop the shared clients (e.g. after changing the API key or pool settings)"""
+    global _sync_client, _unbound_async_client
+    
+    with _client_lock:
+        sync_client = _sync_client
+        async_clients = [(loop, client) for loop, client in _async_clients.items()]
+        if _unbound_async_client is not None:
+            async_clients.append((None, _unbound_async_client))
+        _sync_client = None
+        _unbound_async_client = None
+        _async_clients.clear()
+    
+    # Closed outside the lock: a loop closing its client may be asking for a new one
+    if sync_client is not None:
+        sync_client.close()
+    for loop, client in async_clients:
+        _close_async_client(client, loop)
+
 def generate_completion(
     messages: list,
     model: str = "gpt-4",
@@ -39,22 +201,29 @@ def generate_completion(
     max_tokens: Optional[int] = None
 ) -> str:
     """
-    Generate completion using OpenAI API
+    Generate completion using OpenAI API (shared pooled client)
     """
+    prompt = "\n".join(str(m.get('content', '')) for m in messages)
+    start = time.perf_counter()
     try:
         client = get_openai_client()
         
-        response = client.chat.completions.create(
+        response = get_provider_limiter('openai').call(lambda: client.chat.completions.create(
             model=model,
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens
-        )
+        ), tokens=count_tokens(prompt, model) + (max_tokens or 0))
         
-        return response.choices[0].message.content
+        content = response.choices[0].message.content
+        prompt_tokens, completion_tokens = usage_tokens(response, prompt, content, model)
+        record_llm_call('generate_completion', model, prompt_tokens, completion_tokens,
+                        time.perf_counter() - start)
+        return content
         
     except Exception as e:
         print(f"❌ OpenAI completion error: {str(e)}")
+        record_llm_call('generate_completion', model, 0, 0, time.perf_counter() - start, success=False)
         return ""
 
 def generate_text(
@@ -67,4 +236,57 @@ def generate_text(
     Simple text generation function
     """
     messages = [{"role": "user", "content": prompt}]
-    return generate_completion(messages, model, temperature, max_tokens)
\ No newline at end of file
+    return generate_completion(messages, model, temperature, max_tokens)
+
+def stream_completion(
+    messages: list,
+    model: str = "gpt-4",
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = None
+) -> Iterator[str]:
+    """
+    Stream a completion from the OpenAI API, yielding text deltas as they arrive
+    
+    Errors are raised to the caller, since a partial stream cannot be
+    replaced with an empty string.
+    """
+    client = get_openai_client()
+    prompt = "\n".join(str(m.get('content', '')) for m in messages)
+    start = time.perf_counter()
+    parts = []
+    
+    # Only opening the stream is retried; a stream that fails part-way raises
+    stream = get_provider_limiter('openai').call(lambda: client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        stream=True
+    ), tokens=count_tokens(prompt, model) + (max_tokens or 0))
+    
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
+    except Exception:
+        record_llm_call('stream_completion', model, 0, 0, time.perf_counter() - start, success=False)
+        raise
+    
+    prompt_tokens, completion_tokens = usage_tokens(None, prompt, ''.join(parts), model)
+    record_llm_call('stream_completion', model, prompt_tokens, completion_tokens, time.perf_counter() - start)
+
+def stream_text(
+    prompt: str,
+    model: str = "gpt-4",
+    temperature: float = 0.7,
+    max_tokens: Optional[int] = None
+) -> Iterator[str]:
+    """
+    Simple streaming text generation function
+    """
+    messages = [{"role": "user", "content": prompt}]
+    return stream_completion(messages, model, temperature, max_tokens)
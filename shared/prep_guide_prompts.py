@@ -4,9 +4,35 @@ Prep Guide Prompt Templates - Professional Interview Preparation
 ===============================================================
 Enhanced prompt templates for generating comprehensive, actionable interview prep guides
 with proper citation integration and strategic content structure.
+
+Prompt size is budgeted: the email body and the research context are each packed
+into a token budget (PREP_GUIDE_EMAIL_TOKENS, PREP_GUIDE_CONTEXT_TOKENS). Citations
+are ranked by CitationManager quality score and the best ones fill each context
+section up to its cap, as source lines; what did not fit is listed in the context
+report returned by build_prep_guide_prompt(). PREP_GUIDE_CONTEXT_SNIPPETS=true adds
+citation snippets within the same budget.
 """
 
-from typing import Dict, List, Any, Union
+import os
+from typing import Dict, List, Any, Optional, Union, Tuple
+
+from shared.citation_manager import CitationManager
+from shared.openai_cache import count_tokens, truncate_to_tokens
+
+PROMPT_MODEL = "gpt-4o"
+
+
+def prompt_token_budgets() -> Dict[str, int]:
+    """Token budgets for the email body and research context of the prep guide prompt"""
+    return {
+        'email_tokens': int(os.getenv('PREP_GUIDE_EMAIL_TOKENS', '2000')),
+        'context_tokens': int(os.getenv('PREP_GUIDE_CONTEXT_TOKENS', '400')),
+    }
+
+
+def research_snippets_enabled() -> bool:
+    """Whether the research context adds citation snippets (PREP_GUIDE_CONTEXT_SNIPPETS)"""
+    return os.getenv('PREP_GUIDE_CONTEXT_SNIPPETS', 'false').lower() == 'true'
 
 
 def get_entity_value(entities: Dict[str, Any], key: str, fallback_key: str = None) -> str:
@@ -72,10 +98,31 @@ def build_research_context(research_data: Dict[str, Any]) -> str:
 def get_complete_prep_guide_prompt(email: Dict[str, Any], entities: Dict[str, Any], 
                                   research_data: Dict[str, Any]) -> str:
     """Generate highly specific prompt for AI to extract exact details from email and research"""
+    prompt, _ = build_prep_guide_prompt(email, entities, research_data)
+    return prompt
+
+
+def build_prep_guide_prompt(email: Dict[str, Any], entities: Dict[str, Any],
+                            research_data: Dict[str, Any],
+                            email_tokens: int = None, context_tokens: int = None,
+                            model: str = PROMPT_MODEL) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build the prep guide prompt within the email and research context token budgets
+    
+    Returns:
+        (prompt, context report with token usage and the citations that were dropped)
+    """
+    budgets = prompt_token_budgets()
+    email_tokens = budgets['email_tokens'] if email_tokens is None else email_tokens
+    context_tokens = budgets['context_tokens'] if context_tokens is None else context_tokens
     
     # Extract email details
-    email_body = email.get('body', '')
+    full_email_body = email.get('body', '')
     email_subject = email.get('subject', '')
+    email_body = truncate_to_tokens(full_email_body, email_tokens, model)
+    email_truncated = email_body != full_email_body
+    if email_truncated:
+        email_body += "\n[... email truncated ...]"
     
     # Extract entities
     company = get_entity_value(entities, 'company', 'COMPANY')
@@ -86,7 +133,11 @@ def get_complete_prep_guide_prompt(email: Dict[str, Any], entities: Dict[str, An
     format_info = get_entity_value(entities, 'format', 'format TBD')
     
     # Extract specific research findings
-    research_context = build_detailed_research_context(email_body, citations_db=research_data.get('citations_database', {}))
+    research_context, report = build_budgeted_research_context(
+        full_email_body, research_data.get('citations_database', {}), context_tokens, model
+    )
+    report['email_tokens'] = count_tokens(email_body, model)
+    report['email_truncated'] = email_truncated
     
     prompt = f"""You are an expert interview preparation consultant. You must extract EXACT details from the email content and research data to create a highly personalized prep guide.
 
@@ -176,60 +227,95 @@ If you cannot find specific information, explicitly state what to look for rathe
 
 Generate the complete personalized prep guide now:"""
 
-    return prompt
+    return prompt, report
+
+
+# Context sections in prompt order: (key, heading, line label, max citations)
+RESEARCH_CONTEXT_SECTIONS = [
+    ('interviewer_linkedin', "INTERVIEWER LINKEDIN PROFILES FOUND:", "👤 Interviewer LinkedIn", 3),
+    ('company_linkedin', "COMPANY LINKEDIN PAGES FOUND:", "🏢 Company LinkedIn", 2),
+    ('company_info', "COMPANY INFORMATION SOURCES:", "📊 Company Research", 3),
+]
+
+
+def _citation_section(source: str, agent: str) -> Optional[str]:
+    """Context section of a citation, or None if the context does not show it"""
+    if 'linkedin.com/in/' in source:
+        return 'interviewer_linkedin'
+    if 'linkedin.com/company/' in source:
+        return 'company_linkedin'
+    if 'company_analysis' in agent:
+        return 'company_info'
+    return None
 
 
-def build_detailed_research_context(email_body: str, citations_db: Dict[str, Any]) -> str:
+def rank_citations(citations_db: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Citations ordered by CitationManager quality score (highest first, ties keep research order)"""
+    manager = CitationManager()
+    ranked = []
+    for citation_id, citation_data in citations_db.items():
+        if not isinstance(citation_data, dict) or not citation_data.get('source'):
+            continue
+        source = citation_data['source']
+        title, url = manager._parse_source_text(source)
+        ranked.append({
+            'id': citation_id,
+            'source': source,
+            'snippet': citation_data.get('content_snippet', ''),
+            'section': _citation_section(source, citation_data.get('agent', '')),
+            'quality_score': manager._calculate_citation_quality(title, url, citation_data)
+        })
+    ranked.sort(key=lambda c: c['quality_score'], reverse=True)
+    return ranked
+
+
+def build_detailed_research_context(email_body: str, citations_db: Dict[str, Any],
+                                    token_budget: int = None) -> str:
     """Build detailed context showing AI exactly what research data is available"""
+    if token_budget is None:
+        token_budget = prompt_token_budgets()['context_tokens']
+    context, _ = build_budgeted_research_context(email_body, citations_db, token_budget)
+    return context
+
+
+def build_budgeted_research_context(email_body: str, citations_db: Dict[str, Any], token_budget: int,
+                                    model: str = PROMPT_MODEL,
+                                    include_snippets: bool = None) -> Tuple[str, Dict[str, Any]]:
+    """
+    Pack the highest-quality citations into a token budget
+    
+    Each section shows at most its cap of citations, as source lines only.
+    Citations outside the sections or over a cap are counted in
+    'section_limited'; a source line that does not fit the budget is dropped.
+    With include_snippets (default PREP_GUIDE_CONTEXT_SNIPPETS) the budget left
+    over is spent on snippets of the kept citations, best first, so snippets
+    never displace a source line.
+    
+    Returns:
+        (context text, report of budget use and dropped citations)
+    """
+    if include_snippets is None:
+        include_snippets = research_snippets_enabled()
+    
+    report = {
+        'budget_tokens': token_budget,
+        'used_tokens': 0,
+        'citations_total': 0,
+        'citations_included': 0,
+        'section_limited': 0,
+        'snippets_trimmed': [],
+        'dropped': []
+    }
     
     if not citations_db:
-        return "No research data available."
-    
-    context_parts = [
-        "AVAILABLE RESEARCH DATA FOR EXTRACTION:",
-        ""
-    ]
+        context = "No research data available."
+        report['used_tokens'] = count_tokens(context, model)
+        return context, report
     
-    # Extract and organize research by type
-    interviewer_linkedin = []
-    company_linkedin = []
-    company_info = []
-    
-    for citation_id, citation_data in citations_db.items():
-        if isinstance(citation_data, dict):
-            source = citation_data.get('source', '')
-            agent = citation_data.get('agent', '')
-            
-            # Find interviewer LinkedIn profiles
-            if 'linkedin.com/in/' in source:
-                interviewer_linkedin.append(f"   👤 Interviewer LinkedIn: {source}")
-            
-            # Find company LinkedIn
-            elif 'linkedin.com/company/' in source:
-                company_linkedin.append(f"   🏢 Company LinkedIn: {source}")
-            
-            # Find company information
-            elif 'company_analysis' in agent:
-                company_info.append(f"   📊 Company Research: {source}")
-    
-    # Show what's available for extraction
-    if interviewer_linkedin:
-        context_parts.append("INTERVIEWER LINKEDIN PROFILES FOUND:")
-        context_parts.extend(interviewer_linkedin[:3])
-        context_parts.append("")
-    
-    if company_linkedin:
-        context_parts.append("COMPANY LINKEDIN PAGES FOUND:")
-        context_parts.extend(company_linkedin[:2])
-        context_parts.append("")
-    
-    if company_info:
-        context_parts.append("COMPANY INFORMATION SOURCES:")
-        context_parts.extend(company_info[:3])
-        context_parts.append("")
+    header = ["AVAILABLE RESEARCH DATA FOR EXTRACTION:", ""]
     
     # Add extraction instructions
-    context_parts.extend([
+    instructions = [
         "EXTRACTION INSTRUCTIONS:",
         "1. Look for the real interviewer name in the email body (it says 'I'm [Name]')",
         "2. Use the linkedin.com/in/ URL for the interviewer LinkedIn link",
@@ -237,9 +323,66 @@ def build_detailed_research_context(email_body: str, citations_db: Dict[str, Any
         "4. Extract company specialization and focus from research sources",
         f"5. Email mentions these topics: {extract_topics_from_email(email_body)}",
         ""
-    ])
+    ]
     
-    return '\n'.join(context_parts)
+    ranked = rank_citations(citations_db)
+    report['citations_total'] = len(ranked)
+    
+    used = count_tokens('\n'.join(header + instructions), model)
+    
+    labels = {key: label for key, _, label, _ in RESEARCH_CONTEXT_SECTIONS}
+    caps = {key: cap for key, _, _, cap in RESEARCH_CONTEXT_SECTIONS}
+    headings = {key: count_tokens(heading, model) + 2 for key, heading, _, _ in RESEARCH_CONTEXT_SECTIONS}
+    sections: Dict[str, List[Dict[str, Any]]] = {key: [] for key, _, _, _ in RESEARCH_CONTEXT_SECTIONS}
+    for citation in ranked:
+        section = citation['section']
+        if section is None or len(sections[section]) >= caps[section]:
+            report['section_limited'] += 1
+            continue
+        
+        line = f"   {labels[section]}: {citation['source']}"
+        # The first entry of a section also pays for its heading
+        overhead = 1 if sections[section] else headings[section]
+        tokens = count_tokens(line, model) + overhead
+        if used + tokens > token_budget:
+            report['dropped'].append({
+                'id': citation['id'],
+                'source': citation['source'],
+                'quality_score': citation['quality_score'],
+                'tokens': tokens
+            })
+            continue
+        
+        sections[section].append({'citation': citation, 'entry': line})
+        used += tokens
+    
+    # Snippets only use the budget the source lines left over
+    if include_snippets:
+        kept = sorted((item for items in sections.values() for item in items),
+                      key=lambda item: item['citation']['quality_score'], reverse=True)
+        for item in kept:
+            snippet = item['citation']['snippet']
+            if not snippet or snippet == "No content":
+                continue
+            tokens = count_tokens(f"\n      {snippet}", model)
+            if used + tokens > token_budget:
+                report['snippets_trimmed'].append(item['citation']['id'])
+                continue
+            item['entry'] += f"\n      {snippet}"
+            used += tokens
+    
+    context_parts = list(header)
+    for key, heading, _, _ in RESEARCH_CONTEXT_SECTIONS:
+        if sections[key]:
+            context_parts.append(heading)
+            context_parts.extend(item['entry'] for item in sections[key])
+            context_parts.append("")
+    context_parts.extend(instructions)
+    
+    context = '\n'.join(context_parts)
+    report['citations_included'] = sum(len(items) for items in sections.values())
+    report['used_tokens'] = count_tokens(context, model)
+    return context, report
 
 
 def extract_topics_from_email(email_body: str) -> str:
@@ -861,4 +1004,4 @@ def generate_common_questions(role: str, company_details: str, citation_links: L
 
 
 # Export the main function for easy importing
-__all__ = ['get_complete_prep_guide_prompt', 'get_entity_value', 'build_research_context']
\ No newline at end of file
+__all__ = ['get_complete_prep_guide_prompt', 'build_prep_guide_prompt', 'get_entity_value', 'build_research_context']
\ No newline at end of file
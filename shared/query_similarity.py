@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Query Index for the Tavily Cache
+===============================================
+
+The research pipelines issue many queries that differ only in quoting, case,
+filler words or word order, e.g.:
+
+    '"Acme" official website about'
+    'Acme company website about'
+
+Each of these is a separate exact-match key in SimpleCache. This module
+normalizes queries and finds previously cached queries that are close enough
+to reuse:
+
+1. Normalization: lowercase, strip quotes/punctuation, drop stopwords,
+   sort tokens. Identical normalized forms are always a match.
+2. Fuzzy match: MinHash signatures bucketed with LSH find candidates, which
+   are then verified with exact Jaccard similarity over the token sets.
+
+To avoid serving one company's results for another, a fuzzy match may only
+add or drop tokens (never substitute one), and quoted phrases and site:
+operators must be identical.
+"""
+
+import re
+import json
+import random
+import sqlite3
+import hashlib
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, FrozenSet
+
+# Generic English stopwords plus filler terms common in search queries
+QUERY_STOPWORDS = frozenset({
+    'a', 'an', 'the', 'of', 'for', 'and', 'or', 'in', 'on', 'at', 'to', 'with',
+    'by', 'from', 'is', 'are', 'its', 'about', 'official', 'company', 'page',
+    'information', 'info', 'details'
+})
+
+NUM_PERMUTATIONS = 32
+LSH_BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // LSH_BANDS
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1337)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+
+def _stable_hash(token: str) -> int:
+    """Process-independent token hash (Python's hash() is salted per run)"""
+    return int(hashlib.md5(token.encode('utf-8')).hexdigest()[:15], 16)
+
+
+def query_anchors(query: str) -> FrozenSet[str]:
+    """Quoted phrases and search operators that must match exactly"""
+    anchors = {phrase.strip().lower() for phrase in re.findall(r'"([^"]+)"', query)}
+    anchors.update(token.lower() for token in query.split() if re.match(r'^[a-z]+:\S+', token, re.I))
+    return frozenset(anchors)
+
+
+def query_tokens(query: str) -> FrozenSet[str]:
+    """Normalized token set of a query"""
+    tokens = set()
+    for raw in query.lower().split():
+        if re.match(r'^[a-z]+:\S+', raw):
+            tokens.add(raw)  # keep operators such as site:linkedin.com/in intact
+            continue
+        for token in re.findall(r"[a-z0-9][a-z0-9+#.&'-]*", raw):
+            token = token.strip(".'-")
+            if token and token not in QUERY_STOPWORDS:
+                tokens.add(token)
+    return frozenset(tokens)
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form: sorted, stopword-free tokens"""
+    return ' '.join(sorted(query_tokens(query)))
+
+
+def minhash_signature(tokens: FrozenSet[str]) -> List[int]:
+    """MinHash signature of a token set"""
+    hashes = [_stable_hash(token) for token in tokens] or [0]
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def lsh_bands(signature: List[int]) -> List[str]:
+    """Band keys used to bucket similar signatures"""
+    return [
+        f"{band}:" + ','.join(str(v) for v in signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND])
+        for band in range(LSH_BANDS)
+    ]
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class QuerySimilarityIndex:
+    """Persistent index of cached queries for near-duplicate lookup"""
+
+    def __init__(self, db_path: str, threshold: float = 0.8, max_token_difference: int = 1):
+        self.threshold = threshold
+        self.max_token_difference = max_token_difference
+        self.stats = {'lookups': 0, 'normalized_hits': 0, 'fuzzy_hits': 0}
+        self._lock = threading.Lock()
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS queries (
+                query TEXT NOT NULL,
+                max_results INTEGER NOT NULL,
+                normalized TEXT NOT NULL,
+                tokens TEXT NOT NULL,
+                anchors TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (query, max_results)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_queries_normalized ON queries(normalized)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS query_bands (
+                band TEXT NOT NULL,
+                query TEXT NOT NULL,
+                max_results INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_query_bands ON query_bands(band)")
+        self._conn.commit()
+
+    def add(self, query: str, max_results: int):
+        """Register a query whose results are now cached"""
+        tokens = query_tokens(query)
+        bands = lsh_bands(minhash_signature(tokens))
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO queries (query, max_results, normalized, tokens, anchors, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (query, max_results, ' '.join(sorted(tokens)), json.dumps(sorted(tokens)),
+                 json.dumps(sorted(query_anchors(query))), time.time())
+            )
+            self._conn.execute("DELETE FROM query_bands WHERE query = ? AND max_results = ?", (query, max_results))
+            self._conn.executemany(
+                "INSERT INTO query_bands (band, query, max_results) VALUES (?, ?, ?)",
+                [(band, query, max_results) for band in bands]
+            )
+            self._conn.commit()
+
+    def remove(self, query: str, max_results: int):
+        """Forget a query (e.g. its cache entry has been evicted)"""
+        with self._lock:
+            self._conn.execute("DELETE FROM queries WHERE query = ? AND max_results = ?", (query, max_results))
+            self._conn.execute("DELETE FROM query_bands WHERE query = ? AND max_results = ?", (query, max_results))
+            self._conn.commit()
+
+    def find_similar(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """
+        Cached queries that can stand in for `query`, best match first
+
+        Only queries cached with at least `max_results` results qualify.
+        Each match is a dict with query, max_results and similarity.
+        """
+        tokens = query_tokens(query)
+        anchors = query_anchors(query)
+        normalized = ' '.join(sorted(tokens))
+        bands = lsh_bands(minhash_signature(tokens))
+
+        with self._lock:
+            self.stats['lookups'] += 1
+            rows = self._conn.execute(
+                "SELECT query, max_results, tokens, anchors FROM queries "
+                "WHERE normalized = ? AND max_results >= ? AND query != ?",
+                (normalized, max_results, query)
+            ).fetchall()
+            placeholders = ','.join('?' * len(bands))
+            rows += self._conn.execute(
+                "SELECT DISTINCT q.query, q.max_results, q.tokens, q.anchors FROM query_bands b "
+                "JOIN queries q ON q.query = b.query AND q.max_results = b.max_results "
+                f"WHERE b.band IN ({placeholders}) AND q.max_results >= ? AND q.query != ?",
+                (*bands, max_results, query)
+            ).fetchall()
+
+        matches = {}
+        for candidate, candidate_max, candidate_tokens, candidate_anchors in rows:
+            candidate_tokens = frozenset(json.loads(candidate_tokens))
+            if frozenset(json.loads(candidate_anchors)) != anchors and candidate_tokens != tokens:
+                continue
+            similarity = jaccard(tokens, candidate_tokens)
+            if candidate_tokens != tokens:
+                if similarity < self.threshold:
+                    continue
+                # Additions/removals only: a substituted token could be a different entity
+                if min(len(tokens - candidate_tokens), len(candidate_tokens - tokens)) > 0:
+                    continue
+                if len(tokens ^ candidate_tokens) > self.max_token_difference:
+                    continue
+            matches[(candidate, candidate_max)] = {
+                'query': candidate,
+                'max_results': candidate_max,
+                'similarity': similarity
+            }
+
+        return sorted(matches.values(), key=lambda m: (-m['similarity'], m['max_results']))
+
+    def record_hit(self, similarity: float):
+        with self._lock:
+            if similarity >= 1.0:
+                self.stats['normalized_hits'] += 1
+            else:
+                self.stats['fuzzy_hits'] += 1
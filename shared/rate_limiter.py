@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter - Token buckets, retries and circuit breakers for external APIs
+============================================================================
+
+TokenBucket enforces OpenAI-style per-minute budgets:
+- requests per minute (RPM)
+- tokens per minute (TPM)
+
+Each bucket starts full and refills continuously. A 429 response pauses
+the whole bucket so every concurrent caller backs off together. Buckets are
+thread-safe and can be acquired from sync (acquire) and async (acquire_async)
+code; AsyncTokenBucket is the asyncio-only spelling used by call_llm_many.
+
+ProviderLimiter wraps every Tavily and OpenAI request with:
+- the provider's shared token bucket
+- retries with exponential backoff and jitter, honouring Retry-After
+- a circuit breaker that fails fast after repeated outages
+
+get_provider_limiter('openai' | 'tavily') returns the process-wide limiter.
+Settings are read from the environment, prefixed OPENAI_ or TAVILY_:
+
+    {P}_RPM_LIMIT              requests per minute (default unlimited)
+    {P}_TPM_LIMIT              tokens per minute (default unlimited)
+    {P}_RETRIES                retries after a transient error (default 3)
+    {P}_BACKOFF_BASE           first backoff in seconds (default 1)
+    {P}_BACKOFF_MAX            longest backoff in seconds (default 60)
+    {P}_BREAKER_THRESHOLD      consecutive failures that open the circuit (default 5)
+    {P}_BREAKER_RESET_SECONDS  seconds before a trial request is let through (default 30)
+"""
+
+import os
+import time
+import random
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+# HTTP statuses worth retrying; anything else (400, 401, 404, ...) fails at once
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+# 429s raised without a status code (tavily-python raises UsageLimitExceededError)
+RATE_LIMIT_ERROR_NAMES = {'RateLimitError', 'UsageLimitExceededError'}
+RETRYABLE_ERROR_NAMES = RATE_LIMIT_ERROR_NAMES | {
+    'APIConnectionError', 'APITimeoutError', 'InternalServerError',
+    'Timeout', 'ReadTimeout', 'ConnectTimeout', 'ConnectionError', 'TimeoutError'
+}
+
+
+class CircuitOpenError(RuntimeError):
+    """A provider's circuit breaker is open; the request was not sent"""
+
+
+class TokenBucket:
+    """Requests-per-minute and tokens-per-minute limiter for threads and asyncio"""
+
+    def __init__(self, tokens_per_minute: Optional[int] = None, requests_per_minute: Optional[int] = None):
+        self.tokens_per_minute = tokens_per_minute or None
+        self.requests_per_minute = requests_per_minute or None
+        self._tokens = float(self.tokens_per_minute or 0)
+        self._requests = float(self.requests_per_minute or 0)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.stats = {'acquired': 0, 'throttled': 0, 'wait_seconds': 0.0}
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._updated = now
+        if self.tokens_per_minute:
+            self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+        if self.requests_per_minute:
+            self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+
+    def _wait_time(self, tokens: float, now: float) -> float:
+        """Seconds until a request of `tokens` fits the budget (0 if it fits now)"""
+        wait = max(0.0, self._paused_until - now)
+        if self.tokens_per_minute and self._tokens < tokens:
+            wait = max(wait, (tokens - self._tokens) * 60 / self.tokens_per_minute)
+        if self.requests_per_minute and self._requests < 1:
+            wait = max(wait, (1 - self._requests) * 60 / self.requests_per_minute)
+        return wait
+
+    def _try_acquire(self, tokens: float) -> float:
+        """Spend the budget for one request if it fits; otherwise return the seconds to wait"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = self._wait_time(tokens, now)
+            if wait <= 0:
+                if self.tokens_per_minute:
+                    self._tokens -= tokens
+                if self.requests_per_minute:
+                    self._requests -= 1
+                self.stats['acquired'] += 1
+            return wait
+
+    def _clamp(self, tokens: int) -> int:
+        # A single request larger than the whole budget still has to run eventually
+        return min(tokens, self.tokens_per_minute) if self.tokens_per_minute else tokens
+
+    def _record_wait(self, waited: float):
+        if waited > 0:
+            with self._lock:
+                self.stats['throttled'] += 1
+                self.stats['wait_seconds'] += waited
+
+    def acquire_sync(self, tokens: int = 0) -> float:
+        """Block until one request using `tokens` tokens fits the budgets; returns seconds waited"""
+        tokens = self._clamp(tokens)
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                self._record_wait(waited)
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self, tokens: int = 0) -> float:
+        """Wait (without blocking the event loop) until one request fits; returns seconds waited"""
+        tokens = self._clamp(tokens)
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                self._record_wait(waited)
+                return waited
+            await asyncio.sleep(wait)
+            waited += wait
+
+    acquire = acquire_sync
+
+    def pause(self, seconds: float):
+        """Hold every caller for `seconds` (e.g. after a 429)"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class AsyncTokenBucket(TokenBucket):
+    """TokenBucket whose acquire() is a coroutine, for asyncio callers"""
+
+    async def acquire(self, tokens: int = 0) -> float:
+        return await self.acquire_async(tokens)
+
+
+class RetryPolicy:
+    """Exponential backoff with jitter; a server's Retry-After always wins"""
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """Seconds to wait before retry number `attempt + 1`"""
+        retry_after = retry_after_seconds(error) if error is not None else None
+        if retry_after is not None:
+            return retry_after
+        return min(self.max_delay, self.base_delay * 2 ** attempt) * (0.5 + random.random() / 2)
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures; after
+    `reset_timeout` seconds one trial request is let through (half-open) and
+    its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self.stats = {'opened': 0, 'rejected': 0}
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a request may be sent now"""
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            if self.state == 'open' and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = 'half_open'
+            if self.state == 'half_open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            if self.state != 'closed':
+                self.stats['rejected'] += 1
+                raise CircuitOpenError(f"{self.name} circuit open after {self._failures} consecutive failures")
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            self.state = 'closed'
+
+    def record_rate_limited(self):
+        """
+        A 429 proves the provider is up but is not a success for the failure streak:
+        a half-open trial closes the circuit, a closed circuit keeps its count.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+            if self.state == 'half_open':
+                self._failures = 0
+                self.state = 'closed'
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == 'half_open' or (self.state == 'closed' and self._failures >= self.failure_threshold > 0):
+                if self.state == 'closed':
+                    self.stats['opened'] += 1
+                    print(f"🔌 {self.name} circuit opened after {self._failures} consecutive failures")
+                self.state = 'open'
+                self._opened_at = time.monotonic()
+
+
+def status_code(error: Exception) -> Optional[int]:
+    """HTTP status of an API error (OpenAI, httpx or requests style), if any"""
+    code = getattr(error, 'status_code', None)
+    if code is None:
+        code = getattr(getattr(error, 'response', None), 'status_code', None)
+    return code if isinstance(code, int) else None
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Whether an API error is a 429 rate-limit response"""
+    return status_code(error) == 429 or type(error).__name__ in RATE_LIMIT_ERROR_NAMES
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Rate limits, timeouts, dropped connections and 5xx responses are worth retrying"""
+    code = status_code(error)
+    if code is not None:
+        return code in RETRYABLE_STATUS_CODES
+    return type(error).__name__ in RETRYABLE_ERROR_NAMES or isinstance(error, (ConnectionError, TimeoutError))
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Delay requested by the server's Retry-After header, if any"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        retry_after_ms = headers.get('retry-after-ms')
+        if retry_after_ms is not None:
+            return float(retry_after_ms) / 1000
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def provider_limit_settings(provider: str) -> Dict[str, Any]:
+    """Rate, retry and breaker settings for a provider from {PROVIDER}_* variables"""
+    prefix = provider.upper()
+    return {
+        'requests_per_minute': int(os.getenv(f'{prefix}_RPM_LIMIT', '0')),
+        'tokens_per_minute': int(os.getenv(f'{prefix}_TPM_LIMIT', '0')),
+        'max_retries': int(os.getenv(f'{prefix}_RETRIES', '3')),
+        'backoff_base': float(os.getenv(f'{prefix}_BACKOFF_BASE', '1')),
+        'backoff_max': float(os.getenv(f'{prefix}_BACKOFF_MAX', '60')),
+        'breaker_threshold': int(os.getenv(f'{prefix}_BREAKER_THRESHOLD', '5')),
+        'breaker_reset_seconds': float(os.getenv(f'{prefix}_BREAKER_RESET_SECONDS', '30')),
+    }
+
+
+class ProviderLimiter:
+    """Token bucket, retry policy and circuit breaker for one API provider"""
+
+    def __init__(self, name: str, bucket: Optional[TokenBucket] = None, retry: Optional[RetryPolicy] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.name = name
+        self.bucket = bucket or TokenBucket()
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker(name)
+        self._lock = threading.Lock()
+        self.stats = {'calls': 0, 'retries': 0, 'rate_limited': 0, 'failures': 0}
+
+    @classmethod
+    def from_env(cls, provider: str) -> 'ProviderLimiter':
+        settings = provider_limit_settings(provider)
+        return cls(
+            provider,
+            TokenBucket(settings['tokens_per_minute'], settings['requests_per_minute']),
+            RetryPolicy(settings['max_retries'], settings['backoff_base'], settings['backoff_max']),
+            CircuitBreaker(provider, settings['breaker_threshold'], settings['breaker_reset_seconds'])
+        )
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _on_error(self, error: Exception, attempt: int, max_retries: int) -> Optional[float]:
+        """Record a failed attempt; return the backoff before retrying, or None to give up"""
+        if is_rate_limit_error(error):
+            self._count('rate_limited')
+            self.breaker.record_rate_limited()
+        elif is_retryable_error(error):
+            self.breaker.record_failure()
+        else:
+            # The provider answered; a bad request says nothing about its health
+            self.breaker.record_success()
+
+        if not is_retryable_error(error) or attempt >= max_retries:
+            self._count('failures')
+            return None
+
+        delay = self.retry.delay(attempt, error)
+        if is_rate_limit_error(error):
+            self.bucket.pause(delay)
+        self._count('retries')
+        print(f"⏳ {self.name} {type(error).__name__}, retrying in {delay:.1f}s (attempt {attempt + 1}/{max_retries})")
+        return delay
+
+    def call(self, fn: Callable[[], Any], tokens: int = 0, max_retries: Optional[int] = None) -> Any:
+        """
+        Run fn() under the provider's budget, retrying transient errors
+
+        Raises:
+            CircuitOpenError: The circuit is open
+            Exception: fn's last error once retries are exhausted (or a non-retryable error)
+        """
+        max_retries = self.retry.max_retries if max_retries is None else max_retries
+        self._count('calls')
+        for attempt in range(max_retries + 1):
+            self.breaker.before_call()
+            self.bucket.acquire_sync(tokens)
+            try:
+                result = fn()
+            except Exception as e:
+                delay = self._on_error(e, attempt, max_retries)
+                if delay is None:
+                    raise
+                time.sleep(0 if is_rate_limit_error(e) else delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    async def acall(self, fn: Callable[[], Awaitable[Any]], tokens: int = 0,
+                    max_retries: Optional[int] = None) -> Any:
+        """Async call(): fn returns a fresh awaitable per attempt"""
+        max_retries = self.retry.max_retries if max_retries is None else max_retries
+        self._count('calls')
+        for attempt in range(max_retries + 1):
+            self.breaker.before_call()
+            await self.bucket.acquire_async(tokens)
+            try:
+                result = await fn()
+            except Exception as e:
+                delay = self._on_error(e, attempt, max_retries)
+                if delay is None:
+                    raise
+                await asyncio.sleep(0 if is_rate_limit_error(e) else delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        stats.update({
+            'throttled': self.bucket.stats['throttled'],
+            'wait_seconds': round(self.bucket.stats['wait_seconds'], 2),
+            'circuit_state': self.breaker.state,
+            'circuit_opened': self.breaker.stats['opened'],
+            'circuit_rejected': self.breaker.stats['rejected'],
+        })
+        return stats
+
+
+_limiters: Dict[str, ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_provider_limiter(provider: str) -> ProviderLimiter:
+    """The process-wide limiter for 'openai' or 'tavily'"""
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            limiter = _limiters[provider] = ProviderLimiter.from_env(provider)
+        return limiter
+
+
+def reset_provider_limiters():
+    """Drop every provider limiter (e.g. after changing the limit settings)"""
+    with _limiters_lock:
+        _limiters.clear()
+
+
+def get_rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-provider call, retry, throttling and circuit breaker counters"""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {name: limiter.get_stats() for name, limiter in limiters.items()}
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Research Artifact Store - Persisted per-entity research results
+===============================================================
+
+The Tavily cache saves the searches of a Deep Research run, but every run
+still re-validates the sources, re-scores them and rebuilds the citations.
+This store keeps the finished analysis of each research dimension:
+
+    kind        'company', 'role' or 'interviewer'
+    entity_key  normalized target: company, role|company, interviewer|company
+    version     ARTIFACT_VERSION the analysis was produced with
+    analysis    the agent's result (validated sources, confidence, citations;
+                for company and role the scored sources instead, see below)
+
+so a later email about the same company reuses the company analysis while
+still researching a new role or interviewer. Artifacts older than the TTL
+(RESEARCH_ARTIFACT_TTL_HOURS, default 24) or written by another
+ARTIFACT_VERSION are treated as missing.
+
+Company and role validation add up to +3 / +2 relevance per source for the
+email's keywords. Their artifacts keep the keyword-independent part, the
+scored sources before that bonus, and the pipeline re-applies the bonus for
+the current email's keywords on load, so other emails about the same company
+(or role) share them. Interviewer validation ignores the keywords.
+
+Stored in research_artifacts.db under CACHE_DIR (RESEARCH_ARTIFACTS_PATH); disable with
+RESEARCH_ARTIFACTS_ENABLED=false.
+"""
+
+import os
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from shared.simple_cache import cache_path
+
+# Bump when agent queries, validation or scoring change so older artifacts are not reused
+ARTIFACT_VERSION = 3
+
+ARTIFACT_KINDS = ('company', 'role', 'interviewer')
+
+
+def artifact_key(kind: str, company: str, role: str = '', interviewer: str = '') -> str:
+    """Normalized entity key of one research dimension"""
+    parts = {
+        'company': (company,),
+        'role': (role, company),
+        'interviewer': (interviewer, company),
+    }[kind]
+    return '|'.join(' '.join(part.lower().split()) for part in parts)
+
+
+class ResearchArtifactStore:
+    """SQLite store for per-entity research analyses"""
+
+    def __init__(self, db_path: Optional[str] = None, ttl_hours: Optional[float] = None):
+        self.db_path = Path(db_path or cache_path("research_artifacts.db"))
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        if ttl_hours is None:
+            ttl_hours = float(os.getenv('RESEARCH_ARTIFACT_TTL_HOURS', '24'))
+        self.ttl_seconds = ttl_hours * 3600
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'writes': 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS artifacts (
+                kind TEXT NOT NULL,
+                entity_key TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                analysis TEXT NOT NULL,
+                PRIMARY KEY (kind, entity_key)
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, kind: str, key: str) -> Optional[Dict[str, Any]]:
+        """The stored analysis for an entity, or None if missing, expired or from another version"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, created_at, analysis FROM artifacts WHERE kind = ? AND entity_key = ?",
+                (kind, key)
+            ).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+            version, created_at, analysis = row
+            if version != ARTIFACT_VERSION or time.time() - created_at > self.ttl_seconds:
+                self.stats['stale'] += 1
+                return None
+            self.stats['hits'] += 1
+        return json.loads(analysis)
+
+    def put(self, kind: str, key: str, analysis: Dict[str, Any]):
+        """Store (or replace) the analysis for an entity"""
+        payload = json.dumps(analysis, default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO artifacts (kind, entity_key, version, created_at, analysis) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (kind, key, ARTIFACT_VERSION, time.time(), payload)
+            )
+            self._conn.commit()
+            self.stats['writes'] += 1
+
+    def clear(self) -> int:
+        """Remove every artifact; returns the number removed"""
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM artifacts").rowcount
+            self._conn.commit()
+        return removed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-kind artifact counts (fresh / total) and this process's lookup counters"""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, COUNT(*), SUM(version = ? AND created_at >= ?) FROM artifacts GROUP BY kind",
+                (ARTIFACT_VERSION, cutoff)
+            ).fetchall()
+        return {
+            'artifacts': {kind: {'total': total, 'fresh': fresh or 0} for kind, total, fresh in rows},
+            'ttl_hours': self.ttl_seconds / 3600,
+            'version': ARTIFACT_VERSION,
+            **self.stats
+        }
+
+
+_store: Optional[ResearchArtifactStore] = None
+_store_lock = threading.Lock()
+
+
+def artifacts_enabled() -> bool:
+    return os.getenv('RESEARCH_ARTIFACTS_ENABLED', 'true').lower() != 'false'
+
+
+def get_artifact_store() -> ResearchArtifactStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ResearchArtifactStore(os.getenv('RESEARCH_ARTIFACTS_PATH'))
+        return _store
+
+
+def reset_artifact_store():
+    """Drop the process-wide store (tests, or after changing RESEARCH_ARTIFACTS_PATH)"""
+    global _store
+    with _store_lock:
+        _store = None
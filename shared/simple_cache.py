@@ -5,22 +5,442 @@ Simple Cache System for Interview Prep Workflow
 
 Provides caching for both Tavily API calls and OpenAI API calls
 to avoid repeated API requests for the same content.
+
+Two interchangeable backends are available:
+- SimpleCache: one JSON file per key (default)
+- SQLiteCache: a single WAL-mode SQLite file shared by all namespaces
+
+JSON file payloads can be stored compressed by setting CACHE_CODEC to
+'compact', 'zlib' or 'zstd'; files written with any codec are read
+transparently.
+
+Concurrent misses for the same key are coalesced by SingleFlight, so only one
+caller pays for the API request while the others wait for its result.
+
+Set CACHE_BACKEND=sqlite to use the SQLite store. Existing JSON caches can be
+imported with SQLiteCache.import_json_dir() or
+`python workflows/cache_manager.py --migrate-sqlite`.
 """
 
 import os
 import json
+import time
+import atexit
+import asyncio
+import zlib
+import sqlite3
 import hashlib
+import tempfile
+import threading
+import weakref
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+from shared.telemetry import record_llm_cache_hit, record_tavily_call
+
+try:
+    import fcntl
+except ImportError:  # Windows: writes stay atomic, but are not serialized across processes
+    fcntl = None
+
+# Victim ordering for size-based eviction; expired rows always go first
+EVICTION_POLICIES = {
+    'lru': "last_access ASC",
+    'lfu': "hits ASC, last_access ASC",
+}
+
+
+def _ensure_columns(conn: sqlite3.Connection, table: str, columns: Dict[str, str]):
+    """Add columns missing from tables created by older versions"""
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    for name, definition in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+
+class _UsageBuffer:
+    """
+    Hit/miss/eviction counters and entry accesses batched in memory
+    
+    Every lookup updates them, so writing them through would cost each cache
+    read a committed SQLite transaction. Owners flush the buffer once it holds
+    FLUSH_EVERY updates or is FLUSH_SECONDS old, before reading usage data
+    back, on close() and at interpreter exit.
+    """
+    
+    FLUSH_EVERY = 64
+    FLUSH_SECONDS = 5.0
+    
+    def __init__(self):
+        self.counters: Counter = Counter()
+        self.accesses: Dict[str, list] = {}  # key -> [last access, hits]
+        self._updates = 0
+        self._since = time.monotonic()
+    
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] += amount
+        self._updates += 1
+    
+    def access(self, key: str):
+        entry = self.accesses.setdefault(key, [0.0, 0])
+        entry[0] = time.time()
+        entry[1] += 1
+    
+    def due(self) -> bool:
+        return self._updates >= self.FLUSH_EVERY or time.monotonic() - self._since >= self.FLUSH_SECONDS
+    
+    def drain(self) -> tuple:
+        """Return (counters, [(last_access, hits, key)]) and start a new batch"""
+        counters = dict(self.counters)
+        accesses = [(last_access, hits, key) for key, (last_access, hits) in self.accesses.items()]
+        self.counters.clear()
+        self.accesses.clear()
+        self._updates = 0
+        self._since = time.monotonic()
+        return counters, accesses
+
+
+# Stores with buffered usage, flushed at exit so no counts are lost
+_buffered_stores: "weakref.WeakSet" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_buffered_stores():
+    for store in list(_buffered_stores):
+        try:
+            store.flush()
+        except Exception:
+            pass
+
+
+class _CacheIndex:
+    """
+    Manifest of cache entries (key, payload size, creation/access times, hits)
+    
+    Kept in a small SQLite file next to the JSON payloads so statistics,
+    expiry sweeps and quota eviction never have to open or decode the
+    payload files. Hit/miss/eviction counters live here too so they are
+    visible to other processes such as cache_manager.py, once flushed from
+    the in-memory _UsageBuffer.
+    """
+    
+    def __init__(self, index_path: Path):
+        self._lock = threading.Lock()
+        self._usage = _UsageBuffer()
+        # Running [entries, bytes] for quota checks; None until counted
+        self._totals: Optional[list] = None
+        self._data_version = None
+        self._conn = sqlite3.connect(str(index_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        _ensure_columns(self._conn, "entries", {
+            'last_access': "REAL NOT NULL DEFAULT 0",
+            'hits': "INTEGER NOT NULL DEFAULT 0",
+        })
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_created ON entries(created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(last_access)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        """)
+        self._conn.commit()
+        _buffered_stores.add(self)
+    
+    def _flush_locked(self):
+        """Write buffered counters and accesses in one transaction (caller holds the lock)"""
+        counters, accesses = self._usage.drain()
+        if not counters and not accesses:
+            return
+        self._conn.executemany(
+            "UPDATE entries SET last_access = MAX(last_access, ?), hits = hits + ? WHERE key = ?",
+            accesses
+        )
+        self._conn.executemany(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            list(counters.items())
+        )
+        self._conn.commit()
+    
+    def _record(self, *names: str, key: Optional[str] = None, amount: int = 1):
+        with self._lock:
+            if key is not None:
+                self._usage.access(key)
+            for name in names:
+                self._usage.count(name, amount)
+            if self._usage.due():
+                self._flush_locked()
+    
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+    
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+        _buffered_stores.discard(self)
+    
+    def _adjust_totals(self, entries: int, size: int):
+        """Apply this connection's own insert/delete to the running totals (caller holds the lock)"""
+        if self._totals is not None:
+            self._totals[0] += entries
+            self._totals[1] += size
+    
+    def totals(self) -> tuple:
+        """
+        Return (total entries, total bytes) without scanning the index
+        
+        Counted on first use, then kept up to date by upsert/remove/clear.
+        PRAGMA data_version changes when another connection (e.g. another
+        process sharing the cache) commits, which triggers a recount.
+        """
+        with self._lock:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if self._totals is None or version != self._data_version:
+                self._totals = list(self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+                ).fetchone())
+                self._data_version = version
+            return tuple(self._totals)
+    
+    def upsert(self, key: str, size: int, created_at: float):
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, size, created_at, last_access, hits) "
+                "VALUES (?, ?, ?, ?, COALESCE((SELECT hits FROM entries WHERE key = ?), 0))",
+                (key, size, created_at, created_at, key)
+            )
+            self._conn.commit()
+            self._adjust_totals(0 if old else 1, size - (old[0] if old else 0))
+    
+    def record_hit(self, key: str):
+        self._record('hits', key=key)
+    
+    def record_miss(self):
+        self._record('misses')
+    
+    def record_corrupt(self):
+        """Count an unreadable entry (also a miss)"""
+        self._record('corrupt', 'misses')
+    
+    def record_evictions(self, count: int):
+        self._record('evictions', amount=count)
+    
+    def counters(self) -> Dict[str, int]:
+        with self._lock:
+            self._flush_locked()
+            rows = self._conn.execute("SELECT name, value FROM counters").fetchall()
+        return dict(rows)
+    
+    def remove(self, key: str):
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.commit()
+            if old:
+                self._adjust_totals(-1, -old[0])
+    
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.commit()
+            if self._totals is not None:
+                self._totals = [0, 0]
+    
+    def stats(self, expiry_cutoff: float) -> tuple:
+        """Return (total entries, expired entries, total bytes)"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*), "
+                "COALESCE(SUM(CASE WHEN created_at < ? THEN 1 ELSE 0 END), 0), "
+                "COALESCE(SUM(size), 0) FROM entries",
+                (expiry_cutoff,)
+            ).fetchone()
+    
+    def expired_keys(self, expiry_cutoff: float) -> list:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM entries WHERE created_at < ?", (expiry_cutoff,)
+            ).fetchall()
+        return [row[0] for row in rows]
+    
+    def eviction_candidates(self, policy: str, expiry_cutoff: float):
+        """Yield (key, size) in eviction order: expired first, then by policy"""
+        order = EVICTION_POLICIES[policy]
+        with self._lock:
+            # Buffered accesses decide LRU/LFU order
+            self._flush_locked()
+            rows = self._conn.execute(
+                f"SELECT key, size FROM entries ORDER BY (created_at < ?) DESC, {order}",
+                (expiry_cutoff,)
+            ).fetchall()
+        return rows
+
+
+def _select_victims(candidates, total: int, total_size: int,
+                    max_entries: Optional[int], max_bytes: Optional[int],
+                    protected_key: Optional[str] = None) -> list:
+    """Pick keys from ordered (key, size) candidates until both budgets are met
+
+    The entry that was just written is never chosen, otherwise LFU would
+    always evict it (it has no hits yet).
+    """
+    victims = []
+    for key, size in candidates:
+        if key == protected_key:
+            continue
+        over_entries = max_entries is not None and total > max_entries
+        over_bytes = max_bytes is not None and total_size > max_bytes
+        if not (over_entries or over_bytes):
+            break
+        victims.append(key)
+        total -= 1
+        total_size -= size
+    return victims
+
+
+# Payload codecs for SimpleCache files. Reads detect the codec from the file's
+# leading bytes, so entries written with any codec (including the legacy
+# pretty-printed JSON) stay readable after CACHE_CODEC changes.
+PAYLOAD_CODECS = ('json', 'compact', 'zlib', 'zstd')
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+
+def _zstd():
+    """zstandard module, or None when the optional dependency is missing"""
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+
+def encode_payload(data: Dict[str, Any], codec: str) -> bytes:
+    """Serialize a cache entry with the given codec"""
+    if codec == 'json':
+        return json.dumps(data, indent=2).encode('utf-8')
+    
+    compact = json.dumps(data, separators=(',', ':')).encode('utf-8')
+    if codec == 'compact':
+        return compact
+    if codec == 'zstd':
+        zstandard = _zstd()
+        if zstandard is not None:
+            return zstandard.ZstdCompressor(level=6).compress(compact)
+    # 'zlib', and the fallback for 'zstd' without the zstandard package
+    return zlib.compress(compact, 6)
+
+
+def decode_payload(raw: bytes) -> Dict[str, Any]:
+    """Deserialize a cache entry written by encode_payload (any codec)"""
+    if raw.startswith(_ZSTD_MAGIC):
+        zstandard = _zstd()
+        if zstandard is None:
+            raise ValueError("zstd-compressed cache entry but the zstandard package is not installed")
+        raw = zstandard.ZstdDecompressor().decompress(raw)
+    elif raw[:1] == b'\x78':  # zlib header
+        raw = zlib.decompress(raw)
+    return json.loads(raw.decode('utf-8'))
+
+
+def read_entry_file(file_path: Path) -> Dict[str, Any]:
+    """Read a SimpleCache entry file regardless of codec"""
+    with open(file_path, 'rb') as f:
+        return decode_payload(f.read())
+
+
+def write_entry_file(file_path: Path, payload: bytes):
+    """
+    Atomically replace an entry file: write a temp file, fsync, rename
+    
+    Readers see either the old or the new entry, never a partial one, even
+    if the writing process dies mid-write.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.stem}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    
+    if hasattr(os, 'O_DIRECTORY'):
+        # Persist the rename itself
+        dir_fd = os.open(file_path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
+
+@contextmanager
+def _write_lock(lock_path: Path):
+    """Exclusive advisory lock held by one writer (thread or process) at a time"""
+    with open(lock_path, 'a+b') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
 class SimpleCache:
     """Simple file-based cache system"""
     
-    def __init__(self, cache_dir: str, ttl_hours: int = 24):
+    INDEX_FILE = "_index.db"
+    LOCK_FILE = "_write.lock"
+    STALE_TEMP_SECONDS = 3600
+    
+    def __init__(self, cache_dir: str, ttl_hours: int = 24,
+                 max_entries: Optional[int] = None, max_size_mb: Optional[float] = None,
+                 eviction_policy: str = 'lru', codec: str = 'json'):
+        if eviction_policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy '{eviction_policy}' (expected one of {list(EVICTION_POLICIES)})")
+        if codec not in PAYLOAD_CODECS:
+            raise ValueError(f"Unknown cache codec '{codec}' (expected one of {list(PAYLOAD_CODECS)})")
+        if codec == 'zstd' and _zstd() is None:
+            print("⚠️ zstandard not installed - falling back to zlib cache compression (pip install zstandard)")
+            codec = 'zlib'
+        
+        self.codec = codec
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.ttl_hours = ttl_hours
+        self.max_entries = max_entries
+        self.max_bytes = int(max_size_mb * 1024 * 1024) if max_size_mb else None
+        self.eviction_policy = eviction_policy
+        
+        self._lock_path = self.cache_dir / self.LOCK_FILE
+        index_path = self.cache_dir / self.INDEX_FILE
+        index_is_new = not index_path.exists()
+        self._index = _CacheIndex(index_path)
+        if index_is_new:
+            # Caches written before the index existed are scanned once
+            self.rebuild_index()
     
     def _get_cache_key(self, data: str) -> str:
         """Generate cache key from data"""
@@ -30,14 +450,17 @@ class SimpleCache:
         """Get cache file path"""
         return self.cache_dir / f"{key}.json"
     
+    def _expiry_cutoff(self) -> float:
+        """Entries created before this epoch time are expired"""
+        return time.time() - self.ttl_hours * 3600
+    
     def _is_expired(self, file_path: Path) -> bool:
         """Check if cache file is expired"""
         if not file_path.exists():
             return True
         
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
+            data = read_entry_file(file_path)
             
             cached_time = datetime.fromisoformat(data.get('timestamp', ''))
             expiry_time = cached_time + timedelta(hours=self.ttl_hours)
@@ -48,34 +471,90 @@ class SimpleCache:
     
     def get(self, key_data: str) -> Optional[Any]:
         """Get cached data"""
+        entry = self.get_entry(key_data)
+        return entry[0] if entry is not None else None
+    
+    def get_entry(self, key_data: str) -> Optional[tuple]:
+        """Get (content, age in seconds) for an unexpired entry, or None"""
         key = self._get_cache_key(key_data)
         file_path = self._get_cache_file(key)
         
-        if self._is_expired(file_path):
+        try:
+            data = read_entry_file(file_path)
+            cached_time = datetime.fromisoformat(data.get('timestamp', ''))
+        except FileNotFoundError:
+            self._index.record_miss()
+            return None
+        except Exception as e:
+            # Truncated or garbled file: drop it so the next set() replaces it
+            print(f"⚠️ Corrupt cache entry {file_path.name} removed: {e}")
+            self._index.record_corrupt()
+            self._delete_key(key)
             return None
         
-        try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-            return data.get('content')
-        except:
+        if datetime.now() > cached_time + timedelta(hours=self.ttl_hours):
+            self._index.record_miss()
             return None
+        
+        self._index.record_hit(key)
+        return data.get('content'), (datetime.now() - cached_time).total_seconds()
     
     def set(self, key_data: str, content: Any):
         """Set cached data"""
         key = self._get_cache_key(key_data)
         file_path = self._get_cache_file(key)
         
+        now = datetime.now()
         cache_data = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now.isoformat(),
             'content': content
         }
         
         try:
-            with open(file_path, 'w') as f:
-                json.dump(cache_data, f, indent=2)
+            payload = encode_payload(cache_data, self.codec)
+            with _write_lock(self._lock_path):
+                write_entry_file(file_path, payload)
+            self._index.upsert(key, len(payload), now.timestamp())
         except Exception as e:
             print(f"Cache write error: {e}")
+            return
+        
+        self._enforce_quota(protected_key=key)
+    
+    def _enforce_quota(self, protected_key: Optional[str] = None) -> int:
+        """Evict entries until the cache fits its entry and byte budgets"""
+        if self.max_entries is None and self.max_bytes is None:
+            return 0
+        
+        cutoff = self._expiry_cutoff()
+        total, total_size = self._index.totals()
+        if ((self.max_entries is None or total <= self.max_entries) and
+                (self.max_bytes is None or total_size <= self.max_bytes)):
+            return 0
+        
+        victims = _select_victims(
+            self._index.eviction_candidates(self.eviction_policy, cutoff),
+            total, total_size, self.max_entries, self.max_bytes, protected_key
+        )
+        for key in victims:
+            self._delete_key(key)
+        if victims:
+            self._index.record_evictions(len(victims))
+        return len(victims)
+    
+    def delete(self, key_data: str) -> bool:
+        """Delete a cached entry, returning True if it existed"""
+        key = self._get_cache_key(key_data)
+        return self._delete_key(key)
+    
+    def _delete_key(self, key: str) -> bool:
+        """Delete an entry by its hashed key"""
+        self._index.remove(key)
+        try:
+            self._get_cache_file(key).unlink()
+            return True
+        except FileNotFoundError:
+            return False
     
     def clear(self) -> int:
         """Clear all cache files"""
@@ -86,87 +565,832 @@ class SimpleCache:
                 count += 1
             except:
                 pass
+        self._index.clear()
         return count
     
+    def evict_expired(self) -> int:
+        """Delete all entries past their TTL, using only the index"""
+        removed = 0
+        for key in self._index.expired_keys(self._expiry_cutoff()):
+            if self._delete_key(key):
+                removed += 1
+        self._remove_stale_temp_files()
+        return removed
+    
+    def _remove_stale_temp_files(self) -> int:
+        """Delete temp files left behind by writers that died mid-write"""
+        cutoff = time.time() - self.STALE_TEMP_SECONDS
+        removed = 0
+        for tmp_path in self.cache_dir.glob(".*.tmp"):
+            try:
+                if tmp_path.stat().st_mtime < cutoff:
+                    tmp_path.unlink()
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+    
+    def rebuild_index(self) -> int:
+        """Rebuild the index by scanning every payload file (one-off, O(n))"""
+        self._remove_stale_temp_files()
+        self._index.clear()
+        indexed = 0
+        for file_path in self.cache_dir.glob("*.json"):
+            try:
+                data = read_entry_file(file_path)
+                created_at = datetime.fromisoformat(data.get('timestamp', '')).timestamp()
+            except Exception:
+                created_at = 0.0  # Unreadable entries are treated as expired
+            self._index.upsert(file_path.stem, file_path.stat().st_size, created_at)
+            indexed += 1
+        return indexed
+    
+    def recompress(self, codec: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Rewrite every entry with a codec (default: this cache's codec)
+        
+        Timestamps are preserved. Unreadable files are left untouched.
+        
+        Returns:
+            Dict with files rewritten, skipped, and bytes before/after
+        """
+        codec = codec or self.codec
+        if codec not in PAYLOAD_CODECS:
+            raise ValueError(f"Unknown cache codec '{codec}' (expected one of {list(PAYLOAD_CODECS)})")
+        
+        result = {'rewritten': 0, 'skipped': 0, 'bytes_before': 0, 'bytes_after': 0, 'codec': codec}
+        for file_path in self.cache_dir.glob("*.json"):
+            try:
+                raw = file_path.read_bytes()
+                data = decode_payload(raw)
+                encoded = encode_payload(data, codec)
+                with _write_lock(self._lock_path):
+                    write_entry_file(file_path, encoded)
+                created_at = datetime.fromisoformat(data.get('timestamp', '')).timestamp()
+            except Exception:
+                result['skipped'] += 1
+                continue
+            
+            self._index.upsert(file_path.stem, len(encoded), created_at)
+            result['rewritten'] += 1
+            result['bytes_before'] += len(raw)
+            result['bytes_after'] += len(encoded)
+        return result
+    
     def get_stats(self) -> Dict[str, Any]:
-        """Get cache statistics"""
-        files = list(self.cache_dir.glob("*.json"))
-        valid_files = []
-        expired_files = []
-        
-        for file_path in files:
-            if self._is_expired(file_path):
-                expired_files.append(file_path)
-            else:
-                valid_files.append(file_path)
+        """Get cache statistics from the index without reading payloads"""
+        total, expired, total_size = self._index.stats(self._expiry_cutoff())
+        counters = self._index.counters()
         
-        total_size = sum(f.stat().st_size for f in files)
+        return {
+            'total_files': total,
+            'valid_files': total - expired,
+            'expired_files': expired,
+            'total_size_mb': total_size / (1024 * 1024),
+            'cache_dir': str(self.cache_dir),
+            **_usage_stats(counters, self.max_entries, self.max_bytes, self.eviction_policy)
+        }
+    
+    def flush(self):
+        """Write buffered hit/miss counters and accesses to the index"""
+        self._index.flush()
+    
+    def close(self):
+        self._index.close()
+
+
+def _usage_stats(counters: Dict[str, int], max_entries: Optional[int],
+                 max_bytes: Optional[int], eviction_policy: str) -> Dict[str, Any]:
+    """Hit/miss/eviction counters and quota settings for get_stats()"""
+    hits = counters.get('hits', 0)
+    misses = counters.get('misses', 0)
+    lookups = hits + misses
+    
+    return {
+        'hits': hits,
+        'misses': misses,
+        'evictions': counters.get('evictions', 0),
+        'corrupt_entries': counters.get('corrupt', 0),
+        'hit_rate': hits / lookups if lookups else 0.0,
+        'max_entries': max_entries,
+        'max_size_mb': max_bytes / (1024 * 1024) if max_bytes else None,
+        'eviction_policy': eviction_policy
+    }
+
+
+class SQLiteCache:
+    """SQLite-backed cache store, API-compatible with SimpleCache
+
+    All namespaces share one WAL-mode database file. Each row holds the
+    hashed key, creation time, TTL and a zlib-compressed JSON payload, so a
+    cache hit is a single primary-key lookup.
+    """
+    
+    def __init__(self, db_path: str, namespace: str, ttl_hours: int = 24,
+                 max_entries: Optional[int] = None, max_size_mb: Optional[float] = None,
+                 eviction_policy: str = 'lru'):
+        if eviction_policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy '{eviction_policy}' (expected one of {list(EVICTION_POLICIES)})")
+        
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.namespace = namespace
+        self.ttl_hours = ttl_hours
+        self.max_entries = max_entries
+        self.max_bytes = int(max_size_mb * 1024 * 1024) if max_size_mb else None
+        self.eviction_policy = eviction_policy
+        self._lock = threading.Lock()
+        self._usage = _UsageBuffer()
+        # Running [entries, bytes] of this namespace for quota checks; None until counted
+        self._totals: Optional[list] = None
+        self._data_version = None
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                ttl_seconds REAL NOT NULL,
+                payload BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+        """)
+        _ensure_columns(self._conn, "cache_entries", {
+            'last_access': "REAL NOT NULL DEFAULT 0",
+            'hits': "INTEGER NOT NULL DEFAULT 0",
+        })
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_expiry ON cache_entries(namespace, created_at)"
+        )
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_counters (
+                namespace TEXT NOT NULL,
+                name TEXT NOT NULL,
+                value INTEGER NOT NULL,
+                PRIMARY KEY (namespace, name)
+            )
+        """)
+        self._conn.commit()
+        _buffered_stores.add(self)
+    
+    def _flush_locked(self):
+        """Write buffered counters and accesses in one transaction (caller holds the lock)"""
+        counters, accesses = self._usage.drain()
+        if not counters and not accesses:
+            return
+        self._conn.executemany(
+            "UPDATE cache_entries SET last_access = MAX(last_access, ?), hits = hits + ? "
+            "WHERE namespace = ? AND key = ?",
+            [(last_access, hits, self.namespace, key) for last_access, hits, key in accesses]
+        )
+        self._conn.executemany(
+            "INSERT INTO cache_counters (namespace, name, value) VALUES (?, ?, ?) "
+            "ON CONFLICT(namespace, name) DO UPDATE SET value = value + excluded.value",
+            [(self.namespace, name, amount) for name, amount in counters.items()]
+        )
+        self._conn.commit()
+    
+    def _record(self, *names: str, key: Optional[str] = None, amount: int = 1):
+        """Buffer a lookup outcome (see _UsageBuffer)"""
+        with self._lock:
+            if key is not None:
+                self._usage.access(key)
+            for name in names:
+                self._usage.count(name, amount)
+            if self._usage.due():
+                self._flush_locked()
+    
+    def flush(self):
+        """Write buffered hit/miss counters and accesses to the database"""
+        with self._lock:
+            self._flush_locked()
+    
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+        _buffered_stores.discard(self)
+    
+    def _get_cache_key(self, data: str) -> str:
+        """Generate cache key from data (same hashing as SimpleCache)"""
+        return hashlib.md5(data.encode()).hexdigest()
+    
+    @staticmethod
+    def _encode(content: Any) -> bytes:
+        """Serialize content to compact, compressed JSON"""
+        return zlib.compress(json.dumps(content, separators=(',', ':')).encode('utf-8'))
+    
+    @staticmethod
+    def _decode(payload: bytes) -> Any:
+        """Deserialize a payload written by _encode"""
+        return json.loads(zlib.decompress(payload).decode('utf-8'))
+    
+    def _adjust_totals(self, entries: int, size: int):
+        """Apply this connection's own insert/delete to the running totals (caller holds the lock)"""
+        if self._totals is not None:
+            self._totals[0] += entries
+            self._totals[1] += size
+    
+    def _quota_totals(self) -> tuple:
+        """
+        (entries, bytes) in this namespace without a COUNT/SUM per write
+        
+        Counted on first use, then kept up to date by this instance's writes.
+        PRAGMA data_version changes when another connection (another namespace
+        or process) commits to the file, which triggers a recount.
+        """
+        with self._lock:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if self._totals is None or version != self._data_version:
+                self._totals = list(self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries WHERE namespace = ?",
+                    (self.namespace,)
+                ).fetchone())
+                self._data_version = version
+            return tuple(self._totals)
+    
+    def _put(self, key: str, content: Any, created_at: float):
+        """Insert or replace a row for an already-hashed key"""
+        payload = self._encode(content)
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM cache_entries WHERE namespace = ? AND key = ?", (self.namespace, key)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries "
+                "(namespace, key, created_at, ttl_seconds, payload, size, last_access, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, COALESCE("
+                "(SELECT hits FROM cache_entries WHERE namespace = ? AND key = ?), 0))",
+                (self.namespace, key, created_at, self.ttl_hours * 3600, payload, len(payload),
+                 created_at, self.namespace, key)
+            )
+            self._conn.commit()
+            self._adjust_totals(0 if old else 1, len(payload) - (old[0] if old else 0))
+    
+    def get(self, key_data: str) -> Optional[Any]:
+        """Get cached data"""
+        entry = self.get_entry(key_data)
+        return entry[0] if entry is not None else None
+    
+    def get_entry(self, key_data: str) -> Optional[tuple]:
+        """Get (content, age in seconds) for an unexpired entry, or None"""
+        key = self._get_cache_key(key_data)
+        
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT created_at, ttl_seconds, payload FROM cache_entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        
+        if row is None:
+            self._record('misses')
+            return None
+        
+        created_at, ttl_seconds, payload = row
+        if time.time() > created_at + ttl_seconds:
+            self._record('misses')
+            return None
+        
+        try:
+            content = self._decode(payload)
+        except (zlib.error, ValueError):
+            self._record('corrupt', 'misses')
+            return None
+        
+        self._record('hits', key=key)
+        return content, time.time() - created_at
+    
+    def set(self, key_data: str, content: Any):
+        """Set cached data"""
+        key = self._get_cache_key(key_data)
+        try:
+            self._put(key, content, time.time())
+        except Exception as e:
+            print(f"Cache write error: {e}")
+            return
+        
+        self._enforce_quota(protected_key=key)
+    
+    def _enforce_quota(self, protected_key: Optional[str] = None) -> int:
+        """Evict entries until this namespace fits its entry and byte budgets"""
+        if self.max_entries is None and self.max_bytes is None:
+            return 0
+        
+        now = time.time()
+        total, total_size = self._quota_totals()
+        if ((self.max_entries is None or total <= self.max_entries) and
+                (self.max_bytes is None or total_size <= self.max_bytes)):
+            return 0
+        
+        with self._lock:
+            # Buffered accesses decide LRU/LFU order
+            self._flush_locked()
+            candidates = self._conn.execute(
+                "SELECT key, size FROM cache_entries WHERE namespace = ? "
+                f"ORDER BY (created_at + ttl_seconds < ?) DESC, {EVICTION_POLICIES[self.eviction_policy]}",
+                (self.namespace, now)
+            ).fetchall()
+        victims = _select_victims(candidates, total, total_size, self.max_entries, self.max_bytes, protected_key)
+        if not victims:
+            return 0
+        
+        sizes = dict(candidates)
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                [(self.namespace, key) for key in victims]
+            )
+            self._conn.commit()
+            self._adjust_totals(-len(victims), -sum(sizes[key] for key in victims))
+        self._record('evictions', amount=len(victims))
+        return len(victims)
+    
+    def delete(self, key_data: str) -> bool:
+        """Delete a cached entry, returning True if it existed"""
+        key = self._get_cache_key(key_data)
+        with self._lock:
+            old = self._conn.execute(
+                "SELECT size FROM cache_entries WHERE namespace = ? AND key = ?", (self.namespace, key)
+            ).fetchone()
+            self._conn.execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (self.namespace, key))
+            self._conn.commit()
+            if old:
+                self._adjust_totals(-1, -old[0])
+        return old is not None
+    
+    def evict_expired(self) -> int:
+        """Delete all entries in this namespace that are past their TTL"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND created_at + ttl_seconds < ?",
+                (self.namespace, time.time())
+            )
+            self._conn.commit()
+            if cursor.rowcount:
+                self._totals = None  # recounted on the next quota check
+        return cursor.rowcount
+    
+    def clear(self) -> int:
+        """Clear all entries in this namespace"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+            self._conn.commit()
+            if self._totals is not None:
+                self._totals = [0, 0]
+        return cursor.rowcount
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics (same keys as SimpleCache.get_stats)"""
+        now = time.time()
+        with self._lock:
+            self._flush_locked()
+            total, expired, total_size = self._conn.execute(
+                "SELECT COUNT(*), "
+                "COALESCE(SUM(CASE WHEN created_at + ttl_seconds < ? THEN 1 ELSE 0 END), 0), "
+                "COALESCE(SUM(size), 0) "
+                "FROM cache_entries WHERE namespace = ?",
+                (now, self.namespace)
+            ).fetchone()
+            counters = dict(self._conn.execute(
+                "SELECT name, value FROM cache_counters WHERE namespace = ?", (self.namespace,)
+            ).fetchall())
         
         return {
-            'total_files': len(files),
-            'valid_files': len(valid_files),
-            'expired_files': len(expired_files),
+            'total_files': total,
+            'valid_files': total - expired,
+            'expired_files': expired,
             'total_size_mb': total_size / (1024 * 1024),
-            'cache_dir': str(self.cache_dir)
+            'cache_dir': f"{self.db_path}:{self.namespace}",
+            **_usage_stats(counters, self.max_entries, self.max_bytes, self.eviction_policy)
         }
+    
+    def import_json_dir(self, json_dir: str) -> int:
+        """
+        Import entries from a SimpleCache JSON directory
+        
+        Keys are kept as-is (SimpleCache file names are already the hashed
+        keys) and original timestamps are preserved so TTLs carry over.
+        
+        Returns:
+            Number of entries imported
+        """
+        imported = 0
+        for file_path in Path(json_dir).glob("*.json"):
+            try:
+                data = read_entry_file(file_path)
+                created_at = datetime.fromisoformat(data['timestamp']).timestamp()
+                self._put(file_path.stem, data.get('content'), created_at)
+                imported += 1
+            except Exception as e:
+                print(f"Skipping unreadable cache file {file_path.name}: {e}")
+        return imported
 
 
 # Global cache instances
 _tavily_cache = None
 _openai_cache = None
 
+# Root of every cache file; CACHE_DIR moves them all (e.g. for tests)
+CACHE_DIR = "cache"
+
+
+def cache_path(name: str) -> str:
+    """Path of a cache file or directory under CACHE_DIR"""
+    return os.path.join(os.getenv('CACHE_DIR', CACHE_DIR), name)
+
+# Default per-namespace budgets; override with CACHE_<NAMESPACE>_MAX_MB /
+# CACHE_<NAMESPACE>_MAX_ENTRIES (0 disables the limit)
+DEFAULT_CACHE_QUOTAS = {
+    'tavily': {'max_size_mb': 256, 'max_entries': None},
+    'openai': {'max_size_mb': 256, 'max_entries': None},
+}
+
+
+def _use_sqlite_backend() -> bool:
+    """Whether CACHE_BACKEND selects the SQLite store"""
+    return os.getenv('CACHE_BACKEND', 'json').strip().lower() == 'sqlite'
+
+def _quota_from_env(namespace: str) -> Dict[str, Any]:
+    """Resolve size budget and eviction policy for a cache namespace"""
+    quota = dict(DEFAULT_CACHE_QUOTAS.get(namespace, {}))
+    prefix = f"CACHE_{namespace.upper()}"
+    
+    max_mb = os.getenv(f"{prefix}_MAX_MB")
+    if max_mb:
+        quota['max_size_mb'] = float(max_mb) or None
+    max_entries = os.getenv(f"{prefix}_MAX_ENTRIES")
+    if max_entries:
+        quota['max_entries'] = int(max_entries) or None
+    
+    quota['eviction_policy'] = os.getenv('CACHE_EVICTION_POLICY', 'lru').strip().lower()
+    return quota
+
+def tavily_swr_settings() -> Dict[str, Any]:
+    """
+    Stale-while-revalidate settings for the Tavily cache
+    
+    Entries are always kept until the hard TTL but only served as fresh up to
+    the soft TTL. With stale-while-revalidate (TAVILY_CACHE_SWR=true sets the
+    default, a search can override it), entries between the two are served
+    immediately and refreshed in the background; otherwise they are refetched.
+    """
+    enabled = os.getenv('TAVILY_CACHE_SWR', '').strip().lower() in ('1', 'true', 'yes')
+    soft_ttl_hours = float(os.getenv('TAVILY_CACHE_SOFT_TTL_HOURS', '24'))
+    hard_ttl_hours = float(os.getenv('TAVILY_CACHE_HARD_TTL_HOURS', '168'))
+    
+    return {
+        'enabled': enabled,
+        'soft_ttl_hours': soft_ttl_hours,
+        'hard_ttl_hours': max(hard_ttl_hours, soft_ttl_hours)
+    }
+
+def _build_cache(namespace: str, ttl_hours: int):
+    """Create the configured backend for a namespace"""
+    quota = _quota_from_env(namespace)
+    if _use_sqlite_backend():
+        return SQLiteCache(cache_path("cache.db"), namespace, ttl_hours=ttl_hours, **quota)
+    # SQLite payloads are always compressed; JSON files opt in with CACHE_CODEC
+    codec = os.getenv('CACHE_CODEC', 'json').strip().lower()
+    return SimpleCache(cache_path(namespace), ttl_hours=ttl_hours, codec=codec, **quota)
+
 def get_tavily_cache() -> SimpleCache:
     """Get Tavily cache instance"""
     global _tavily_cache
     if _tavily_cache is None:
-        _tavily_cache = SimpleCache("cache/tavily", ttl_hours=24)
+        # Entries must outlive the soft TTL for stale-while-revalidate to serve them
+        _tavily_cache = _build_cache("tavily", ttl_hours=tavily_swr_settings()['hard_ttl_hours'])
     return _tavily_cache
 
 def get_openai_cache() -> SimpleCache:
     """Get OpenAI cache instance"""
     global _openai_cache
     if _openai_cache is None:
-        _openai_cache = SimpleCache("cache/openai", ttl_hours=168)  # 1 week
+        _openai_cache = _build_cache("openai", ttl_hours=168)  # 1 week
     return _openai_cache
 
-def cached_tavily_search(query: str, max_results: int = 5) -> list:
-    """Cached Tavily search"""
+def reset_caches():
+    """Drop the process-wide caches and query index (tests, or after changing CACHE_DIR)"""
+    global _tavily_cache, _openai_cache, _query_index
+    for cache in (_tavily_cache, _openai_cache):
+        if cache is not None:
+            cache.close()
+    _tavily_cache = None
+    _openai_cache = None
+    _query_index = None
+
+class _InFlightCall:
+    """Result slot shared by all callers waiting on one in-flight call"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one execution
+    
+    do() is for threads: the first caller runs fn, later callers block until
+    it finishes and receive the same result (or exception). do_async() is the
+    asyncio equivalent: callers on the same event loop await one shared task.
+    """
+    
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _InFlightCall] = {}
+        self._tasks: Dict[tuple, "asyncio.Task"] = {}
+        self.stats = {'executions': 0, 'coalesced': 0}
+    
+    def do(self, key: str, fn):
+        """Run fn() once for all concurrent callers with the same key"""
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _InFlightCall()
+                self._calls[key] = call
+                self.stats['executions'] += 1
+            else:
+                self.stats['coalesced'] += 1
+        
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+    
+    async def do_async(self, key: str, coro_fn):
+        """Await coro_fn() once for all concurrent callers on this event loop"""
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        
+        with self._lock:
+            task = self._tasks.get(flight_key)
+            if task is None:
+                task = loop.create_task(coro_fn())
+                self._tasks[flight_key] = task
+                task.add_done_callback(lambda _task: self._forget_task(flight_key))
+                self.stats['executions'] += 1
+            else:
+                self.stats['coalesced'] += 1
+        
+        # shield() keeps the shared call alive if one waiter is cancelled
+        return await asyncio.shield(task)
+    
+    def _forget_task(self, flight_key: tuple):
+        with self._lock:
+            self._tasks.pop(flight_key, None)
+
+
+# One coalescing group per upstream API
+tavily_singleflight = SingleFlight("tavily")
+openai_singleflight = SingleFlight("openai")
+
+
+def get_singleflight_stats() -> Dict[str, Dict[str, int]]:
+    """Executed vs. coalesced API calls for this process"""
+    return {
+        'tavily': dict(tavily_singleflight.stats),
+        'openai': dict(openai_singleflight.stats)
+    }
+
+# Near-duplicate query reuse for Tavily searches
+_query_index = None
+
+
+def get_query_similarity_index():
+    """
+    Get the near-duplicate query index, or None when disabled
+    
+    Controlled by TAVILY_NEAR_DUPLICATE_CACHE (default true) and
+    TAVILY_SIMILARITY_THRESHOLD (Jaccard over normalized tokens, default 0.8).
+    """
+    global _query_index
+    if os.getenv('TAVILY_NEAR_DUPLICATE_CACHE', 'true').strip().lower() in ('0', 'false', 'no'):
+        return None
+    if _query_index is None:
+        from shared.query_similarity import QuerySimilarityIndex
+        threshold = float(os.getenv('TAVILY_SIMILARITY_THRESHOLD', '0.8'))
+        _query_index = QuerySimilarityIndex(cache_path("tavily_queries.db"), threshold=threshold)
+    return _query_index
+
+def get_near_duplicate_stats() -> Dict[str, int]:
+    """Near-duplicate lookups and reuses for this process"""
+    if _query_index is None:
+        return {'lookups': 0, 'normalized_hits': 0, 'fuzzy_hits': 0}
+    return dict(_query_index.stats)
+
+def _near_duplicate_result(cache, query: str, max_results: int, max_age_seconds: float) -> Optional[list]:
+    """Fresh cached results of a near-identical query, trimmed to max_results"""
+    index = get_query_similarity_index()
+    if index is None:
+        return None
+    
+    for match in index.find_similar(query, max_results):
+        entry = cache.get_entry(f"tavily_{match['query']}_{match['max_results']}")
+        if entry is None:
+            # Evicted or expired since it was indexed
+            index.remove(match['query'], match['max_results'])
+            continue
+        if entry[1] > max_age_seconds:
+            continue
+        
+        index.record_hit(match['similarity'])
+        print(f"   🔁 Reusing near-duplicate Tavily result (similarity {match['similarity']:.2f}): "
+              f"'{query[:40]}' ≈ '{match['query'][:40]}'")
+        return entry[0][:max_results]
+    return None
+
+def _register_query(query: str, max_results: int):
+    index = get_query_similarity_index()
+    if index is not None:
+        index.add(query, max_results)
+
+# Background refreshes for stale-while-revalidate
+_swr_executor = None
+_swr_lock = threading.Lock()
+_swr_refreshing = set()
+swr_stats = {'stale_served': 0, 'refreshes_scheduled': 0, 'refresh_failures': 0}
+
+
+def _schedule_refresh(cache_key: str, refresh):
+    """Run refresh() in the background unless one is already pending for the key"""
+    global _swr_executor
+    from concurrent.futures import ThreadPoolExecutor
+    
+    with _swr_lock:
+        if cache_key in _swr_refreshing:
+            return
+        _swr_refreshing.add(cache_key)
+        swr_stats['refreshes_scheduled'] += 1
+        if _swr_executor is None:
+            _swr_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tavily-swr")
+    
+    def run():
+        try:
+            refresh()
+        except Exception as e:
+            swr_stats['refresh_failures'] += 1
+            print(f"   ⚠️ Background Tavily refresh failed: {e}")
+        finally:
+            with _swr_lock:
+                _swr_refreshing.discard(cache_key)
+    
+    _swr_executor.submit(run)
+
+def tavily_cache_search(query: str, max_results: int, fetch, search_depth: str = "advanced",
+                        stale_while_revalidate: Optional[bool] = None,
+                        include_domains: Optional[list] = None, exclude_domains: Optional[list] = None) -> list:
+    """
+    Tavily results through the cache; fetch() is called on a miss
+    
+    This is the default cache of shared.tavily_client.TavilySearchClient.
+    Errors raised by fetch() propagate and nothing is cached for them.
+    
+    Args:
+        query: Search query
+        max_results: Maximum results to request
+        fetch: Performs the uncached search
+        search_depth: Search depth (non-default depths are cached separately)
+        stale_while_revalidate: Serve entries past the soft TTL and refresh them
+            in the background (defaults to TAVILY_CACHE_SWR)
+        include_domains / exclude_domains: Domain filter of the search; filtered
+            searches are cached separately and never reuse near-duplicates
+    """
     cache = get_tavily_cache()
     cache_key = f"tavily_{query}_{max_results}"
+    if search_depth != "advanced":
+        cache_key += f"_{search_depth}"
+    if include_domains:
+        cache_key += f"_include:{','.join(sorted(include_domains))}"
+    if exclude_domains:
+        cache_key += f"_exclude:{','.join(sorted(exclude_domains))}"
+    # Only unfiltered advanced searches are indexed for near-duplicate reuse
+    shares_results = search_depth == "advanced" and not include_domains and not exclude_domains
+    swr = tavily_swr_settings()
+    if stale_while_revalidate is None:
+        stale_while_revalidate = swr['enabled']
+    soft_ttl_seconds = swr['soft_ttl_hours'] * 3600
     
-    # Try cache first
-    cached_result = cache.get(cache_key)
-    if cached_result is not None:
-        print(f"   💾 Using cached Tavily result for: {query[:50]}...")
-        return cached_result
+    def fresh_entry():
+        entry = cache.get_entry(cache_key)
+        if entry is not None and entry[1] <= soft_ttl_seconds:
+            return entry[0]
+        return None
     
-    # Make API call
-    try:
-        from agents.research_engine.tavily_client import search_tavily
-        results = search_tavily(query, max_results=max_results)
+    def fetch_and_store(keep_existing_on_empty: bool = False) -> list:
+        # Another caller may have refreshed the cache while we were queued
+        cached = fresh_entry()
+        if cached is not None:
+            return cached
+        
+        results = fetch()
+        
+        # A failed background refresh must not replace usable stale results
+        if not results and keep_existing_on_empty:
+            return results
         
         # Cache the result
         cache.set(cache_key, results)
+        if results and shares_results:
+            _register_query(query, max_results)
         print(f"   🔍 Fresh Tavily search cached: {query[:50]}...")
         
         return results
+    
+    # Try cache first
+    start = time.perf_counter()
+    entry = cache.get_entry(cache_key)
+    if entry is not None:
+        cached_result, age_seconds = entry
+        if age_seconds <= soft_ttl_seconds:
+            print(f"   💾 Using cached Tavily result for: {query[:50]}...")
+            record_tavily_call('cached_tavily_search', time.perf_counter() - start, cache_hit=True)
+            return cached_result
+        if stale_while_revalidate:
+            swr_stats['stale_served'] += 1
+            print(f"   ♻️  Using stale Tavily result ({age_seconds / 3600:.0f}h old), refreshing in background: {query[:50]}...")
+            _schedule_refresh(cache_key, lambda: tavily_singleflight.do(cache_key, lambda: fetch_and_store(keep_existing_on_empty=True)))
+            record_tavily_call('cached_tavily_search', time.perf_counter() - start, cache_hit=True)
+            return cached_result
+    
+    # Reuse results of a near-identical cached query
+    if shares_results:
+        try:
+            similar_result = _near_duplicate_result(cache, query, max_results, soft_ttl_seconds)
+            if similar_result is not None:
+                record_tavily_call('cached_tavily_search', time.perf_counter() - start, cache_hit=True)
+                return similar_result
+        except Exception as e:
+            print(f"   ⚠️ Near-duplicate lookup failed: {e}")
+    
+    # Make API call (coalesced with identical in-flight searches)
+    return tavily_singleflight.do(cache_key, fetch_and_store)
+
+def cached_tavily_search(query: str, max_results: int = 5, stale_while_revalidate: Optional[bool] = None) -> list:
+    """
+    Cached Tavily search through the shared search client; errors return []
+    
+    Args:
+        query: Search query
+        max_results: Maximum results to request
+        stale_while_revalidate: Serve entries past the soft TTL and refresh them
+            in the background (defaults to TAVILY_CACHE_SWR)
+    """
+    from shared.tavily_client import get_search_client
+    
+    try:
+        return get_search_client().search(query, max_results=max_results,
+                                          stale_while_revalidate=stale_while_revalidate)
     except Exception as e:
         print(f"   ❌ Tavily search error: {e}")
         return []
 
 def cached_openai_generate(prompt: str, model: str = "gpt-4", **kwargs) -> str:
-    """Cached OpenAI generation"""
+    """Cached OpenAI generation (uncached under an offline or record LLM_BACKEND)"""
+    from shared.llm_backend import bypasses_openai_cache
+    if bypasses_openai_cache():
+        # Replayed or synthetic text must never land in the persistent OpenAI cache,
+        # and a cache hit would never reach the recorder
+        from shared.openai_client import generate_text
+        return generate_text(prompt=prompt, model=model, **kwargs)
+    
     cache = get_openai_cache()
     cache_key = f"openai_{model}_{prompt}_{str(sorted(kwargs.items()))}"
     
     # Try cache first
+    start = time.perf_counter()
     cached_result = cache.get(cache_key)
     if cached_result is not None:
         print(f"   💾 Using cached OpenAI response...")
+        record_llm_cache_hit('cached_openai_generate', model, prompt, cached_result, time.perf_counter() - start)
         return cached_result
     
-    # Make API call
-    try:
+    def generate() -> str:
+        # Another caller may have filled the cache while we were queued
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         from shared.openai_client import generate_text
         result = generate_text(prompt=prompt, model=model, **kwargs)
         
@@ -175,6 +1399,48 @@ def cached_openai_generate(prompt: str, model: str = "gpt-4", **kwargs) -> str:
         print(f"   🤖 Fresh OpenAI response cached...")
         
         return result
+    
+    # Make API call (coalesced with identical in-flight generations)
+    try:
+        return openai_singleflight.do(cache_key, generate)
     except Exception as e:
         print(f"   ❌ OpenAI generation error: {e}")
-        return ""
\ No newline at end of file
+        return ""
+
+def cached_openai_stream(prompt: str, model: str = "gpt-4", **kwargs):
+    """
+    Cached OpenAI generation that yields text as it is generated
+    
+    Shares cache entries with cached_openai_generate. A cache hit yields the
+    whole response at once; a miss streams from the API and caches the
+    response once the stream completes. An offline or record LLM_BACKEND
+    bypasses the cache entirely.
+    """
+    from shared.llm_backend import bypasses_openai_cache
+    from shared.openai_client import stream_text
+    if bypasses_openai_cache():
+        yield from stream_text(prompt=prompt, model=model, **kwargs)
+        return
+    
+    cache = get_openai_cache()
+    cache_key = f"openai_{model}_{prompt}_{str(sorted(kwargs.items()))}"
+    
+    # Try cache first
+    start = time.perf_counter()
+    cached_result = cache.get(cache_key)
+    if cached_result is not None:
+        print(f"   💾 Using cached OpenAI response...")
+        record_llm_cache_hit('cached_openai_stream', model, prompt, cached_result, time.perf_counter() - start)
+        yield cached_result
+        return
+    
+    parts = []
+    for delta in stream_text(prompt=prompt, model=model, **kwargs):
+        parts.append(delta)
+        yield delta
+    
+    # Only a completed stream is cached
+    result = ''.join(parts)
+    if result:
+        cache.set(cache_key, result)
+        print(f"   🤖 Fresh OpenAI response streamed and cached...")
@@ -1,80 +1,289 @@
-# This file handles interactions with the Tavily search client.
-# It includes a function to perform a search with a given query and return results.
+#!/usr/bin/env python3
+"""
+Tavily Client - Shared search client for every research path
+============================================================
+
+One TavilySearchClient per process (get_search_client()) serves the Deep
+Research Pipeline, the intelligent and second-loop research engines, cache
+warm-up and the legacy search_tavily helpers:
+
+- one requests session with a keep-alive connection pool (TAVILY_MAX_CONNECTIONS,
+  default 16; TAVILY_TIMEOUT seconds, default 30)
+- a pluggable cache: any callable (query, max_results, fetch, search_depth,
+  stale_while_revalidate, include_domains, exclude_domains) -> results. The
+  default is the tiered Tavily cache in simple_cache.py (TTL,
+  stale-while-revalidate, near-duplicate reuse, single-flight); pass
+  cache=None for uncached searches
+- no domain filter unless include_domains / exclude_domains are passed; the
+  legacy agents/research_engine/tavily_client.py passes its own
+- sync search / search_many and async asearch / asearch_many
+- every API request goes through the 'tavily' provider limiter in
+  rate_limiter.py (TAVILY_RPM_LIMIT, retries with backoff, circuit breaker)
+
+Errors: search() and fetch() raise TavilyError (TavilyConfigError when no API
+key is set). search_many() follows asyncio.gather: the first error is raised
+unless return_exceptions=True, in which case failed queries hold their
+exception. search_tavily() here raises TavilyError as well; only the legacy
+agents/research_engine/tavily_client.search_tavily() turns errors into []
+after logging.
+"""
 
 import os
-from tavily import TavilyClient
+import time
+import asyncio
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Callable, Sequence, Tuple, Union
 from dotenv import load_dotenv
 
-# Load .env file 
+from shared.rate_limiter import get_provider_limiter
+from shared.telemetry import record_tavily_call, tavily_cost
+
+# Load .env file
 load_dotenv()
 
-# Initialize Tavily client
-tavily_api_key = os.getenv("TAVILY_API_KEY")
-if not tavily_api_key:
-    raise ValueError("TAVILY_API_KEY not found in environment variables.")
+DEFAULT_SEARCH_DEPTH = "advanced"
+
+# A query is either a string (default max_results) or (query, max_results)
+SearchQuery = Union[str, Tuple[str, int]]
+
+
+class TavilyError(RuntimeError):
+    """A Tavily search failed"""
+
+
+class TavilyConfigError(TavilyError):
+    """Tavily is not installed or TAVILY_API_KEY is not set"""
+
+
+def tavily_http_settings() -> Dict[str, Any]:
+    """Connection pool size and timeout for the shared Tavily session"""
+    return {
+        'max_connections': int(os.getenv('TAVILY_MAX_CONNECTIONS', '16')),
+        'timeout': float(os.getenv('TAVILY_TIMEOUT', '30')),
+    }
+
+
+def _default_cache():
+    from shared.simple_cache import tavily_cache_search
+    return tavily_cache_search
+
+
+class TavilySearchClient:
+    """Pooled, cached Tavily search client"""
+
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[Callable] = _default_cache,
+                 search_depth: str = DEFAULT_SEARCH_DEPTH, max_workers: int = 8):
+        """
+        Args:
+            api_key: Tavily API key (defaults to TAVILY_API_KEY)
+            cache: Cache callable, None for no caching (defaults to the tiered Tavily cache)
+            search_depth: Default search depth ('basic' or 'advanced')
+            max_workers: Default parallelism of search_many
+        """
+        self.api_key = api_key if api_key is not None else os.getenv('TAVILY_API_KEY', '')
+        self.cache = cache() if cache is _default_cache else cache
+        self.search_depth = search_depth
+        self.max_workers = max_workers
+        self.settings = tavily_http_settings()
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        """The underlying TavilyClient, built once on a pooled session"""
+        if self._client is not None:
+            return self._client
+        if not self.api_key:
+            raise TavilyConfigError("TAVILY_API_KEY not found in environment variables")
+
+        with self._lock:
+            if self._client is None:
+                try:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    from tavily import TavilyClient
+                except ImportError:
+                    raise TavilyConfigError("Tavily client not installed. Install with: pip install tavily-python")
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.settings['max_connections'])
+                session.mount("https://", adapter)
+                try:
+                    self._client = TavilyClient(api_key=self.api_key, session=session)
+                except TypeError:
+                    # tavily-python < 0.7 keeps its own session
+                    self._client = TavilyClient(api_key=self.api_key)
+            return self._client
+
+    def fetch(self, query: str, max_results: int = 5, search_depth: Optional[str] = None,
+              include_domains: Optional[List[str]] = None, exclude_domains: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """One uncached, rate-limited Tavily API request; raises TavilyError on failure"""
+        client = self._get_client()
+        domain_filter = {}
+        if include_domains:
+            domain_filter['include_domains'] = include_domains
+        if exclude_domains:
+            domain_filter['exclude_domains'] = exclude_domains
+        start = time.perf_counter()
+        try:
+            response = get_provider_limiter('tavily').call(lambda: client.search(
+                query=query,
+                search_depth=search_depth or self.search_depth,
+                max_results=max_results,
+                timeout=self.settings['timeout'],
+                **domain_filter
+            ))
+        except Exception as e:
+            record_tavily_call('tavily_search', time.perf_counter() - start, success=False)
+            raise TavilyError(f"Tavily search failed for '{query[:50]}': {e}") from e
+
+        record_tavily_call('tavily_search', time.perf_counter() - start)
+        return response.get('results', [])
+
+    def search(self, query: str, max_results: int = 5, search_depth: Optional[str] = None,
+               use_cache: bool = True, stale_while_revalidate: Optional[bool] = None,
+               include_domains: Optional[List[str]] = None, exclude_domains: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Search Tavily, through the cache unless use_cache is False
+
+        Args:
+            query: Search query
+            max_results: Maximum results to request
+            search_depth: 'basic' or 'advanced' (defaults to the client's depth)
+            use_cache: Serve from and store into the cache
+            stale_while_revalidate: Passed to the cache (see simple_cache.tavily_swr_settings)
+            include_domains: Only return results from these domains (cached separately)
+            exclude_domains: Never return results from these domains (cached separately)
+
+        Raises:
+            TavilyError: The search failed and no cached result was available
+        """
+        search_depth = search_depth or self.search_depth
+        
+        def fetch():
+            return self.fetch(query, max_results, search_depth,
+                              include_domains=include_domains, exclude_domains=exclude_domains)
+        
+        if not use_cache or self.cache is None:
+            return fetch()
+        return self.cache(query, max_results, fetch, search_depth=search_depth,
+                          stale_while_revalidate=stale_while_revalidate,
+                          include_domains=include_domains, exclude_domains=exclude_domains)
 
-client = TavilyClient(api_key=tavily_api_key)
+    def search_many(self, queries: Sequence[SearchQuery], max_results: int = 5,
+                    search_depth: Optional[str] = None, max_workers: Optional[int] = None,
+                    return_exceptions: bool = False, **kwargs) -> List[Any]:
+        """
+        Run several searches in parallel; results are returned in query order
+
+        Each search runs in a copy of the caller's context, so telemetry keeps
+        the caller's stage and email index.
+
+        Args:
+            queries: Query strings or (query, max_results) pairs
+            max_results: Default max_results for plain query strings
+            max_workers: Parallel searches (defaults to the client's max_workers)
+            return_exceptions: Put a failed query's exception in its slot instead of raising
+        """
+        searches = [(q, max_results) if isinstance(q, str) else tuple(q) for q in queries]
+        if not searches:
+            return []
+
+        def run(request):
+            try:
+                return self.search(request[0], max_results=request[1], search_depth=search_depth, **kwargs)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return e
+
+        contexts = [contextvars.copy_context() for _ in searches]
+        workers = max(1, min(max_workers or self.max_workers, len(searches)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tavily-search") as executor:
+            return list(executor.map(lambda context, request: context.run(run, request), contexts, searches))
+
+    async def asearch(self, query: str, max_results: int = 5, search_depth: Optional[str] = None,
+                      **kwargs) -> List[Dict[str, Any]]:
+        """Async search; the cached sync path runs in a worker thread on the shared session"""
+        return await asyncio.to_thread(self.search, query, max_results, search_depth, **kwargs)
+
+    async def asearch_many(self, queries: Sequence[SearchQuery], max_results: int = 5,
+                           search_depth: Optional[str] = None, max_concurrency: Optional[int] = None,
+                           return_exceptions: bool = False, **kwargs) -> List[Any]:
+        """Async search_many, at most max_concurrency searches in flight"""
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or self.max_workers))
+
+        async def run(query: SearchQuery):
+            query, limit = (query, max_results) if isinstance(query, str) else query
+            async with semaphore:
+                return await self.asearch(query, limit, search_depth, **kwargs)
+
+        return list(await asyncio.gather(*(run(q) for q in queries), return_exceptions=return_exceptions))
+
+    def close(self):
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+            self._client = None
+
+
+_search_client: Optional[TavilySearchClient] = None
+_search_client_lock = threading.Lock()
+
+
+def get_search_client() -> TavilySearchClient:
+    """The shared, cached Tavily search client"""
+    global _search_client
+    with _search_client_lock:
+        if _search_client is None:
+            _search_client = TavilySearchClient()
+        return _search_client
+
+
+def reset_search_client():
+    """Drop the shared client (e.g. after changing the API key or pool settings)"""
+    global _search_client
+    with _search_client_lock:
+        if _search_client is not None:
+            _search_client.close()
+        _search_client = None
 
-# Import cached Tavily client
-try:
-    from agents.research_engine.tavily_client import EnhancedTavilyClient
-    cached_client = EnhancedTavilyClient(cache_enabled=True, cache_ttl_hours=168)  # 1 week cache
-    print("🗄️ Tavily cache enabled (TTL: 1 week)")
-except ImportError as e:
-    print(f"⚠️ Cached Tavily client not available: {e}")
-    cached_client = None
 
 def search_tavily(query: str, search_depth: str = "basic", max_results: int = 3) -> list:
     """
-    Performs a Tavily search for the given query with caching support.
-    
+    Performs a cached Tavily search for the given query.
+
     Args:
         query (str): The search query string.
         search_depth (str): The depth of the search ('basic' or 'advanced').
         max_results (int): Maximum number of results to return.
-    
+
     Returns:
         list: A list of search results (each a dict with title, url, content).
+
+    Raises:
+        TavilyError: The search failed.
     """
-    try:
-        # Use cached client if available
-        if cached_client:
-            response = cached_client.search_general(query, search_depth, max_results)
-            # Convert to list format for compatibility
-            return [
-                {
-                    "title": result.title,
-                    "url": result.url,
-                    "content": result.content,
-                    "score": result.score
-                }
-                for result in response.results
-            ]
-        else:
-            # Fallback to direct client
-            response = client.search(
-                query=query,
-                search_depth=search_depth,
-                max_results=max_results
-            )
-            return response.get("results", [])
-    except Exception as e:
-        print(f"❌ Tavily search failed: {str(e)}")
-        raise RuntimeError(f"Tavily search failed: {str(e)}")
+    return get_search_client().search(query, max_results=max_results, search_depth=search_depth)
+
 
 def get_tavily_cache_stats() -> dict:
     """Get Tavily cache statistics"""
-    if cached_client and cached_client.cache:
-        stats = cached_client.get_cache_stats()
-        # Add more useful info
-        if stats.get('cache_enabled', False):
-            stats['total_entries'] = stats.get('cached_queries', 0)
-            # More accurate Tavily pricing estimate
-            # Tavily typically charges ~$0.005 per search query (5 requests for $0.025)
-            cost_per_query = 0.005  # $0.005 per query
-            cached_queries = stats.get('cached_queries', 0)
-            stats['estimated_savings'] = round(cached_queries * cost_per_query, 3)
-            stats['cost_per_query'] = cost_per_query
-            stats['cache_hit_rate'] = f"{cached_queries} queries cached"
-        return stats
-    return {"cache_enabled": False, "message": "Cache not available"}
+    try:
+        from shared.simple_cache import get_tavily_cache
+        stats = get_tavily_cache().get_stats()
+    except Exception as e:
+        return {"cache_enabled": False, "message": f"Cache not available: {e}"}
+
+    cost_per_query = tavily_cost()
+    cached_queries = stats.get('valid_files', 0)
+    stats.update({
+        'cache_enabled': True,
+        'total_entries': cached_queries,
+        'cached_queries': cached_queries,
+        'cost_per_query': cost_per_query,
+        'estimated_savings': round(stats.get('hits', 0) * cost_per_query, 3),
+        'cache_hit_rate': f"{stats.get('hit_rate', 0.0):.0%}"
+    })
+    return stats
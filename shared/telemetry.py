@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Telemetry - Token, cost and latency accounting for LLM and Tavily calls
+=======================================================================
+
+Every OpenAI and Tavily call (and every cache hit that avoided one) is
+recorded in a local SQLite sink, telemetry.db under CACHE_DIR by default:
+
+    kind             'llm' or 'tavily'
+    operation        calling function (generate_completion, call_llm, ...)
+    model            LLM model, or 'tavily'
+    prompt/completion tokens
+    latency          seconds
+    cache_hit        1 if served from cache (cost is then the cost avoided)
+    stage            pipeline stage (email_pipeline, deep_research, prep_guide)
+    email_index      email being processed
+
+Stage and email index come from set_telemetry_context(), which the
+workflow calls as it moves between pipeline stages. Disable recording with
+TELEMETRY_ENABLED=false; move the sink with TELEMETRY_DB_PATH.
+
+Records are buffered in memory and written in one transaction every
+TelemetrySink.FLUSH_EVERY records or FLUSH_SECONDS seconds, before the sink
+is read (rows(), report()), on close() and at interpreter exit, so cache hits
+do not each pay for a committed SQLite write.
+
+`python workflows/cache_manager.py --report` summarizes the sink.
+"""
+
+import os
+import math
+import atexit
+import sqlite3
+import threading
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+# USD per 1M tokens (input, output); unknown models fall back to the closest prefix
+MODEL_PRICING = {
+    'gpt-4o-mini': (0.15, 0.60),
+    'gpt-4o': (2.50, 10.00),
+    'gpt-4-turbo': (10.00, 30.00),
+    'gpt-4': (30.00, 60.00),
+    'gpt-3.5-turbo': (0.50, 1.50),
+}
+
+# USD per Tavily search (override with TAVILY_COST_PER_SEARCH)
+DEFAULT_TAVILY_COST = 0.008
+
+_stage: ContextVar[Optional[str]] = ContextVar('telemetry_stage', default=None)
+_email_index: ContextVar[Optional[int]] = ContextVar('telemetry_email_index', default=None)
+
+
+def set_telemetry_context(stage: Optional[str] = None, email_index: Optional[int] = None):
+    """Tag subsequent calls in this context with a pipeline stage and email index"""
+    _stage.set(stage)
+    if email_index is not None:
+        _email_index.set(email_index)
+
+
+def get_telemetry_context() -> Dict[str, Any]:
+    return {'stage': _stage.get(), 'email_index': _email_index.get()}
+
+
+def estimate_cost(model: Optional[str], prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimated USD cost of an LLM call"""
+    if not model:
+        return 0.0
+    for name, (input_price, output_price) in MODEL_PRICING.items():
+        if model.startswith(name):
+            return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+    return 0.0
+
+
+def tavily_cost() -> float:
+    return float(os.getenv('TAVILY_COST_PER_SEARCH', DEFAULT_TAVILY_COST))
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    """Nearest-rank percentile of a list of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percentile / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class TelemetrySink:
+    """SQLite store for per-call telemetry records"""
+
+    FLUSH_EVERY = 64
+    FLUSH_SECONDS = 5.0
+
+    def __init__(self, db_path: Optional[str] = None):
+        if not db_path:
+            # simple_cache records telemetry, so it is imported here rather than at module level
+            from shared.simple_cache import cache_path
+            db_path = cache_path("telemetry.db")
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pending: List[tuple] = []
+        self._pending_since = time.monotonic()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS calls (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp REAL NOT NULL,
+                kind TEXT NOT NULL,
+                operation TEXT NOT NULL,
+                model TEXT,
+                prompt_tokens INTEGER NOT NULL DEFAULT 0,
+                completion_tokens INTEGER NOT NULL DEFAULT 0,
+                latency REAL NOT NULL,
+                cache_hit INTEGER NOT NULL,
+                success INTEGER NOT NULL,
+                cost_usd REAL NOT NULL DEFAULT 0,
+                stage TEXT,
+                email_index INTEGER
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_calls_timestamp ON calls(timestamp)")
+        self._conn.commit()
+
+    def record(self, kind: str, operation: str, latency: float, model: Optional[str] = None,
+               prompt_tokens: int = 0, completion_tokens: int = 0, cache_hit: bool = False,
+               success: bool = True, cost_usd: float = 0.0):
+        context = get_telemetry_context()
+        with self._lock:
+            self._pending.append((time.time(), kind, operation, model, prompt_tokens, completion_tokens, latency,
+                                  int(cache_hit), int(success), cost_usd, context['stage'], context['email_index']))
+            if len(self._pending) >= self.FLUSH_EVERY or time.monotonic() - self._pending_since >= self.FLUSH_SECONDS:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self._pending:
+            self._conn.executemany(
+                "INSERT INTO calls (timestamp, kind, operation, model, prompt_tokens, completion_tokens, "
+                "latency, cache_hit, success, cost_usd, stage, email_index) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._pending
+            )
+            self._conn.commit()
+            self._pending = []
+        self._pending_since = time.monotonic()
+
+    def flush(self):
+        """Write the buffered records"""
+        with self._lock:
+            self._flush_locked()
+
+    def rows(self, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        query = ("SELECT kind, operation, model, prompt_tokens, completion_tokens, latency, "
+                 "cache_hit, success, cost_usd, stage, email_index FROM calls")
+        params = ()
+        if since is not None:
+            query += " WHERE timestamp >= ?"
+            params = (since,)
+        with self._lock:
+            self._flush_locked()
+            cursor = self._conn.execute(query, params)
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def clear(self) -> int:
+        with self._lock:
+            self._flush_locked()
+            cursor = self._conn.execute("DELETE FROM calls")
+            self._conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+
+    def report(self, since: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Summaries by pipeline stage and p50/p95 latency by call type
+
+        Cost of cache misses is money spent; cost of cache hits is money saved.
+        """
+        rows = self.rows(since)
+
+        stages: Dict[str, Dict[str, Any]] = {}
+        saved_by_kind: Dict[str, float] = {}
+        latencies: Dict[tuple, Dict[str, List[float]]] = {}
+        for row in rows:
+            stage = stages.setdefault(row['stage'] or 'unattributed', {
+                'calls': 0, 'cache_hits': 0, 'errors': 0, 'prompt_tokens': 0,
+                'completion_tokens': 0, 'cost_usd': 0.0, 'saved_usd': 0.0, 'tavily_searches': 0
+            })
+            stage['calls'] += 1
+            if row['cache_hit']:
+                stage['cache_hits'] += 1
+                stage['saved_usd'] += row['cost_usd']
+                saved_by_kind[row['kind']] = saved_by_kind.get(row['kind'], 0.0) + row['cost_usd']
+            else:
+                stage['cost_usd'] += row['cost_usd']
+                stage['prompt_tokens'] += row['prompt_tokens']
+                stage['completion_tokens'] += row['completion_tokens']
+                if row['kind'] == 'tavily':
+                    stage['tavily_searches'] += 1
+            if not row['success']:
+                stage['errors'] += 1
+
+            key = (row['kind'], row['model'] or row['operation'])
+            bucket = latencies.setdefault(key, {'hit': [], 'miss': []})
+            bucket['hit' if row['cache_hit'] else 'miss'].append(row['latency'])
+
+        for stage in stages.values():
+            stage['hit_rate'] = stage['cache_hits'] / stage['calls'] if stage['calls'] else 0.0
+
+        latency_table = []
+        for (kind, model), bucket in sorted(latencies.items()):
+            for source in ('miss', 'hit'):
+                values = bucket[source]
+                if values:
+                    latency_table.append({
+                        'kind': kind,
+                        'model': model,
+                        'source': 'api' if source == 'miss' else 'cache',
+                        'calls': len(values),
+                        'p50': _percentile(values, 50),
+                        'p95': _percentile(values, 95)
+                    })
+
+        return {
+            'total_calls': len(rows),
+            'total_cost_usd': sum(s['cost_usd'] for s in stages.values()),
+            'total_saved_usd': sum(s['saved_usd'] for s in stages.values()),
+            'saved_usd_by_kind': saved_by_kind,
+            'stages': stages,
+            'latency': latency_table
+        }
+
+
+_sink: Optional[TelemetrySink] = None
+_sink_lock = threading.Lock()
+
+
+def telemetry_enabled() -> bool:
+    return os.getenv('TELEMETRY_ENABLED', 'true').lower() != 'false'
+
+
+def get_telemetry_sink() -> TelemetrySink:
+    global _sink
+    with _sink_lock:
+        if _sink is None:
+            _sink = TelemetrySink(os.getenv('TELEMETRY_DB_PATH'))
+        return _sink
+
+
+@atexit.register
+def _flush_telemetry_sink():
+    """Write the process-wide sink's buffered records at interpreter exit"""
+    if _sink is not None:
+        try:
+            _sink.flush()
+        except Exception:
+            pass
+
+
+def reset_telemetry_sink():
+    """Close and drop the process-wide sink (tests, or after changing TELEMETRY_DB_PATH)"""
+    global _sink
+    with _sink_lock:
+        if _sink is not None:
+            _sink.close()
+        _sink = None
+
+
+def record_llm_call(operation: str, model: str, prompt_tokens: int, completion_tokens: int,
+                    latency: float, cache_hit: bool = False, success: bool = True):
+    """Record an LLM call (or a cache hit that avoided one). Never raises."""
+    if not telemetry_enabled():
+        return
+    try:
+        get_telemetry_sink().record(
+            'llm', operation, latency, model=model, prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens, cache_hit=cache_hit, success=success,
+            cost_usd=estimate_cost(model, prompt_tokens, completion_tokens)
+        )
+    except Exception as e:
+        print(f"⚠️ Telemetry write failed: {e}")
+
+
+def record_tavily_call(operation: str, latency: float, cache_hit: bool = False, success: bool = True):
+    """Record a Tavily search (or a cache hit that avoided one). Never raises."""
+    if not telemetry_enabled():
+        return
+    try:
+        get_telemetry_sink().record(
+            'tavily', operation, latency, model='tavily', cache_hit=cache_hit, success=success,
+            cost_usd=tavily_cost() if success else 0.0
+        )
+    except Exception as e:
+        print(f"⚠️ Telemetry write failed: {e}")
+
+
+def record_llm_cache_hit(operation: str, model: str, prompt: str, response: str, latency: float):
+    """Record a cached LLM response, with the tokens (and cost) it avoided"""
+    if not telemetry_enabled():
+        return
+    from shared.openai_cache import count_tokens
+    record_llm_call(operation, model, count_tokens(prompt, model), count_tokens(response or '', model),
+                    latency, cache_hit=True)
+
+
+def usage_tokens(response, prompt: str, completion: str, model: str) -> tuple:
+    """(prompt_tokens, completion_tokens) from response.usage, else estimated"""
+    usage = getattr(response, 'usage', None)
+    prompt_tokens = getattr(usage, 'prompt_tokens', None)
+    if isinstance(prompt_tokens, int):
+        completion_tokens = getattr(usage, 'completion_tokens', 0)
+        return prompt_tokens, completion_tokens if isinstance(completion_tokens, int) else 0
+    from shared.openai_cache import count_tokens
+    return count_tokens(prompt, model), count_tokens(completion or '', model)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Term Matcher - Find every term of a vocabulary in a text at once
+================================================================
+
+Source validation asks "is term X in this title or content?" for the company
+name variations, email keywords, name and role parts and each indicator
+list. TermMatcher answers all of those questions in one call: find() returns
+the set of vocabulary terms present in a text, and find_any() the terms
+present in any of several texts (title and content are scanned as one
+document), so scoring code checks set membership instead of rescanning the
+texts per term. find_any_many() scores a whole batch of search results and
+scans each distinct document once, since the same page comes back for many
+of an agent's queries.
+
+find(text) is exactly {term for term in terms if term in text}:
+- vocabularies of AUTOMATON_MIN_TERMS terms or more are compiled into an
+  Aho-Corasick automaton (pip install pyahocorasick) and each text is
+  scanned once
+- smaller vocabularies, or all of them without pyahocorasick, are checked
+  with str.__contains__ driven from C; below about 30 terms this beats both
+  the automaton and any stdlib regex alternation over the same terms
+
+Compiled matchers are cached by vocabulary (compile_terms), so the same
+company or interviewer across emails and agents is compiled once.
+"""
+
+from functools import lru_cache
+from operator import itemgetter
+from typing import FrozenSet, Iterable, List, Sequence, Tuple
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+AUTOMATON_MIN_TERMS = 32
+
+# Joins texts for find_any(); a term containing it is looked up per text instead
+TEXT_SEPARATOR = '\x00'
+
+# automaton.iter() yields (end_index, term)
+_match_term = itemgetter(1)
+
+
+class TermMatcher:
+    """A compiled vocabulary of literal terms"""
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms = frozenset(terms)
+        # The empty string is in every text, as with the `in` operator
+        self._always = frozenset(t for t in self.terms if not t)
+        self._literal_terms = tuple(sorted(t for t in self.terms if t and TEXT_SEPARATOR not in t))
+        self._separator_terms = tuple(sorted(t for t in self.terms if TEXT_SEPARATOR in t))
+        self._automaton = None
+        if ahocorasick is not None and len(self._literal_terms) >= AUTOMATON_MIN_TERMS:
+            self._automaton = ahocorasick.Automaton()
+            for term in self._literal_terms:
+                self._automaton.add_word(term, term)
+            self._automaton.make_automaton()
+
+    def _scan(self, text: str) -> FrozenSet[str]:
+        if self._automaton is not None:
+            return self._always.union(map(_match_term, self._automaton.iter(text)))
+        return self._always.union(filter(text.__contains__, self._literal_terms))
+
+    def find(self, text: str) -> FrozenSet[str]:
+        """Every term that occurs in `text`"""
+        if not text:
+            return self._always
+        found = self._scan(text)
+        if self._separator_terms:
+            found = found.union(filter(text.__contains__, self._separator_terms))
+        return found
+
+    def find_any(self, *texts: str) -> FrozenSet[str]:
+        """Every term that occurs in at least one of `texts` (one scan of the joined texts)"""
+        found = self._scan(TEXT_SEPARATOR.join(texts))
+        for term in self._separator_terms:
+            if any(term in text for text in texts):
+                found = found.union((term,))
+        return found
+
+    def find_any_many(self, documents: Sequence[Tuple[str, ...]]) -> List[FrozenSet[str]]:
+        """
+        find_any() for a batch of documents (tuples of texts), in order
+
+        Search results repeat across queries, so identical documents are scanned once.
+        """
+        scanned = {}
+        results = []
+        for document in documents:
+            found = scanned.get(document)
+            if found is None:
+                found = scanned[document] = self.find_any(*document)
+            results.append(found)
+        return results
+
+
+@lru_cache(maxsize=256)
+def _compile(terms: FrozenSet[str]) -> TermMatcher:
+    return TermMatcher(terms)
+
+
+def compile_terms(*term_lists: Iterable[str]) -> TermMatcher:
+    """A (cached) matcher for the union of several term lists"""
+    return _compile(frozenset(term for terms in term_lists for term in terms))
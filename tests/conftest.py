@@ -0,0 +1,37 @@
+# tests/conftest.py
+import os
+import sys
+import atexit
+import shutil
+import tempfile
+
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Objects built at import time (e.g. llm_client's OpenAICache) must not touch the real cache/
+_session_cache_dir = tempfile.mkdtemp(prefix="test-cache-")
+atexit.register(shutil.rmtree, _session_cache_dir, True)
+os.environ['CACHE_DIR'] = _session_cache_dir
+
+from shared.research_artifacts import reset_artifact_store
+from shared.simple_cache import reset_caches
+from shared.telemetry import reset_telemetry_sink
+
+
+def _reset_stores():
+    reset_artifact_store()
+    reset_caches()
+    reset_telemetry_sink()
+
+
+@pytest.fixture(autouse=True)
+def isolated_stores(monkeypatch, tmp_path):
+    """Give every test its own caches, research artifacts, recordings and telemetry sink under tmp_path"""
+    monkeypatch.setenv('CACHE_DIR', str(tmp_path / "cache"))
+    for name in ('RESEARCH_ARTIFACTS_PATH', 'TELEMETRY_DB_PATH', 'LLM_RECORDINGS_PATH'):
+        monkeypatch.delenv(name, raising=False)
+    _reset_stores()
+    yield
+    _reset_stores()
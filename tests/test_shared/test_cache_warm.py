@@ -0,0 +1,73 @@
+# tests/test_shared/test_cache_warm.py
+"""
+Tests for cache warm-up (workflows/cache_manager.py --warm)
+
+Run from project root:
+python -m pytest tests/test_shared/test_cache_warm.py -v
+"""
+
+import os
+import sys
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import shared.simple_cache as simple_cache
+from agents.memory_systems.shared_memory import SharedMemorySystem
+from pipelines.deep_research_pipeline import DeepResearchPipeline
+from shared.tavily_client import TavilySearchClient
+from workflows.cache_manager import plan_warm_queries, warm_caches
+
+
+INTERVIEWS = [
+    {'company': 'Acme', 'role': 'Data Engineer', 'interviewer': 'Jane Doe'},
+    {'company': 'Acme', 'role': 'Data Engineer', 'interviewer': 'John Roe'},
+]
+
+
+class TestCacheWarm:
+    """Test that warm-up prefetches exactly what the research agents search"""
+
+    def test_research_queries_match_agents(self, monkeypatch):
+        """The warm plan covers every search the pipeline makes, with the same max_results"""
+        searched = []
+
+        def fake_search(self, query, max_results=5, **kwargs):
+            searched.append((query, max_results))
+            return []
+
+        monkeypatch.setattr(TavilySearchClient, 'search', fake_search)
+        DeepResearchPipeline().conduct_deep_research(
+            {'company': 'Acme', 'role': 'Data Engineer', 'interviewer': 'Jane Doe'}, 1
+        )
+
+        assert set(searched) == set(DeepResearchPipeline.research_queries('Acme', 'Data Engineer', 'Jane Doe'))
+
+    def test_plan_deduplicates_shared_targets(self, monkeypatch):
+        """Company and role searches shared by two interviews are planned once"""
+        monkeypatch.setattr(SharedMemorySystem, 'get_unprepped_interviews', lambda self, max_results=10: INTERVIEWS)
+
+        interviews, searches = plan_warm_queries()
+
+        single = DeepResearchPipeline.research_queries('Acme', 'Data Engineer', 'Jane Doe')
+        interviewer_only = DeepResearchPipeline.research_queries('', '', 'John Roe')
+        assert len(interviews) == 2
+        assert len(searches) == len(set(searches))
+        assert len(searches) == len(single) + len(interviewer_only)
+
+    def test_warm_caches_runs_every_search(self, monkeypatch):
+        """Every planned search goes through the Tavily cache"""
+        monkeypatch.setattr(SharedMemorySystem, 'get_unprepped_interviews', lambda self, max_results=10: INTERVIEWS[:1])
+        searched = []
+
+        def fake_search(query, max_results=5, stale_while_revalidate=None):
+            searched.append((query, max_results))
+            return [{'title': query}] if 'linkedin' in query else []
+
+        monkeypatch.setattr(simple_cache, 'cached_tavily_search', fake_search)
+        result = warm_caches(workers=4, requests_per_second=0)
+
+        assert result['success']
+        assert result['queries'] == len(searched)
+        assert result['with_results'] + result['empty'] == result['queries']
+        assert result['with_results'] == sum(1 for query, _ in searched if 'linkedin' in query)
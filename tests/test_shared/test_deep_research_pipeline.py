@@ -0,0 +1,377 @@
+# tests/test_shared/test_deep_research_pipeline.py
+"""
+Tests for the Deep Research Pipeline search fan-out (pipelines/deep_research_pipeline.py)
+
+Run from project root:
+python -m pytest tests/test_shared/test_deep_research_pipeline.py -v
+"""
+
+import os
+import sys
+import time
+import threading
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from pipelines.deep_research_pipeline import DeepResearchPipeline
+from shared.tavily_client import TavilyError, TavilySearchClient
+from shared.telemetry import get_telemetry_context, set_telemetry_context
+
+
+ENTITIES = {'company': 'Acme', 'role': 'Data Engineer', 'interviewer': 'Jane Doe'}
+SEARCH_LATENCY = 0.05
+
+
+def fake_results(query, max_results):
+    """Deterministic sources that pass the agents' validation"""
+    return [
+        {
+            'title': f"Acme Data Engineer Jane Doe {query} #{i}",
+            'url': f"https://linkedin.com/in/acme-{abs(hash(query)) % 1000}-{i}",
+            'content': f"Acme data engineer internship program, Jane Doe at Acme. {query}"
+        }
+        for i in range(max_results)
+    ]
+
+
+class TestResearchFanOut:
+    """Test that parallel research is faster and gives the same citations"""
+
+    def run_research(self, monkeypatch, max_workers, fail=None):
+        # Every run researches from scratch rather than reusing the previous run's analyses
+        monkeypatch.setenv('RESEARCH_ARTIFACTS_ENABLED', 'false')
+        calls = {'active': 0, 'peak': 0}
+        lock = threading.Lock()
+
+        def fake_search(self, query, max_results=5, **kwargs):
+            with lock:
+                calls['active'] += 1
+                calls['peak'] = max(calls['peak'], calls['active'])
+            time.sleep(SEARCH_LATENCY)
+            with lock:
+                calls['active'] -= 1
+            if fail and fail in query:
+                raise TavilyError("boom")
+            return fake_results(query, max_results)
+
+        monkeypatch.setattr(TavilySearchClient, 'search', fake_search)
+        start = time.perf_counter()
+        result = DeepResearchPipeline(max_workers=max_workers).conduct_deep_research(dict(ENTITIES), 1)
+        return result, time.perf_counter() - start, calls['peak']
+
+    def test_citations_match_sequential_run(self, monkeypatch):
+        sequential, _, _ = self.run_research(monkeypatch, max_workers=1)
+        parallel, _, _ = self.run_research(monkeypatch, max_workers=8)
+
+        assert sequential['success'] and parallel['success']
+        assert parallel['citations_database'] == sequential['citations_database']
+        assert list(parallel['citations_database']) == [str(i) for i in range(1, len(sequential['citations_database']) + 1)]
+
+    def test_wall_time_bounded_by_pool(self, monkeypatch):
+        searches = len(DeepResearchPipeline.research_queries('Acme', 'Data Engineer', 'Jane Doe'))
+        result, elapsed, peak = self.run_research(monkeypatch, max_workers=searches)
+
+        assert peak == searches
+        assert result['search_fanout']['searches'] == searches
+        assert elapsed < searches * SEARCH_LATENCY / 2
+
+    def test_bounded_concurrency(self, monkeypatch):
+        _, _, peak = self.run_research(monkeypatch, max_workers=4)
+        assert peak <= 4
+
+    def test_failed_search_yields_no_sources(self, monkeypatch):
+        result, _, _ = self.run_research(monkeypatch, max_workers=8, fail='crunchbase')
+
+        assert result['success']
+        assert result['search_fanout']['failed'] == 1
+
+
+class TestSearchManyContext:
+    """Test that fan-out searches keep the caller's telemetry context"""
+
+    def test_context_propagates_to_workers(self, monkeypatch):
+        seen = []
+
+        def fake_search(self, query, max_results=5, **kwargs):
+            seen.append(get_telemetry_context())
+            return []
+
+        monkeypatch.setattr(TavilySearchClient, 'search', fake_search)
+        set_telemetry_context(stage='deep_research', email_index=3)
+        try:
+            TavilySearchClient(cache=None).search_many(["a", "b", "c"], max_workers=3)
+        finally:
+            set_telemetry_context(stage=None)
+
+        assert seen == [{'stage': 'deep_research', 'email_index': 3}] * 3
+
+
+class TestRunLevelQueryPlan:
+    """Test that a workflow run fetches each shared search once"""
+
+    def test_shared_searches_fetched_once(self, monkeypatch):
+        searched = []
+        lock = threading.Lock()
+
+        def fake_search(self, query, max_results=5, **kwargs):
+            with lock:
+                searched.append((query, max_results))
+            return fake_results(query, max_results)
+
+        monkeypatch.setattr(TavilySearchClient, 'search', fake_search)
+        pipeline = DeepResearchPipeline(max_workers=8)
+        second = {'COMPANY': ['Acme'], 'ROLE': 'Data Engineer', 'INTERVIEWER': 'John Roe'}
+
+        plan = pipeline.plan_run_research([dict(ENTITIES), second])
+        first_result = pipeline.conduct_deep_research(dict(ENTITIES), 1)
+        second_result = pipeline.conduct_deep_research(second, 2)
+
+        interviewer_only = DeepResearchPipeline.research_queries('', '', 'John Roe')
+        assert plan['duplicates_avoided'] == plan['planned'] - plan['unique'] > 0
+        assert plan['unique'] == len(DeepResearchPipeline.research_queries('Acme', 'Data Engineer', 'Jane Doe')) + len(interviewer_only)
+        assert len(searched) == len(set(searched)) == plan['unique']
+        assert first_result['search_fanout']['searches'] == second_result['search_fanout']['searches'] == 0
+        assert second_result['citations_database']
+
+    def test_failed_searches_retried_per_email(self, monkeypatch):
+        searched = []
+
+        def fake_search(self, query, max_results=5, **kwargs):
+            searched.append(query)
+            if 'crunchbase' in query and searched.count(query) == 1:
+                raise TavilyError("boom")
+            return fake_results(query, max_results)
+
+        monkeypatch.setattr(TavilySearchClient, 'search', fake_search)
+        pipeline = DeepResearchPipeline(max_workers=4)
+
+        plan = pipeline.plan_run_research([dict(ENTITIES)])
+        result = pipeline.conduct_deep_research(dict(ENTITIES), 1)
+
+        assert plan['failed'] == 1
+        assert result['search_fanout']['searches'] == 1
+        pipeline.clear_run_research()
+        assert pipeline.shared_results == {}
+
+
+VALIDATION_SOURCES = [
+    {'title': 'Acme Seeds - About Us', 'url': 'https://acmeseeds.com/about', 'content': 'Acme Seeds is a startup company on a mission to grow data engineering talent.'},
+    {'title': 'Acme Seed Internship Program', 'url': 'https://www.linkedin.com/company/acme-seed', 'content': 'Summer internship program for data engineer interns. Skills and requirements.'},
+    {'title': 'Jane Doe - Data Engineering Manager - Acme Seeds | LinkedIn', 'url': 'https://www.linkedin.com/in/janedoe', 'content': 'Experience: Acme Seeds. About: career in data and AI. Background in analytics.'},
+    {'title': 'Jane posted about incorporation', 'url': 'https://www.linkedin.com/posts/jane_acme', 'content': 'Incorporated last year, our organization hires engineers.'},
+    {'title': 'Data Engineer job description', 'url': 'https://www.glassdoor.com/job/data-engineer', 'content': 'Position responsibilities: pipelines, SQL. Interview questions for the role.'},
+    {'title': 'Doe family bio', 'url': 'https://example.org/doe', 'content': 'profile of the doe family, no company mentioned'},
+    {'title': 'Random news', 'url': 'https://news.example.com/item', 'content': 'Nothing relevant here at all.'},
+    {'title': 'ACME SEEDS careers', 'url': 'https://indeed.com/acme', 'content': 'Data Engineer role at Acme Seeds, description of responsibilities and skills, internship.'},
+    {'title': 'LinkedIn feed', 'url': 'https://www.linkedin.com/feed/update/1', 'content': 'jane doe shared an update about acme seeds mission'},
+    {'title': 'Acme corp inc', 'url': 'https://www.linkedin.com/school/acme', 'content': ''},
+]
+VALIDATION_KEYWORDS = ['data', 'internship', 'acme seeds', 'data engineer', 'jane doe', 'ai', 'program']
+
+
+class TestSourceValidation:
+    """Scores recorded from the per-term validators, which batch scoring must reproduce"""
+
+    def scores(self, validated):
+        return [(VALIDATION_SOURCES.index(v['source']), v['relevance_score']) for v in validated]
+
+    def test_company_scores(self):
+        log = []
+        validated = DeepResearchPipeline(max_workers=1)._validate_company_sources_enhanced(
+            VALIDATION_SOURCES, 'Acme Seeds', VALIDATION_KEYWORDS, log)
+
+        assert self.scores(validated) == [(0, 14), (1, 11), (2, 8), (7, 7), (8, 7), (3, 2), (4, 2), (9, 2)]
+        assert validated[0]['evidence'] == ["Company 'acme seeds' in title", 'Official company domain',
+                                            '3 keyword matches', '4 business indicators']
+        assert len(log) == len(VALIDATION_SOURCES)
+
+    def test_role_scores(self):
+        pipeline = DeepResearchPipeline(max_workers=1)
+        validated = pipeline._validate_role_sources_enhanced(
+            VALIDATION_SOURCES, 'Data Engineer', 'Acme Seeds', VALIDATION_KEYWORDS, [])
+        without_company = pipeline._validate_role_sources_enhanced(
+            VALIDATION_SOURCES, 'Data Engineer', '', VALIDATION_KEYWORDS, [])
+
+        assert self.scores(validated) == [(2, 19), (7, 19), (0, 14), (8, 9)]
+        assert self.scores(without_company) == [(4, 21), (1, 19), (2, 19), (7, 19), (0, 14), (3, 12),
+                                                (8, 12), (9, 10), (5, 8), (6, 8)]
+
+    def test_interviewer_scores(self):
+        validated = DeepResearchPipeline(max_workers=1)._validate_interviewer_sources_enhanced(
+            VALIDATION_SOURCES, 'Jane Doe', 'Acme Seeds', VALIDATION_KEYWORDS, [])
+
+        assert self.scores(validated) == [(2, 18), (8, 9), (0, 4), (7, 4)]
+        assert validated[1]['evidence'][0] == "LinkedIn post mentioning target company"
+
+
+class TestReflectionFollowUp:
+    """Test that reflection re-researches only the deficient dimension, within budget"""
+
+    ENTITIES = {'company': 'Acme', 'interviewer': 'Jane Doe'}
+
+    def interviewer_only_research(self):
+        """Research data whose interviewer analysis found no LinkedIn profile (insufficient)"""
+        return {
+            'interviewer_analysis': {
+                'success': True, 'validated_sources': [], 'sources_processed': 4, 'linkedin_profiles_found': 0,
+                'confidence_score': 0.0, 'citations': [], 'validation_log': [], 'search_suggestions': []
+            }
+        }
+
+    def reflect(self, monkeypatch, results=fake_results, **env):
+        searched = []
+
+        def fake_search(self, query, max_results=5, **kwargs):
+            searched.append(query)
+            return results(query, max_results)
+
+        monkeypatch.setattr(TavilySearchClient, 'search', fake_search)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        pipeline = DeepResearchPipeline(max_workers=4)
+        research_data = self.interviewer_only_research()
+        citations_db = {'1': {'source': 'Existing - https://acme.com', 'content_snippet': '', 'agent': 'company_analysis'}}
+        metrics = {'sources_discovered': 4, 'sources_validated': 0, 'confidence_scores': [0.0],
+                   'linkedin_profiles_found': 0, 'citation_count': 1}
+        reflection = pipeline._conduct_reflection_loops(research_data, dict(self.ENTITIES), citations_db, 2, metrics)
+        return reflection, research_data, citations_db, metrics, searched
+
+    def test_only_deficient_dimension_researched(self, monkeypatch):
+        reflection, research_data, citations_db, metrics, searched = self.reflect(monkeypatch)
+
+        interviewer_followups = DeepResearchPipeline.followup_queries('interviewer', 'Acme', '', 'Jane Doe', {})
+        assert sorted(searched) == sorted(interviewer_followups)
+        assert reflection['followup']['refined'] == ['interviewer']
+        assert reflection['sufficient_for_prep_guide']
+
+        refined = research_data['interviewer_analysis']
+        assert refined['linkedin_profiles_found'] == metrics['linkedin_profiles_found'] > 0
+        assert metrics['confidence_scores'] == [refined['confidence_score']]
+        assert metrics['sources_discovered'] == 4 + len(searched) * DeepResearchPipeline.QUERY_RESULT_LIMITS['followup']
+        assert [c['id'] for c in refined['citations']] == [str(i) for i in range(2, 2 + DeepResearchPipeline.CITATION_LIMITS['interviewer'])]
+        assert set(citations_db) == {'1'} | {c['id'] for c in refined['citations']}
+
+    def test_query_budget(self, monkeypatch):
+        reflection, _, _, _, searched = self.reflect(monkeypatch, REFLECTION_MAX_QUERIES='2')
+
+        assert len(searched) == reflection['followup']['queries'] == 2
+
+    def test_time_budget(self, monkeypatch):
+        reflection, research_data, _, _, searched = self.reflect(monkeypatch, REFLECTION_MAX_SECONDS='0')
+
+        assert searched == []
+        assert reflection['followup']['stop_reason'] == 'time_budget'
+        assert research_data == self.interviewer_only_research()
+
+    def test_unvalidated_followups_leave_slice_unchanged(self, monkeypatch):
+        def unrelated(query, max_results):
+            return [{'title': 'Random news', 'url': f'https://news.example.com/{i}', 'content': 'Nothing relevant'}
+                    for i in range(max_results)]
+
+        reflection, research_data, citations_db, metrics, searched = self.reflect(monkeypatch, results=unrelated)
+
+        assert searched
+        assert reflection['followup']['refined'] == []
+        # The rejected URLs are remembered so later loops do not score them again
+        processed_urls = research_data['interviewer_analysis'].pop('processed_urls')
+        assert set(processed_urls) == {f'https://news.example.com/{i}' for i in range(3)}
+        assert research_data == self.interviewer_only_research()
+        assert list(citations_db) == ['1'] and metrics['citation_count'] == 1
+        assert not reflection['sufficient_for_prep_guide']
+
+    def test_refine_skips_processed_urls_and_counts_validated_profiles(self):
+        """Sources the agent already rejected are not rescored, unrelated profiles do not count"""
+        pipeline = DeepResearchPipeline(max_workers=1)
+        analysis = dict(self.interviewer_only_research()['interviewer_analysis'],
+                        processed_urls=['https://linkedin.com/in/rejected'])
+        targets = {'company': 'Acme', 'role': '', 'interviewer': 'Jane Doe'}
+        sources = [
+            {'title': 'Jane Doe - Acme', 'url': 'https://linkedin.com/in/rejected', 'content': 'Jane Doe at Acme'},
+            {'title': 'Jane Doe - Engineer at Acme', 'url': 'https://linkedin.com/in/janedoe', 'content': 'Jane Doe, Acme'},
+            {'title': 'John Smith', 'url': 'https://linkedin.com/in/johnsmith', 'content': 'Gardening tips'},
+        ]
+
+        refined = pipeline._refine_dimension('interviewer', analysis, sources, targets, [], 2)
+
+        assert refined['sources_processed'] == analysis['sources_processed'] + 2
+        assert refined['linkedin_profiles_found'] == 1
+        assert [v['source']['url'] for v in refined['validated_sources']] == ['https://linkedin.com/in/janedoe']
+        assert refined['processed_urls'] == ['https://linkedin.com/in/rejected', 'https://linkedin.com/in/janedoe',
+                                             'https://linkedin.com/in/johnsmith']
+
+
+class TestResearchBudget:
+    """Test priority-ordered research that stops at the confidence target or a limit"""
+
+    def run_research(self, monkeypatch, research_budget, max_workers=2):
+        monkeypatch.setenv('RESEARCH_ARTIFACTS_ENABLED', 'false')
+        searched = []
+        lock = threading.Lock()
+
+        def fake_search(self, query, max_results=5, **kwargs):
+            with lock:
+                searched.append((query, max_results))
+            return fake_results(query, max_results)
+
+        monkeypatch.setattr(TavilySearchClient, 'search', fake_search)
+        pipeline = DeepResearchPipeline(max_workers=max_workers, research_budget=research_budget)
+        return pipeline.conduct_deep_research(dict(ENTITIES), 1), searched
+
+    def test_priority_order_alternates_dimensions(self):
+        prioritized = DeepResearchPipeline.prioritized_queries('Acme', 'Data Engineer', 'Jane Doe')
+
+        assert sorted(prioritized) == sorted(DeepResearchPipeline.research_queries('Acme', 'Data Engineer', 'Jane Doe'))
+        assert [q for q, _ in prioritized[:3]] == [
+            DeepResearchPipeline.company_queries('Acme')['identity'][0],
+            DeepResearchPipeline.role_queries('Data Engineer', 'Acme')['requirements'][0],
+            DeepResearchPipeline.interviewer_queries('Jane Doe', 'Acme')['linkedin'][0],
+        ]
+
+    def test_estimate_matches_reported_confidence(self, monkeypatch):
+        result, searched = self.run_research(monkeypatch, {'target_confidence': 1.0})
+        budget = result['research_budget']
+
+        assert budget['stop_reason'] == 'all_queries' and budget['skipped'] == 0
+        assert len(searched) == budget['queries'] == len(DeepResearchPipeline.research_queries('Acme', 'Data Engineer', 'Jane Doe'))
+        assert budget['confidence'] == result['overall_confidence']
+
+    def test_stops_at_target_confidence(self, monkeypatch):
+        result, searched = self.run_research(monkeypatch, {'target_confidence': 0.8})
+        budget = result['research_budget']
+        prioritized = DeepResearchPipeline.prioritized_queries('Acme', 'Data Engineer', 'Jane Doe')
+
+        assert budget['stop_reason'] == 'target_confidence'
+        assert 0 < budget['queries'] < len(prioritized) and budget['skipped'] == len(prioritized) - budget['queries']
+        assert sorted(searched) == sorted(prioritized[:budget['queries']])
+        assert result['overall_confidence'] == budget['confidence'] >= 0.8
+
+    def test_query_limit(self, monkeypatch):
+        result, searched = self.run_research(monkeypatch, {'max_queries': 3})
+
+        assert result['research_budget']['stop_reason'] == 'max_queries'
+        assert sorted(searched) == sorted(DeepResearchPipeline.prioritized_queries('Acme', 'Data Engineer', 'Jane Doe')[:3])
+        assert result['success']
+
+    def test_time_limit(self, monkeypatch):
+        result, searched = self.run_research(monkeypatch, {'max_seconds': 0})
+
+        assert result['research_budget']['stop_reason'] == 'max_seconds'
+        assert searched == []
+
+    def test_budget_from_env(self, monkeypatch):
+        monkeypatch.setenv('RESEARCH_BUDGET_QUERIES', '4')
+        monkeypatch.setenv('RESEARCH_TARGET_CONFIDENCE', '0.7')
+
+        assert DeepResearchPipeline(max_workers=1).research_budget == {'max_queries': 4, 'target_confidence': 0.7}
+        monkeypatch.delenv('RESEARCH_BUDGET_QUERIES')
+        monkeypatch.delenv('RESEARCH_TARGET_CONFIDENCE')
+        assert DeepResearchPipeline(max_workers=1).research_budget is None
+
+    def test_run_plan_not_prefetched(self, monkeypatch):
+        searched = []
+        monkeypatch.setattr(TavilySearchClient, 'search', lambda self, query, max_results=5, **kwargs: searched.append(query) or [])
+
+        plan = DeepResearchPipeline(max_workers=4, research_budget={'max_queries': 4}).plan_run_research([dict(ENTITIES)])
+
+        assert plan['budgeted'] and searched == []
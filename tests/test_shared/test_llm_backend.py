@@ -0,0 +1,179 @@
+# tests/test_shared/test_llm_backend.py
+"""
+Tests for the record/replay/synthetic LLM backends (shared/llm_backend.py)
+
+Run from project root:
+python -m pytest tests/test_shared/test_llm_backend.py -v
+"""
+
+import os
+import sys
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from shared.llm_backend import (
+    OfflineClient, RecordingClient, RecordingStore, ReplayBackend, SyntheticBackend,
+    llm_backend_settings, request_key
+)
+from shared.openai_client import generate_text, get_openai_client, reset_openai_clients, stream_text
+
+
+MESSAGES = [{"role": "user", "content": "Summarize Acme"}]
+
+
+class FakeOpenAI:
+    """Minimal openai.OpenAI stand-in returning a fixed completion"""
+
+    def __init__(self, text: str = "Acme builds rockets"):
+        self.calls = 0
+
+        def create(**kwargs):
+            self.calls += 1
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+                usage=SimpleNamespace(prompt_tokens=7, completion_tokens=3)
+            )
+
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def offline_env(monkeypatch, tmp_path):
+    """Instant offline backend with a temporary recordings store"""
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setenv("LLM_RECORDINGS_PATH", str(tmp_path / "recordings.db"))
+    monkeypatch.setenv("LLM_SYNTHETIC_BASE_LATENCY", "0")
+    monkeypatch.setenv("LLM_SYNTHETIC_TOKENS_PER_SECOND", "1000000")
+    monkeypatch.setenv("LLM_REPLAY_LATENCY_SCALE", "0")
+    monkeypatch.setenv("TELEMETRY_ENABLED", "false")
+    reset_openai_clients()
+    yield monkeypatch
+    reset_openai_clients()
+
+
+class TestSyntheticBackend:
+    """Test deterministic synthetic responses"""
+
+    def test_same_request_same_response(self, offline_env):
+        backend = SyntheticBackend(llm_backend_settings())
+        first = backend.respond("gpt-4o", MESSAGES, 50, 0.1)
+
+        assert first == backend.respond("gpt-4o", MESSAGES, 50, 0.1)
+        assert first['text'] != backend.respond("gpt-4o", MESSAGES, 50, 0.9)['text']
+        assert first['completion_tokens'] <= 60
+
+    def test_latency_model(self, offline_env):
+        offline_env.setenv("LLM_SYNTHETIC_BASE_LATENCY", "0.2")
+        offline_env.setenv("LLM_SYNTHETIC_TOKENS_PER_SECOND", "100")
+        response = SyntheticBackend(llm_backend_settings()).respond("gpt-4o", MESSAGES, 100, 0.1)
+
+        assert response['latency'] == pytest.approx(0.2 + response['completion_tokens'] / 100)
+
+    def test_generate_text_without_api_key(self, offline_env):
+        """generate_text works offline in synthetic mode"""
+        offline_env.setenv("LLM_BACKEND", "synthetic")
+
+        assert isinstance(get_openai_client(), OfflineClient)
+        text = generate_text("Summarize Acme", model="gpt-4o", max_tokens=20)
+        assert text and text == generate_text("Summarize Acme", model="gpt-4o", max_tokens=20)
+        assert ''.join(stream_text("Summarize Acme", model="gpt-4o", max_tokens=20)) == text
+
+
+class TestRecordReplay:
+    """Test recording real responses and replaying them offline"""
+
+    def test_replay_serves_recorded_response(self, offline_env, tmp_path):
+        store = RecordingStore(str(tmp_path / "recordings.db"))
+        real = FakeOpenAI()
+        recorder = RecordingClient(real, store)
+
+        recorder.chat.completions.create(model="gpt-4o", messages=MESSAGES, max_tokens=50, temperature=0.1)
+
+        recording = store.get(request_key("gpt-4o", MESSAGES, 50, 0.1))
+        assert recording['text'] == "Acme builds rockets"
+        assert recording['prompt_tokens'] == 7
+        assert recording['latency'] >= 0
+
+        replay = OfflineClient(ReplayBackend(store, llm_backend_settings()))
+        response = replay.chat.completions.create(model="gpt-4o", messages=MESSAGES, max_tokens=50, temperature=0.1)
+        assert response.choices[0].message.content == "Acme builds rockets"
+        assert response.usage.completion_tokens == 3
+        assert real.calls == 1
+
+    def test_replay_scales_recorded_latency(self, offline_env, tmp_path):
+        offline_env.setenv("LLM_REPLAY_LATENCY_SCALE", "0.5")
+        store = RecordingStore(str(tmp_path / "recordings.db"))
+        store.put(request_key("gpt-4o", MESSAGES, 50, 0.1), "gpt-4o", "cached", 1, 1, 4.0)
+
+        response = ReplayBackend(store, llm_backend_settings()).respond("gpt-4o", MESSAGES, 50, 0.1)
+        assert response['latency'] == 2.0
+
+    def test_replay_miss_falls_back_to_synthetic(self, offline_env, tmp_path):
+        backend = ReplayBackend(RecordingStore(str(tmp_path / "recordings.db")), llm_backend_settings())
+        response = backend.respond("gpt-4o", MESSAGES, 50, 0.1)
+
+        assert response['text']
+        assert backend.stats == {'replayed': 0, 'misses': 1}
+
+    def test_async_offline_client(self, offline_env):
+        client = OfflineClient(SyntheticBackend(llm_backend_settings()), async_client=True)
+
+        response = asyncio.run(client.chat.completions.create(model="gpt-4o", messages=MESSAGES, max_tokens=10))
+        assert response.choices[0].message.content
+
+    def test_async_recording_client_close_is_awaitable(self, offline_env, tmp_path):
+        closed = []
+
+        class FakeAsyncOpenAI(FakeOpenAI):
+            async def close(self):
+                closed.append(True)
+
+        recorder = RecordingClient(FakeAsyncOpenAI(), RecordingStore(str(tmp_path / "recordings.db")),
+                                   async_client=True)
+        asyncio.run(recorder.close())
+        assert closed == [True]
+
+
+class TestOfflineCaching:
+    """Offline and record backends bypass the persistent OpenAI cache"""
+
+    def test_cached_generate_bypasses_openai_cache(self, offline_env):
+        import shared.simple_cache as simple_cache
+
+        offline_env.setenv("LLM_BACKEND", "synthetic")
+        offline_env.setattr(simple_cache, "get_openai_cache",
+                            lambda: pytest.fail("offline backend touched the OpenAI cache"))
+
+        text = simple_cache.cached_openai_generate("Summarize Acme", model="gpt-4o", max_tokens=20)
+        assert text
+        assert ''.join(simple_cache.cached_openai_stream("Summarize Acme", model="gpt-4o", max_tokens=20)) == text
+
+    def test_record_on_warm_cache_then_replay(self, offline_env):
+        """Record mode reaches the recorder even for prompts already in the OpenAI cache"""
+        import shared.openai_client as openai_client
+        import shared.simple_cache as simple_cache
+
+        real = FakeOpenAI()
+        offline_env.setattr(openai_client, "_build_openai_client", lambda async_client=False: real)
+
+        # Warm the OpenAI cache with a real (unrecorded) run
+        offline_env.setenv("LLM_BACKEND", "openai")
+        assert simple_cache.cached_openai_generate("Summarize Acme", model="gpt-4o", max_tokens=20) == "Acme builds rockets"
+
+        offline_env.setenv("LLM_BACKEND", "record")
+        reset_openai_clients()
+        assert simple_cache.cached_openai_generate("Summarize Acme", model="gpt-4o", max_tokens=20) == "Acme builds rockets"
+        assert real.calls == 2
+
+        offline_env.setenv("LLM_BACKEND", "replay")
+        reset_openai_clients()
+        assert simple_cache.cached_openai_generate("Summarize Acme", model="gpt-4o", max_tokens=20) == "Acme builds rockets"
+        assert real.calls == 2
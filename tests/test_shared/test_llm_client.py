@@ -0,0 +1,154 @@
+# tests/test_shared/test_llm_client.py
+"""
+Tests for batched LLM calls (call_llm_many) and the token bucket limiter
+
+Run from project root:
+python -m pytest tests/test_shared/test_llm_client.py -v
+"""
+
+import os
+import sys
+import time
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from shared import llm_client, rate_limiter
+from shared.llm_client import call_llm_many
+from shared.rate_limiter import AsyncTokenBucket
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class FakeAsyncClient:
+    """Mimics client.chat.completions.create, failing selected prompts"""
+
+    def __init__(self, delay=0.1, rate_limited=(), failing=()):
+        self.delay = delay
+        self.rate_limited = set(rate_limited)
+        self.failing = set(failing)
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, model, messages, max_tokens, temperature):
+        prompt = messages[-1]['content']
+        self.calls.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if prompt in self.rate_limited:
+                self.rate_limited.discard(prompt)
+                raise RateLimitError("Rate limit reached")
+            if prompt in self.failing:
+                raise ValueError("bad request")
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=f"answer: {prompt}"))])
+        finally:
+            self.in_flight -= 1
+
+
+def use_client(monkeypatch, client):
+    monkeypatch.setenv("DISABLE_OPENAI_CACHE", "true")
+    rate_limiter.reset_provider_limiters()
+    monkeypatch.setattr(llm_client, "has_api_key", True)
+    monkeypatch.setattr(llm_client, "get_async_openai_client", lambda: client)
+
+
+class TestCallLLMMany:
+    """Test concurrent batch execution"""
+
+    def test_results_in_order_and_concurrent(self, monkeypatch):
+        """Ten prompts take about one round trip and come back in order"""
+        client = FakeAsyncClient(delay=0.2)
+        use_client(monkeypatch, client)
+        prompts = [f"chunk {i}" for i in range(10)]
+
+        start = time.monotonic()
+        results = asyncio.run(call_llm_many(prompts, max_concurrency=10))
+        elapsed = time.monotonic() - start
+
+        assert [r['response'] for r in results] == [f"answer: {p}" for p in prompts]
+        assert all(r['success'] for r in results)
+        assert elapsed < 1.0
+
+    def test_concurrency_limit(self, monkeypatch):
+        """No more than max_concurrency requests are in flight"""
+        client = FakeAsyncClient(delay=0.05)
+        use_client(monkeypatch, client)
+
+        asyncio.run(call_llm_many([f"p{i}" for i in range(8)], max_concurrency=3))
+        assert client.max_in_flight == 3
+
+    def test_rate_limit_retried_and_errors_per_item(self, monkeypatch):
+        """A 429 is retried; other failures are reported for that item only"""
+        client = FakeAsyncClient(delay=0.01, rate_limited={"p1"}, failing={"p2"})
+        use_client(monkeypatch, client)
+        monkeypatch.setattr(rate_limiter.random, "random", lambda: 0.0)
+
+        results = asyncio.run(call_llm_many(["p0", "p1", "p2"], max_retries=2))
+
+        assert results[0]['success'] and results[1]['success']
+        assert results[1]['response'] == "answer: p1"
+        assert client.calls.count("p1") == 2
+        assert not results[2]['success']
+        assert results[2]['error'] == "bad request"
+
+    def test_mock_responses_marked_and_not_cached(self, monkeypatch):
+        """Without an API key results are flagged as mocks and never reach the cache"""
+        cache = MagicMock()
+        rate_limiter.reset_provider_limiters()
+        monkeypatch.delenv("DISABLE_OPENAI_CACHE", raising=False)
+        monkeypatch.setattr(llm_client, "has_api_key", False)
+        monkeypatch.setattr(llm_client, "openai_cache", cache)
+        cache.get.return_value = None
+
+        results = asyncio.run(call_llm_many(["p0", "p1"]))
+
+        assert all(r['mock'] and not r['success'] for r in results)
+        assert results[0]['response'].startswith("Mock keyword extraction result")
+        cache.set.assert_not_called()
+
+
+class TestAsyncTokenBucket:
+    """Test TPM/RPM admission"""
+
+    def test_requests_per_minute(self):
+        """The bucket admits its full budget at once, then refills over time"""
+        async def admit(bucket, count):
+            start = time.monotonic()
+            for _ in range(count):
+                await bucket.acquire()
+            return time.monotonic() - start
+
+        assert asyncio.run(admit(AsyncTokenBucket(requests_per_minute=600), 5)) < 0.05
+        # 600 RPM refills one request every 0.1s
+        assert asyncio.run(admit(AsyncTokenBucket(requests_per_minute=600), 603)) >= 0.25
+
+    def test_tokens_per_minute(self):
+        """Requests wait until enough tokens have refilled"""
+        async def admit():
+            bucket = AsyncTokenBucket(tokens_per_minute=6000)
+            await bucket.acquire(6000)
+            start = time.monotonic()
+            await bucket.acquire(20)  # 100 tokens/s -> ~0.2s
+            return time.monotonic() - start
+
+        assert 0.15 <= asyncio.run(admit()) < 0.5
+
+    def test_pause(self):
+        """pause() holds every caller"""
+        async def admit():
+            bucket = AsyncTokenBucket(requests_per_minute=100)
+            bucket.pause(0.2)
+            start = time.monotonic()
+            await bucket.acquire()
+            return time.monotonic() - start
+
+        assert asyncio.run(admit()) >= 0.19
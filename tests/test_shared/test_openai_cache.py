@@ -0,0 +1,105 @@
+# tests/test_shared/test_openai_cache.py
+"""
+Tests for the two-tier OpenAI response cache used by shared/llm_client.py
+
+Run from project root:
+python -m pytest tests/test_shared/test_openai_cache.py -v
+"""
+
+import os
+import sys
+import time
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from shared.openai_cache import OpenAICache
+from shared.simple_cache import SimpleCache, SQLiteCache
+
+
+def make_cache(tmp_path, memory_size=256, memory_seconds=300):
+    store = SimpleCache(str(tmp_path / "openai"), ttl_hours=168)
+    return OpenAICache(store=store, memory_size=memory_size, tags_path=str(tmp_path / "tags.db"),
+                       memory_seconds=memory_seconds)
+
+
+class TestOpenAICache:
+    """Test OpenAICache tiers, keys and company invalidation"""
+
+    def test_roundtrip_and_parameters_in_key(self, tmp_path):
+        """Responses are keyed on every generation parameter"""
+        cache = make_cache(tmp_path)
+        cache.set("Describe Acme", "gpt-4o-mini", 1000, 0.7, "Acme builds rockets", "Acme")
+
+        assert cache.get("Describe Acme", "gpt-4o-mini", 1000, 0.7) == "Acme builds rockets"
+        assert cache.get("Describe Acme", "gpt-4o-mini", 500, 0.7) is None
+        assert cache.get("Describe Acme", "gpt-4o", 1000, 0.7) is None
+
+    def test_disk_tier_survives_new_process(self, tmp_path):
+        """A fresh instance (empty memory tier) is served from the persistent store"""
+        make_cache(tmp_path).set("prompt", "gpt-4", 100, 0.0, "answer")
+
+        cache = make_cache(tmp_path)
+        assert cache.get("prompt", "gpt-4", 100, 0.0) == "answer"
+        assert cache.stats['disk_hits'] == 1
+        assert cache.get("prompt", "gpt-4", 100, 0.0) == "answer"
+        assert cache.stats['memory_hits'] == 1
+        assert cache.stats['tokens_saved'] > 0
+
+    def test_memory_tier_is_bounded(self, tmp_path):
+        """The in-process LRU never grows past memory_size"""
+        cache = make_cache(tmp_path, memory_size=2)
+        for i in range(5):
+            cache.set(f"prompt {i}", "gpt-4", 100, 0.0, f"answer {i}")
+
+        assert cache.get_stats()['memory_entries'] == 2
+        assert cache.get("prompt 0", "gpt-4", 100, 0.0) == "answer 0"
+
+    def test_memory_tier_expires_at_creation_ttl(self, tmp_path, monkeypatch):
+        """An entry loaded from disk late in its TTL is not served past the original expiry"""
+        def sqlite_cache():
+            store = SQLiteCache(str(tmp_path / "openai.db"), "openai", ttl_hours=1)
+            return OpenAICache(store=store, tags_path=str(tmp_path / "tags.db"))
+
+        sqlite_cache().set("prompt", "gpt-4", 100, 0.0, "answer")
+        now = time.time()
+
+        monkeypatch.setattr(time, "time", lambda: now + 3000)
+        cache = sqlite_cache()
+        assert cache.get("prompt", "gpt-4", 100, 0.0) == "answer"
+
+        monkeypatch.setattr(time, "time", lambda: now + 3700)
+        assert cache.get("prompt", "gpt-4", 100, 0.0) is None
+        assert cache.stats['memory_hits'] == 0
+
+    def test_clear_from_another_process_reaches_memory_tier(self, tmp_path, monkeypatch):
+        """Memory entries are re-read from the store after memory_seconds"""
+        cache = make_cache(tmp_path, memory_seconds=60)
+        cache.set("prompt", "gpt-4", 100, 0.0, "answer")
+        make_cache(tmp_path).clear()
+        assert cache.get("prompt", "gpt-4", 100, 0.0) == "answer"
+
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 61)
+        assert cache.get("prompt", "gpt-4", 100, 0.0) is None
+
+    def test_invalidate_company(self, tmp_path):
+        """Only responses tagged with the company are removed"""
+        cache = make_cache(tmp_path)
+        cache.set("about acme", "gpt-4", 100, 0.0, "acme", "Acme")
+        cache.set("acme questions", "gpt-4", 100, 0.0, "questions", "ACME ")
+        cache.set("about globex", "gpt-4", 100, 0.0, "globex", "Globex")
+
+        assert cache.invalidate_company("acme") == 2
+        assert cache.get("about acme", "gpt-4", 100, 0.0) is None
+        assert cache.get("acme questions", "gpt-4", 100, 0.0) is None
+        assert cache.get("about globex", "gpt-4", 100, 0.0) == "globex"
+
+    def test_hit_rate(self, tmp_path):
+        """Hit rate counts memory and disk hits against misses"""
+        cache = make_cache(tmp_path)
+        cache.set("p", "gpt-4", 100, 0.0, "r")
+        cache.get("p", "gpt-4", 100, 0.0)
+        cache.get("missing", "gpt-4", 100, 0.0)
+
+        assert cache.get_stats()['hit_rate'] == 0.5
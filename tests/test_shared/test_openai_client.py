@@ -0,0 +1,85 @@
+# tests/test_shared/test_openai_client.py
+"""
+Tests for the shared, pooled OpenAI client registry
+
+Run from project root:
+python -m pytest tests/test_shared/test_openai_client.py -v
+"""
+
+import os
+import sys
+import asyncio
+import threading
+
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from shared import openai_client
+from shared.openai_client import get_openai_client, get_async_openai_client, reset_openai_clients
+
+
+@pytest.fixture
+def api_key(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    reset_openai_clients()
+    yield
+    reset_openai_clients()
+
+
+class TestOpenAIClientRegistry:
+    """Test that callers share pooled clients"""
+
+    def test_sync_client_is_shared(self, api_key):
+        """Every call returns the same client and connection pool"""
+        assert get_openai_client() is get_openai_client()
+
+    def test_pool_settings_from_env(self, api_key, monkeypatch):
+        """Timeouts and retries are configurable"""
+        monkeypatch.setenv("OPENAI_TIMEOUT", "12")
+        monkeypatch.setenv("OPENAI_MAX_RETRIES", "5")
+        reset_openai_clients()
+
+        client = get_openai_client()
+        assert client.max_retries == 5
+        assert client.timeout.read == 12
+
+    def test_async_client_per_event_loop(self, api_key):
+        """Calls within one loop share a client; a new loop gets its own"""
+        async def two_lookups():
+            return get_async_openai_client(), get_async_openai_client()
+
+        first, second = asyncio.run(two_lookups())
+        other, _ = asyncio.run(two_lookups())
+
+        assert first is second
+        assert other is not first
+
+    def test_reset_closes_async_clients(self, api_key):
+        """The loop-less client and clients of loops still running elsewhere are closed"""
+        async def lookup():
+            return get_async_openai_client()
+
+        unbound = get_async_openai_client()
+
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        try:
+            running = asyncio.run_coroutine_threadsafe(lookup(), loop).result()
+            reset_openai_clients()
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+        assert unbound.is_closed() and running.is_closed()
+
+    def test_missing_key_raises(self, monkeypatch):
+        """Without an API key the registry refuses to build a client"""
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+        monkeypatch.setattr(openai_client, "_sync_client", None)
+
+        with pytest.raises(Exception):
+            get_openai_client()
@@ -0,0 +1,111 @@
+# tests/test_shared/test_prep_guide_prompts.py
+"""
+Tests for token-budgeted prep guide prompts (shared/prep_guide_prompts.py)
+
+Run from project root:
+python -m pytest tests/test_shared/test_prep_guide_prompts.py -v
+"""
+
+import os
+import sys
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from shared.openai_cache import count_tokens
+from shared.prep_guide_prompts import (
+    build_budgeted_research_context, build_prep_guide_prompt, rank_citations
+)
+
+
+def make_citations(count: int, agent: str = 'role_analysis') -> dict:
+    """Low-quality filler citations plus one high-quality interviewer profile"""
+    citations = {
+        str(i): {
+            'source': f"Post {i} - https://example.com/post/{i}",
+            'content_snippet': "filler text " * 40,
+            'agent': agent
+        }
+        for i in range(1, count + 1)
+    }
+    citations['profile'] = {
+        'source': "Jane Doe - Staff Engineer at Acme - https://www.linkedin.com/in/janedoe",
+        'content_snippet': "Jane leads the data platform team at Acme and previously worked on search infrastructure.",
+        'agent': 'interviewer_analysis'
+    }
+    return citations
+
+
+class TestResearchContextBudget:
+    """Test packing ranked citations into a token budget"""
+
+    def test_ranked_by_citation_quality(self):
+        ranked = rank_citations(make_citations(3))
+
+        assert ranked[0]['id'] == 'profile'
+        assert ranked[0]['section'] == 'interviewer_linkedin'
+        assert all(ranked[i]['quality_score'] >= ranked[i + 1]['quality_score'] for i in range(len(ranked) - 1))
+
+    def test_sections_capped_and_titles_only_by_default(self, monkeypatch):
+        """Each section keeps its best citations up to its cap, without snippets"""
+        monkeypatch.delenv("PREP_GUIDE_CONTEXT_SNIPPETS", raising=False)
+        citations = make_citations(10, agent='company_analysis')
+
+        context, report = build_budgeted_research_context("", citations, 10_000)
+
+        assert "linkedin.com/in/janedoe" in context
+        assert context.count("📊 Company Research") == 3
+        assert "filler text" not in context
+        assert report['citations_included'] == 4
+        assert report['section_limited'] == 7
+        assert report['citations_included'] + report['section_limited'] == report['citations_total'] == 11
+
+    def test_other_sources_left_out(self):
+        context, report = build_budgeted_research_context("", make_citations(5), 10_000)
+
+        assert "example.com" not in context
+        assert report['section_limited'] == 5
+
+    def test_context_fits_budget_and_reports_drops(self):
+        """Best citations are kept, the rest are reported as dropped"""
+        citations = make_citations(3, agent='company_analysis')
+        full, _ = build_budgeted_research_context("", citations, 10_000)
+        tight_budget = count_tokens(full) - 5
+
+        context, report = build_budgeted_research_context("", citations, tight_budget)
+
+        assert count_tokens(context) <= tight_budget
+        assert "linkedin.com/in/janedoe" in context
+        assert len(report['dropped']) == 1
+        assert 'profile' not in {d['id'] for d in report['dropped']}
+
+    def test_snippets_only_use_leftover_budget(self):
+        """Opt-in snippets never displace a source line"""
+        citations = make_citations(3, agent='company_analysis')
+        titles, _ = build_budgeted_research_context("", citations, 10_000)
+        budget = count_tokens(titles) + 30
+
+        context, report = build_budgeted_research_context("", citations, budget, include_snippets=True)
+
+        assert count_tokens(context) <= budget
+        assert "Jane leads the data platform team" in context
+        assert report['citations_included'] == 4
+        assert report['dropped'] == []
+        assert len(report['snippets_trimmed']) == 3
+
+
+class TestPrepGuidePrompt:
+    """Test the complete prompt stays within the email budget"""
+
+    def test_email_body_truncated(self):
+        email = {'subject': 'Interview', 'body': "I'm Jane Doe from Acme. " + "Details follow. " * 2000}
+        research = {'citations_database': make_citations(2)}
+
+        prompt, report = build_prep_guide_prompt(email, {'company': 'Acme'}, research,
+                                                 email_tokens=200, context_tokens=1000)
+
+        assert report['email_truncated']
+        assert report['email_tokens'] <= 210
+        assert "I'm Jane Doe from Acme." in prompt
+        assert "[... email truncated ...]" in prompt
+        assert count_tokens(prompt) < 4000
@@ -0,0 +1,87 @@
+# tests/test_shared/test_prep_guide_streaming.py
+"""
+Tests for streaming prep guide generation
+
+Run from project root:
+python -m pytest tests/test_shared/test_prep_guide_streaming.py -v
+"""
+
+import os
+import sys
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import shared.openai_client as openai_client
+import shared.simple_cache as simple_cache
+import pipelines.enhanced_prep_guide_pipeline as prep_guide_module
+from pipelines.enhanced_prep_guide_pipeline import EnhancedPrepGuidePipeline
+from shared.simple_cache import SimpleCache, cached_openai_stream
+
+
+GUIDE_CHUNKS = [
+    "# interview prep requirements template\n\n## 1. before",
+    " interview\n- Confirm the time\n",
+    "\n## 2. interviewer background\n- Jane Doe",
+    " leads data engineering\n",
+    "\n## 3. company background\n- Acme builds rockets\n",
+]
+
+
+class TestPrepGuideStreaming:
+    """Test section-by-section file output and partial UI callbacks"""
+
+    def test_sections_written_as_they_complete(self, tmp_path, monkeypatch):
+        """Each finished section is on disk before the stream ends"""
+        monkeypatch.chdir(tmp_path)
+        snapshots = []
+        pushes = []
+
+        def fake_stream(**kwargs):
+            guide_file = tmp_path / "outputs" / "fullworkflow" / "Acme.txt"
+            for chunk in GUIDE_CHUNKS:
+                snapshots.append(guide_file.read_text() if guide_file.exists() else None)
+                yield chunk
+
+        monkeypatch.setattr(prep_guide_module, 'cached_openai_stream', fake_stream)
+        pipeline = EnhancedPrepGuidePipeline(stream_callback=lambda company, content: pushes.append((company, content)))
+        pipeline.STREAM_PUSH_INTERVAL = 0
+
+        content = pipeline._stream_prep_guide_content("prompt", 0.1, "Acme", 1)
+
+        assert content == ''.join(GUIDE_CHUNKS)
+        assert (tmp_path / "outputs" / "fullworkflow" / "Acme.txt").read_text() == content
+        # Section 1 reached the file once the section 2 heading arrived
+        assert snapshots[3].endswith("- Confirm the time\n")
+        assert "## 2." not in snapshots[3]
+        assert pushes[0] == ("Acme", GUIDE_CHUNKS[0])
+        assert pushes[-1] == ("Acme", content)
+
+    def test_streaming_failure_falls_back_to_blocking(self, tmp_path, monkeypatch):
+        """A stream error falls back to the regular cached completion"""
+        monkeypatch.chdir(tmp_path)
+
+        def broken_stream(**kwargs):
+            raise RuntimeError("connection reset")
+            yield
+
+        monkeypatch.setattr(prep_guide_module, 'cached_openai_stream', broken_stream)
+        monkeypatch.setattr(prep_guide_module, 'cached_openai_generate', lambda **kwargs: "full guide")
+
+        pipeline = EnhancedPrepGuidePipeline(stream=True)
+        assert pipeline._complete_prep_guide("prompt", 0.1, "Acme", 1) == "full guide"
+
+    def test_cached_openai_stream_caches_complete_response(self, tmp_path, monkeypatch):
+        """A streamed response is cached and replayed whole on the next call"""
+        monkeypatch.setattr(simple_cache, '_openai_cache', SimpleCache(str(tmp_path / "openai")))
+        calls = []
+
+        def fake_stream_text(prompt, model, **kwargs):
+            calls.append(prompt)
+            yield from GUIDE_CHUNKS
+
+        monkeypatch.setattr(openai_client, 'stream_text', fake_stream_text)
+
+        assert list(cached_openai_stream("prompt", model="gpt-4o", max_tokens=3000)) == GUIDE_CHUNKS
+        assert list(cached_openai_stream("prompt", model="gpt-4o", max_tokens=3000)) == [''.join(GUIDE_CHUNKS)]
+        assert len(calls) == 1
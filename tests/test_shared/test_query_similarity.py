@@ -0,0 +1,86 @@
+# tests/test_shared/test_query_similarity.py
+"""
+Tests for near-duplicate Tavily query matching
+
+Run from project root:
+python -m pytest tests/test_shared/test_query_similarity.py -v
+"""
+
+import os
+import sys
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from shared.query_similarity import QuerySimilarityIndex, normalize_query
+from shared.simple_cache import SimpleCache
+
+
+class TestQueryNormalization:
+    """Test query normalization"""
+
+    def test_case_quotes_stopwords_and_order(self):
+        assert normalize_query('"Acme" official website about') == normalize_query('Acme company website about')
+        assert normalize_query('website ACME') == normalize_query('acme website')
+
+    def test_operators_are_kept(self):
+        assert 'site:linkedin.com/in' in normalize_query('"Jane Doe" site:linkedin.com/in')
+
+
+class TestQuerySimilarityIndex:
+    """Test near-duplicate lookups"""
+
+    def test_normalized_match(self, tmp_path):
+        index = QuerySimilarityIndex(str(tmp_path / "queries.db"))
+        index.add('"Acme" official website about', 3)
+
+        matches = index.find_similar('Acme company website about', 3)
+
+        assert matches[0]['query'] == '"Acme" official website about'
+        assert matches[0]['similarity'] == 1.0
+
+    def test_fuzzy_match_allows_one_extra_token(self, tmp_path):
+        index = QuerySimilarityIndex(str(tmp_path / "queries.db"), threshold=0.75)
+        index.add('Acme internship program careers', 3)
+
+        assert index.find_similar('Acme internship program careers 2025', 3)
+        assert index.find_similar('Acme internship careers', 3)
+
+    def test_different_entity_never_matches(self, tmp_path):
+        index = QuerySimilarityIndex(str(tmp_path / "queries.db"), threshold=0.5)
+        index.add('Software Engineer job description requirements Acme', 3)
+
+        assert index.find_similar('Software Engineer job description requirements Globex', 3) == []
+
+    def test_smaller_cached_result_sets_do_not_qualify(self, tmp_path):
+        index = QuerySimilarityIndex(str(tmp_path / "queries.db"))
+        index.add('Acme website', 2)
+
+        assert index.find_similar('"Acme" website', 3) == []
+        assert index.find_similar('"Acme" website', 2)
+
+
+class TestNearDuplicateTavilySearch:
+    """Test near-duplicate reuse inside cached_tavily_search"""
+
+    def test_second_query_served_from_first(self, tmp_path, monkeypatch):
+        import shared.simple_cache as simple_cache
+        from shared.tavily_client import TavilySearchClient
+
+        monkeypatch.delenv('TAVILY_CACHE_SWR', raising=False)
+        monkeypatch.setattr(simple_cache, '_tavily_cache', SimpleCache(str(tmp_path / "tavily")))
+        monkeypatch.setattr(simple_cache, '_query_index', QuerySimilarityIndex(str(tmp_path / "queries.db")))
+        calls = []
+
+        def fake_fetch(self, query, max_results=5, search_depth=None, **kwargs):
+            calls.append(query)
+            return [{'title': f'result {i}'} for i in range(max_results)]
+
+        monkeypatch.setattr(TavilySearchClient, 'fetch', fake_fetch)
+
+        first = simple_cache.cached_tavily_search('"Acme" official website about', max_results=3)
+        second = simple_cache.cached_tavily_search('Acme company website about', max_results=2)
+
+        assert calls == ['"Acme" official website about']
+        assert second == first[:2]
+        assert simple_cache._query_index.stats['normalized_hits'] == 1
@@ -0,0 +1,196 @@
+# tests/test_shared/test_rate_limiter.py
+"""
+Tests for provider rate limiting, retries and circuit breakers (shared/rate_limiter.py)
+
+Run from project root:
+python -m pytest tests/test_shared/test_rate_limiter.py -v
+"""
+
+import os
+import sys
+import time
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from shared import rate_limiter
+from shared.rate_limiter import (
+    CircuitBreaker, CircuitOpenError, ProviderLimiter, RetryPolicy, TokenBucket,
+    get_provider_limiter, get_rate_limit_stats, reset_provider_limiters, retry_after_seconds
+)
+
+
+class APIError(Exception):
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers={'retry-after': retry_after} if retry_after else {})
+
+
+def flaky(errors, result="ok"):
+    """A call that raises each of `errors` in turn, then returns `result`"""
+    errors = list(errors)
+    calls = []
+
+    def call():
+        calls.append(time.monotonic())
+        if errors:
+            raise errors.pop(0)
+        return result
+
+    call.calls = calls
+    return call
+
+
+def fast_limiter(retries=3, threshold=5, reset_timeout=30.0):
+    return ProviderLimiter('test', retry=RetryPolicy(retries, base_delay=0.01, max_delay=0.05),
+                           breaker=CircuitBreaker('test', threshold, reset_timeout))
+
+
+class TestTokenBucket:
+    """Test the shared sync/async budget"""
+
+    def test_sync_threads_share_budget(self):
+        bucket = TokenBucket(requests_per_minute=600)  # 10/s, starts with 600
+        bucket._requests = 2
+
+        start = time.monotonic()
+        threads = [threading.Thread(target=bucket.acquire_sync) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert time.monotonic() - start >= 0.15
+        assert bucket.stats['acquired'] == 4
+        assert bucket.stats['throttled'] >= 1
+
+    def test_sync_and_async_share_budget(self):
+        bucket = TokenBucket(tokens_per_minute=6000)  # 100 tokens/s
+        bucket.acquire_sync(5950)
+
+        start = time.monotonic()
+        asyncio.run(bucket.acquire_async(70))
+        assert time.monotonic() - start >= 0.15
+
+
+class TestRetryPolicy:
+    """Test backoff and Retry-After"""
+
+    def test_retry_after_wins(self):
+        policy = RetryPolicy(base_delay=10, max_delay=60)
+        assert policy.delay(0, APIError(429, retry_after='2')) == 2.0
+        assert retry_after_seconds(APIError(429)) is None
+
+    def test_exponential_backoff_with_jitter(self, monkeypatch):
+        policy = RetryPolicy(base_delay=1, max_delay=5)
+        monkeypatch.setattr(rate_limiter.random, 'random', lambda: 1.0)
+        assert [policy.delay(n) for n in range(4)] == [1, 2, 4, 5]
+        monkeypatch.setattr(rate_limiter.random, 'random', lambda: 0.0)
+        assert policy.delay(1) == 1.0
+
+
+class TestProviderLimiter:
+    """Test retries and circuit breaking around sync and async calls"""
+
+    def test_transient_errors_retried(self):
+        limiter = fast_limiter()
+        call = flaky([APIError(503), ConnectionError("reset")])
+
+        assert limiter.call(call) == "ok"
+        assert len(call.calls) == 3
+        assert limiter.get_stats()['retries'] == 2
+
+    def test_client_errors_not_retried(self):
+        limiter = fast_limiter()
+        call = flaky([APIError(400)])
+
+        with pytest.raises(APIError):
+            limiter.call(call)
+        assert len(call.calls) == 1
+        assert limiter.breaker.state == 'closed'
+
+    def test_rate_limit_honours_retry_after(self):
+        limiter = fast_limiter()
+        call = flaky([APIError(429, retry_after='0.2')])
+
+        assert limiter.call(call) == "ok"
+        assert call.calls[1] - call.calls[0] >= 0.2
+        assert limiter.get_stats()['rate_limited'] == 1
+
+    def test_tavily_usage_limit_is_rate_limit(self):
+        """tavily-python reports a 429 as UsageLimitExceededError, without a status code"""
+        errors = pytest.importorskip('tavily.errors')
+        limiter = fast_limiter(threshold=1)
+        call = flaky([errors.UsageLimitExceededError("Rate limit exceeded")])
+
+        assert limiter.call(call) == "ok"
+        assert limiter.get_stats()['rate_limited'] == 1
+        assert limiter.breaker.state == 'closed'
+
+    def test_gives_up_after_max_retries(self):
+        limiter = fast_limiter(retries=1)
+        with pytest.raises(APIError):
+            limiter.call(flaky([APIError(500)] * 3))
+        assert limiter.get_stats()['failures'] == 1
+
+    def test_async_call(self):
+        limiter = fast_limiter()
+        errors = [APIError(502)]
+
+        async def call():
+            if errors:
+                raise errors.pop()
+            return "ok"
+
+        assert asyncio.run(limiter.acall(call)) == "ok"
+        assert limiter.get_stats()['retries'] == 1
+
+    def test_circuit_opens_and_recovers(self):
+        limiter = fast_limiter(retries=0, threshold=2, reset_timeout=0.1)
+        for _ in range(2):
+            with pytest.raises(APIError):
+                limiter.call(flaky([APIError(503)]))
+
+        with pytest.raises(CircuitOpenError):
+            limiter.call(lambda: "ok")
+
+        time.sleep(0.1)
+        assert limiter.call(lambda: "ok") == "ok"
+        stats = limiter.get_stats()
+        assert stats['circuit_state'] == 'closed'
+        assert stats['circuit_opened'] == 1 and stats['circuit_rejected'] == 1
+
+    def test_rate_limited_trial_does_not_wedge_circuit(self):
+        limiter = fast_limiter(retries=0, threshold=2, reset_timeout=0.1)
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                limiter.call(flaky([ConnectionError("down")]))
+
+        time.sleep(0.1)
+        with pytest.raises(APIError):
+            limiter.call(flaky([APIError(429)]))
+
+        assert limiter.breaker.state == 'closed'
+        assert limiter.call(lambda: "ok") == "ok"
+
+
+class TestProviderRegistry:
+    """Test per-provider limiters configured from the environment"""
+
+    def test_settings_from_env(self, monkeypatch):
+        monkeypatch.setenv('TAVILY_RPM_LIMIT', '120')
+        monkeypatch.setenv('TAVILY_RETRIES', '1')
+        reset_provider_limiters()
+
+        limiter = get_provider_limiter('tavily')
+        assert limiter is get_provider_limiter('tavily')
+        assert limiter.bucket.requests_per_minute == 120
+        assert limiter.retry.max_retries == 1
+        assert 'tavily' in get_rate_limit_stats()
+        reset_provider_limiters()
@@ -0,0 +1,147 @@
+# tests/test_shared/test_research_artifacts.py
+"""
+Tests for the research artifact store (shared/research_artifacts.py) and its
+use by the Deep Research Pipeline
+
+Run from project root:
+python -m pytest tests/test_shared/test_research_artifacts.py -v
+"""
+
+import os
+import sys
+import time
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import shared.research_artifacts as research_artifacts
+from pipelines.deep_research_pipeline import DeepResearchPipeline
+from shared.research_artifacts import ResearchArtifactStore, artifact_key, get_artifact_store
+from shared.tavily_client import TavilySearchClient
+
+from test_deep_research_pipeline import ENTITIES, fake_results
+
+
+ANALYSIS = {'success': True, 'confidence_score': 0.8, 'validated_sources': [{'source': {'title': 'Acme'}}],
+            'citations': [{'id': '1', 'source': 'Acme - https://acme.com'}]}
+
+
+class TestResearchArtifactStore:
+    """Test versioned, expiring per-entity storage"""
+
+    def test_round_trip(self, tmp_path):
+        store = ResearchArtifactStore(str(tmp_path / "artifacts.db"))
+        store.put('company', 'acme', ANALYSIS)
+
+        assert store.get('company', 'acme') == ANALYSIS
+        assert store.get('role', 'acme') is None
+        assert store.get_stats()['artifacts'] == {'company': {'total': 1, 'fresh': 1}}
+
+    def test_expired_artifacts_not_served(self, tmp_path, monkeypatch):
+        store = ResearchArtifactStore(str(tmp_path / "artifacts.db"), ttl_hours=1)
+        store.put('company', 'acme', ANALYSIS)
+
+        later = time.time() + 2 * 3600
+        monkeypatch.setattr(research_artifacts.time, 'time', lambda: later)
+        assert store.get('company', 'acme') is None
+        assert store.stats['stale'] == 1
+
+    def test_other_version_not_served(self, tmp_path, monkeypatch):
+        store = ResearchArtifactStore(str(tmp_path / "artifacts.db"))
+        store.put('company', 'acme', ANALYSIS)
+
+        monkeypatch.setattr(research_artifacts, 'ARTIFACT_VERSION', research_artifacts.ARTIFACT_VERSION + 1)
+        assert store.get('company', 'acme') is None
+
+    def test_keys_normalized_and_scoped_to_company(self):
+        assert artifact_key('company', ' Acme  Seeds') == artifact_key('company', 'acme seeds')
+        assert artifact_key('role', 'Acme', role='Data Engineer') == 'data engineer|acme'
+        assert artifact_key('interviewer', 'Acme', interviewer='Jane Doe') != artifact_key('interviewer', 'Globex', interviewer='Jane Doe')
+
+
+class TestArtifactReuse:
+    """Test that fresh company/role/interviewer analyses are reused independently"""
+
+    def searched_queries(self, monkeypatch):
+        searched = []
+
+        def fake_search(self, query, max_results=5, **kwargs):
+            searched.append(query)
+            return fake_results(query, max_results)
+
+        monkeypatch.setattr(TavilySearchClient, 'search', fake_search)
+        return searched
+
+    def test_only_new_dimension_researched(self, monkeypatch):
+        searched = self.searched_queries(monkeypatch)
+        first = DeepResearchPipeline(max_workers=1).conduct_deep_research(dict(ENTITIES), 1)
+        assert first['artifact_reuse'] == {'reused': [], 'saved': ['company', 'role', 'interviewer']}
+
+        searched.clear()
+        entities = dict(ENTITIES, interviewer='John Roe')
+        second = DeepResearchPipeline(max_workers=1).conduct_deep_research(entities, 2)
+
+        assert second['artifact_reuse'] == {'reused': ['company', 'role'], 'saved': ['interviewer']}
+        assert sorted(searched) == sorted(q for q, _ in DeepResearchPipeline.research_queries('Acme', '', 'John Roe', skip=('company',)))
+        assert second['research_data']['company_analysis']['reused_artifact']
+
+    def test_company_artifact_shared_across_emails(self, monkeypatch):
+        self.searched_queries(monkeypatch)
+        DeepResearchPipeline(max_workers=1).conduct_deep_research(dict(ENTITIES), 1)
+
+        # Another email about Acme: the stored company sources are re-scored for its keywords
+        entities = dict(ENTITIES, role='ML Engineer', interviewer='John Roe', email_content='Summer internship in machine learning')
+        second = DeepResearchPipeline(max_workers=1).conduct_deep_research(dict(entities), 2)
+        assert second['artifact_reuse'] == {'reused': ['company'], 'saved': ['role', 'interviewer']}
+
+        monkeypatch.setenv('RESEARCH_ARTIFACTS_ENABLED', 'false')
+        fresh = DeepResearchPipeline(max_workers=1).conduct_deep_research(dict(entities), 2)
+        reused_company = second['research_data']['company_analysis']
+        fresh_company = fresh['research_data']['company_analysis']
+        assert reused_company['validated_sources'] == fresh_company['validated_sources']
+        assert reused_company['confidence_score'] == fresh_company['confidence_score']
+        assert second['citations_database'] == fresh['citations_database']
+
+    def test_reused_citations_numbered_as_fresh_run(self, monkeypatch):
+        self.searched_queries(monkeypatch)
+        fresh = DeepResearchPipeline(max_workers=1).conduct_deep_research(dict(ENTITIES), 1)
+
+        # Reuse only the role analysis: its citations must follow the freshly researched company's
+        store = get_artifact_store()
+        store._conn.execute("DELETE FROM artifacts WHERE kind != 'role'")
+        store._conn.commit()
+        reused = DeepResearchPipeline(max_workers=1).conduct_deep_research(dict(ENTITIES), 2)
+
+        assert reused['artifact_reuse']['reused'] == ['role']
+        assert reused['citations_database'] == fresh['citations_database']
+        assert reused['overall_confidence'] == fresh['overall_confidence']
+
+    def test_analyses_without_sources_not_stored(self, monkeypatch):
+        monkeypatch.setattr(TavilySearchClient, 'search', lambda self, query, max_results=5, **kwargs: [])
+
+        result = DeepResearchPipeline(max_workers=1).conduct_deep_research(dict(ENTITIES), 1)
+
+        assert result['artifact_reuse']['saved'] == []
+        assert get_artifact_store().get_stats()['artifacts'] == {}
+
+    def test_run_plan_skips_stored_dimensions(self, monkeypatch):
+        searched = self.searched_queries(monkeypatch)
+        DeepResearchPipeline(max_workers=1).conduct_deep_research(dict(ENTITIES), 1)
+
+        searched.clear()
+        pipeline = DeepResearchPipeline(max_workers=4)
+        plan = pipeline.plan_run_research([dict(ENTITIES), dict(ENTITIES, interviewer='John Roe')])
+
+        assert plan['artifacts_reused'] == 5
+        assert plan['unique'] == len(searched) == len(DeepResearchPipeline.research_queries('', '', 'John Roe'))
+
+    def test_disabled_store(self, monkeypatch):
+        monkeypatch.setenv('RESEARCH_ARTIFACTS_ENABLED', 'false')
+        searched = self.searched_queries(monkeypatch)
+        DeepResearchPipeline(max_workers=1).conduct_deep_research(dict(ENTITIES), 1)
+        searched.clear()
+
+        result = DeepResearchPipeline(max_workers=1).conduct_deep_research(dict(ENTITIES), 2)
+
+        assert result['artifact_reuse'] == {'reused': [], 'saved': []}
+        assert len(searched) == len(DeepResearchPipeline.research_queries('Acme', 'Data Engineer', 'Jane Doe'))
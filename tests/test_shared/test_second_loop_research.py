@@ -0,0 +1,96 @@
+# tests/test_shared/test_second_loop_research.py
+"""
+Tests for the second loop's targeted searches (agents/research_engine/second_loop_research_engine.py)
+
+Run from project root:
+python -m pytest tests/test_shared/test_second_loop_research.py -v
+"""
+
+import os
+import sys
+import time
+import threading
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import agents.research_engine.second_loop_research_engine as second_loop
+from agents.research_engine.second_loop_research_engine import SecondLoopResearchEngine
+from shared.tavily_client import TavilySearchClient
+
+
+def targeted(query, gap_type='interview_questions'):
+    return {'query': query, 'gap_type': gap_type, 'priority': 'high', 'description': 'Missing interview questions'}
+
+
+def page(url):
+    return {'title': f'Acme interview questions {url}', 'url': url, 'content': 'Acme interview process and questions'}
+
+
+class TestTargetedSearches:
+    """Test concurrent, deduplicated second-loop searches"""
+
+    def engine(self, monkeypatch, pages, latency=0.0):
+        calls = {'queries': [], 'active': 0, 'peak': 0}
+        lock = threading.Lock()
+
+        def fake_search(self, query, max_results=5, **kwargs):
+            with lock:
+                calls['queries'].append(query)
+                calls['active'] += 1
+                calls['peak'] = max(calls['peak'], calls['active'])
+            time.sleep(latency)
+            with lock:
+                calls['active'] -= 1
+            return [page(url) for url in pages[query]]
+
+        monkeypatch.setattr(TavilySearchClient, 'search', fake_search)
+        monkeypatch.setattr(second_loop, 'get_openai_client', lambda: None)
+        return SecondLoopResearchEngine(), calls
+
+    def test_searches_run_concurrently(self, monkeypatch):
+        pages = {f'q{i}': [f'https://example.com/{i}'] for i in range(6)}
+        engine, calls = self.engine(monkeypatch, pages, latency=0.05)
+
+        results = engine._execute_intelligent_searches([targeted(q) for q in pages])
+
+        assert calls['peak'] > 1
+        assert [r['result']['url'] for r in results] == [f'https://example.com/{i}' for i in range(6)]
+
+    def test_cited_urls_skipped(self, monkeypatch):
+        pages = {'cited only': ['https://acme.com/about/'], 'mixed': ['https://ACME.com/about', 'https://example.com/new']}
+        engine, _ = self.engine(monkeypatch, pages)
+        citations = {'1': {'source': 'Acme - About - https://acme.com/about', 'agent': 'company_analysis'}}
+        stats = {}
+
+        results = engine._execute_intelligent_searches([targeted('cited only'), targeted('mixed')], citations, stats)
+
+        assert [r['result']['url'] for r in results] == ['https://example.com/new']
+        assert stats == {'searches': 2, 'skipped': 1, 'failed': 0}
+
+    def test_url_added_once_across_gaps(self, monkeypatch):
+        pages = {'questions': ['https://example.com/a'], 'culture': ['https://example.com/a'], 'again': ['https://example.com/a']}
+        engine, calls = self.engine(monkeypatch, pages)
+        stats = {}
+
+        results = engine._execute_intelligent_searches(
+            [targeted('questions'), targeted('questions', 'technical_skills'), targeted('culture', 'technical_skills'), targeted('again')],
+            {}, stats
+        )
+
+        assert sorted(calls['queries']) == ['again', 'culture', 'questions']
+        assert len(results) == 1 and results[0]['gap_type'] == 'interview_questions'
+        assert stats['skipped'] == 3
+
+    def test_no_new_urls_means_no_new_citations(self, monkeypatch):
+        engine, _ = self.engine(monkeypatch, {})
+        monkeypatch.setattr(engine, '_generate_targeted_search_queries', lambda gaps, entities: [targeted('cited')])
+        monkeypatch.setattr(TavilySearchClient, 'search', lambda self, query, max_results=5, **kwargs: [page('https://acme.com/about')])
+        research_data = {'research_quality': 'LOW', 'overall_confidence': 0.3,
+                         'citations_database': {'1': {'source': 'Acme - https://acme.com/about'}}}
+
+        result = engine.analyze_and_enhance_prep_guide("guide", {'company': 'Acme'}, research_data)
+
+        assert result['success']
+        assert result['additional_citations'] == [] and result['searches_skipped'] == 1
+        assert list(research_data['citations_database']) == ['1']
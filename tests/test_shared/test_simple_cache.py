@@ -0,0 +1,456 @@
+# tests/test_shared/test_simple_cache.py
+"""
+Tests for the Tavily/OpenAI cache backends in shared/simple_cache.py
+
+Run from project root:
+python -m pytest tests/test_shared/test_simple_cache.py -v
+"""
+
+import os
+import sys
+import json
+from datetime import datetime, timedelta
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from shared.simple_cache import SimpleCache, SQLiteCache
+
+
+class TestSQLiteCache:
+    """Test the SQLite cache store"""
+
+    def test_set_get_roundtrip(self, tmp_path):
+        """Values written with set() are returned by get()"""
+        cache = SQLiteCache(str(tmp_path / "cache.db"), "tavily", ttl_hours=24)
+        results = [{'title': 'Acme', 'url': 'https://acme.com', 'content': 'About Acme'}]
+
+        cache.set("tavily_acme_3", results)
+
+        assert cache.get("tavily_acme_3") == results
+        assert cache.get("tavily_missing_3") is None
+
+    def test_namespaces_are_isolated(self, tmp_path):
+        """Tavily and OpenAI entries share one file but not one keyspace"""
+        db_path = str(tmp_path / "cache.db")
+        tavily = SQLiteCache(db_path, "tavily")
+        openai = SQLiteCache(db_path, "openai")
+
+        tavily.set("same_key", ["tavily"])
+        openai.set("same_key", "openai")
+
+        assert tavily.get("same_key") == ["tavily"]
+        assert openai.get("same_key") == "openai"
+        assert tavily.clear() == 1
+        assert openai.get("same_key") == "openai"
+
+    def test_expired_entries_are_misses(self, tmp_path):
+        """Entries older than the TTL are not returned and count as expired"""
+        cache = SQLiteCache(str(tmp_path / "cache.db"), "tavily", ttl_hours=0)
+        cache.set("old", "value")
+
+        assert cache.get("old") is None
+        stats = cache.get_stats()
+        assert stats['total_files'] == 1
+        assert stats['expired_files'] == 1
+        assert stats['valid_files'] == 0
+
+    def test_import_json_dir(self, tmp_path):
+        """Existing SimpleCache JSON files are imported with their keys and timestamps"""
+        json_dir = tmp_path / "tavily"
+        legacy = SimpleCache(str(json_dir), ttl_hours=24)
+        legacy.set("tavily_acme_3", [{'title': 'Acme'}])
+
+        # An entry that is already past the TTL should stay expired after import
+        stale_file = json_dir / "stale.json"
+        stale_file.write_text(json.dumps({
+            'timestamp': (datetime.now() - timedelta(days=2)).isoformat(),
+            'content': 'stale'
+        }))
+
+        store = SQLiteCache(str(tmp_path / "cache.db"), "tavily", ttl_hours=24)
+        imported = store.import_json_dir(str(json_dir))
+
+        assert imported == 2
+        assert store.get("tavily_acme_3") == [{'title': 'Acme'}]
+        assert store.get_stats()['expired_files'] == 1
+
+
+class TestSimpleCacheIndex:
+    """Test the SimpleCache entry index"""
+
+    def test_stats_follow_set_delete_clear(self, tmp_path):
+        """The index is updated on every write path"""
+        cache = SimpleCache(str(tmp_path / "tavily"), ttl_hours=24)
+        cache.set("a", "first")
+        cache.set("b", "second")
+        assert cache.get_stats()['valid_files'] == 2
+
+        assert cache.delete("a") is True
+        assert cache.delete("a") is False
+        assert cache.get_stats()['total_files'] == 1
+
+        cache.clear()
+        assert cache.get_stats()['total_files'] == 0
+
+    def test_evict_expired_uses_index(self, tmp_path):
+        """Expired entries are swept and counted without touching fresh ones"""
+        cache_dir = tmp_path / "tavily"
+        cache = SimpleCache(str(cache_dir), ttl_hours=24)
+        cache.set("fresh", "value")
+        cache._index.upsert("stale", 10, 0.0)
+        (cache_dir / "stale.json").write_text("{}")
+
+        assert cache.get_stats()['expired_files'] == 1
+        assert cache.evict_expired() == 1
+        assert not (cache_dir / "stale.json").exists()
+        assert cache.get("fresh") == "value"
+
+    def test_legacy_directory_is_indexed_on_open(self, tmp_path):
+        """A cache directory written without an index is scanned once"""
+        cache_dir = tmp_path / "openai"
+        cache_dir.mkdir()
+        (cache_dir / "legacy.json").write_text(json.dumps({
+            'timestamp': datetime.now().isoformat(),
+            'content': 'cached'
+        }))
+
+        stats = SimpleCache(str(cache_dir), ttl_hours=24).get_stats()
+
+        assert stats['total_files'] == 1
+        assert stats['valid_files'] == 1
+
+
+class TestCacheQuotas:
+    """Test size budgets, eviction policies and usage counters"""
+
+    def test_lru_evicts_least_recently_used(self, tmp_path):
+        """With an entry budget, the entry not read recently is evicted"""
+        cache = SimpleCache(str(tmp_path / "tavily"), max_entries=2, eviction_policy='lru')
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+        assert cache.get_stats()['evictions'] == 1
+
+    def test_lfu_evicts_least_frequently_used(self, tmp_path):
+        """LFU keeps the most-read entry even if it was not read last"""
+        cache = SQLiteCache(str(tmp_path / "cache.db"), "openai", max_entries=2, eviction_policy='lfu')
+        cache.set("a", 1)
+        cache.set("b", 2)
+        for _ in range(3):
+            cache.get("a")
+        cache.get("b")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get_stats()['evictions'] == 1
+
+    def test_quota_uses_running_totals(self, tmp_path):
+        """Writes after the first quota check do not rescan the table"""
+        cache = SQLiteCache(str(tmp_path / "cache.db"), "tavily", max_entries=3)
+        statements = []
+        cache._conn.set_trace_callback(statements.append)
+        for i in range(6):
+            cache.set(f"key{i}", i)
+
+        assert sum("COUNT(*)" in statement for statement in statements) == 1
+        stats = cache.get_stats()
+        assert stats['total_files'] == 3
+        assert stats['evictions'] == 3
+
+    def test_totals_recounted_after_external_write(self, tmp_path):
+        """Entries written by another process still count against the budget"""
+        cache_dir = str(tmp_path / "tavily")
+        cache = SimpleCache(cache_dir, max_entries=2)
+        cache.set("a", 1)
+
+        other = SimpleCache(cache_dir)
+        other.set("b", 2)
+        other.set("c", 3)
+        cache.set("d", 4)
+
+        assert cache.get_stats()['total_files'] == 2
+        assert cache.get("d") == 4
+
+    def test_byte_budget(self, tmp_path):
+        """Entries are evicted until the byte budget is met"""
+        cache = SimpleCache(str(tmp_path / "openai"), max_size_mb=0.001)
+        for i in range(5):
+            cache.set(f"key{i}", "x" * 400)
+
+        stats = cache.get_stats()
+        assert stats['total_size_mb'] <= 0.001
+        assert stats['evictions'] >= 1
+        assert cache.get("key4") == "x" * 400
+
+    def test_hit_miss_counters(self, tmp_path):
+        """Counters are batched in memory, persisted in the index on flush and reported by get_stats"""
+        cache_dir = str(tmp_path / "tavily")
+        cache = SimpleCache(cache_dir)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("missing")
+
+        assert SimpleCache(cache_dir).get_stats()['hits'] == 0
+        assert cache.get_stats()['hits'] == 1
+        cache.close()
+
+        stats = SimpleCache(cache_dir).get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['hit_rate'] == 0.5
+
+    def test_sqlite_counters_batched(self, tmp_path):
+        db_path = str(tmp_path / "cache.db")
+        cache = SQLiteCache(db_path, "tavily")
+        cache.set("a", 1)
+        for _ in range(3):
+            cache.get("a")
+
+        assert SQLiteCache(db_path, "tavily").get_stats()['hits'] == 0
+        cache.flush()
+        assert SQLiteCache(db_path, "tavily").get_stats()['hits'] == 3
+
+
+class TestSingleFlight:
+    """Test coalescing of concurrent identical calls"""
+
+    def test_threads_share_one_execution(self):
+        """Concurrent threads with the same key trigger a single call"""
+        import threading
+        import time
+        from shared.simple_cache import SingleFlight
+
+        flight = SingleFlight("test")
+        calls = []
+        results = []
+
+        def slow_call():
+            calls.append(1)
+            time.sleep(0.2)
+            return ["result"]
+
+        threads = [threading.Thread(target=lambda: results.append(flight.do("q", slow_call))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [["result"]] * 5
+        assert flight.stats == {'executions': 1, 'coalesced': 4}
+
+    def test_asyncio_tasks_share_one_execution(self):
+        """Concurrent coroutines with the same key await a single call"""
+        import asyncio
+        from shared.simple_cache import SingleFlight
+
+        flight = SingleFlight("test")
+        calls = []
+
+        async def slow_call():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "response"
+
+        async def run():
+            return await asyncio.gather(*(flight.do_async("prompt", slow_call) for _ in range(3)))
+
+        assert asyncio.run(run()) == ["response"] * 3
+        assert len(calls) == 1
+        assert flight.stats['coalesced'] == 2
+
+    def test_errors_reach_every_waiter(self):
+        """A failing leader raises the same error in all coalesced callers"""
+        import pytest
+        from shared.simple_cache import SingleFlight
+
+        flight = SingleFlight("test")
+
+        def failing_call():
+            raise RuntimeError("rate limited")
+
+        with pytest.raises(RuntimeError):
+            flight.do("q", failing_call)
+        # The failed call is not left in flight
+        assert flight.do("q", lambda: "ok") == "ok"
+
+
+class TestStaleWhileRevalidate:
+    """Test soft/hard TTL handling in cached_tavily_search"""
+
+    def _stale_cache(self, tmp_path, monkeypatch):
+        """Tavily cache holding one entry older than the soft TTL"""
+        import time
+        import shared.simple_cache as simple_cache
+
+        monkeypatch.setenv('TAVILY_NEAR_DUPLICATE_CACHE', 'false')
+        monkeypatch.setenv('TAVILY_CACHE_SWR', 'true')
+        monkeypatch.setenv('TAVILY_CACHE_SOFT_TTL_HOURS', '1')
+        monkeypatch.setenv('TAVILY_CACHE_HARD_TTL_HOURS', '48')
+        cache = SimpleCache(str(tmp_path / "tavily"), ttl_hours=48)
+        monkeypatch.setattr(simple_cache, '_tavily_cache', cache)
+
+        cache.set("tavily_acme_3", [{'title': 'old'}])
+        key = cache._get_cache_key("tavily_acme_3")
+        entry_file = cache._get_cache_file(key)
+        data = json.loads(entry_file.read_text())
+        data['timestamp'] = (datetime.now() - timedelta(hours=5)).isoformat()
+        entry_file.write_text(json.dumps(data))
+        return cache
+
+    def test_stale_entry_served_and_refreshed(self, tmp_path, monkeypatch):
+        """A stale entry is returned immediately and replaced in the background"""
+        import shared.simple_cache as simple_cache
+        from shared.tavily_client import TavilySearchClient
+
+        cache = self._stale_cache(tmp_path, monkeypatch)
+        monkeypatch.setattr(TavilySearchClient, 'fetch', lambda self, query, max_results=5, search_depth=None, **kwargs: [{'title': 'new'}])
+
+        assert simple_cache.cached_tavily_search("acme", max_results=3) == [{'title': 'old'}]
+        simple_cache._swr_executor.shutdown(wait=True)
+        simple_cache._swr_executor = None
+
+        content, age = cache.get_entry("tavily_acme_3")
+        assert content == [{'title': 'new'}]
+        assert age < 60
+
+    def test_failed_refresh_keeps_stale_entry(self, tmp_path, monkeypatch):
+        """An empty refresh result does not overwrite the stale entry"""
+        import shared.simple_cache as simple_cache
+        from shared.tavily_client import TavilySearchClient
+
+        cache = self._stale_cache(tmp_path, monkeypatch)
+        monkeypatch.setattr(TavilySearchClient, 'fetch', lambda self, query, max_results=5, search_depth=None, **kwargs: [])
+
+        simple_cache.cached_tavily_search("acme", max_results=3)
+        simple_cache._swr_executor.shutdown(wait=True)
+        simple_cache._swr_executor = None
+
+        assert cache.get("tavily_acme_3") == [{'title': 'old'}]
+
+    def test_per_call_opt_in_with_swr_off_by_default(self, monkeypatch):
+        """Entries outlive the soft TTL even when SWR is off, so a search can still opt in"""
+        import shared.simple_cache as simple_cache
+        from shared.tavily_client import TavilySearchClient
+
+        monkeypatch.setenv('TAVILY_NEAR_DUPLICATE_CACHE', 'false')
+        monkeypatch.setenv('TAVILY_CACHE_SWR', 'false')
+        monkeypatch.setenv('TAVILY_CACHE_SOFT_TTL_HOURS', '1')
+        monkeypatch.setenv('TAVILY_CACHE_HARD_TTL_HOURS', '48')
+        cache = simple_cache.get_tavily_cache()
+        assert cache.ttl_hours == 48
+
+        cache.set("tavily_acme_3", [{'title': 'old'}])
+        entry_file = cache._get_cache_file(cache._get_cache_key("tavily_acme_3"))
+        data = json.loads(entry_file.read_text())
+        data['timestamp'] = (datetime.now() - timedelta(hours=5)).isoformat()
+        entry_file.write_text(json.dumps(data))
+        monkeypatch.setattr(TavilySearchClient, 'fetch', lambda self, query, max_results=5, search_depth=None, **kwargs: [{'title': 'new'}])
+
+        assert simple_cache.cached_tavily_search("acme", max_results=3, stale_while_revalidate=True) == [{'title': 'old'}]
+        simple_cache._swr_executor.shutdown(wait=True)
+        simple_cache._swr_executor = None
+        assert cache.get("tavily_acme_3") == [{'title': 'new'}]
+
+
+class TestPayloadCodecs:
+    """Test compressed payloads and transparent legacy reads"""
+
+    def test_compressed_roundtrip(self, tmp_path):
+        """Entries written with zlib are smaller and read back unchanged"""
+        content = [{'title': 'Acme', 'content': 'Acme builds rockets. ' * 200}]
+        plain = SimpleCache(str(tmp_path / "plain"), codec='json')
+        packed = SimpleCache(str(tmp_path / "packed"), codec='zlib')
+        plain.set("q", content)
+        packed.set("q", content)
+
+        assert packed.get("q") == content
+        assert packed.get_stats()['total_size_mb'] * 5 < plain.get_stats()['total_size_mb']
+
+    def test_legacy_files_readable_after_codec_change(self, tmp_path):
+        """A cache switched to zlib still reads pretty-printed JSON entries"""
+        cache_dir = str(tmp_path / "tavily")
+        SimpleCache(cache_dir, codec='json').set("legacy", {'a': 1})
+
+        cache = SimpleCache(cache_dir, codec='zlib')
+        cache.set("new", {'b': 2})
+
+        assert cache.get("legacy") == {'a': 1}
+        assert cache.get("new") == {'b': 2}
+
+    def test_recompress(self, tmp_path):
+        """recompress() rewrites files in place and keeps them readable"""
+        cache = SimpleCache(str(tmp_path / "openai"), codec='json')
+        cache.set("guide", "Prep guide section. " * 500)
+
+        result = cache.recompress('zlib')
+
+        assert result['rewritten'] == 1
+        assert result['bytes_after'] < result['bytes_before']
+        assert cache.get("guide") == "Prep guide section. " * 500
+        assert cache.get_stats()['total_size_mb'] * 1024 * 1024 == result['bytes_after']
+
+
+class TestAtomicWrites:
+    """Test crash-safe writes and corrupt entry handling"""
+
+    def test_write_leaves_no_temp_files(self, tmp_path):
+        """Writes go through a temp file that is renamed into place"""
+        cache = SimpleCache(str(tmp_path / "tavily"))
+        cache.set("q", [{'title': 'Acme'}])
+        cache.set("q", [{'title': 'Acme v2'}])
+
+        assert cache.get("q") == [{'title': 'Acme v2'}]
+        assert list((tmp_path / "tavily").glob(".*.tmp")) == []
+
+    def test_corrupt_entry_counted_and_removed(self, tmp_path):
+        """A truncated file is a miss, counted as corrupt, and replaced by the next write"""
+        cache = SimpleCache(str(tmp_path / "tavily"))
+        cache.set("q", {'a': 1})
+        file_path = cache._get_cache_file(cache._get_cache_key("q"))
+        file_path.write_bytes(file_path.read_bytes()[:10])
+
+        assert cache.get("q") is None
+        assert not file_path.exists()
+        stats = cache.get_stats()
+        assert stats['corrupt_entries'] == 1
+        assert stats['total_files'] == 0
+
+        cache.set("q", {'a': 2})
+        assert cache.get("q") == {'a': 2}
+
+    def test_concurrent_writers(self, tmp_path):
+        """Parallel writers to the same key always leave a complete entry"""
+        import threading
+
+        cache = SimpleCache(str(tmp_path / "tavily"), codec='zlib')
+        payloads = [{'writer': i, 'body': 'x' * 20000} for i in range(8)]
+
+        threads = [threading.Thread(target=cache.set, args=("q", p)) for p in payloads]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert cache.get("q") in payloads
+        assert cache.get_stats()['corrupt_entries'] == 0
+
+    def test_stale_temp_files_cleaned(self, tmp_path):
+        """Temp files left by a crashed writer are removed by evict_expired()"""
+        import time
+
+        cache = SimpleCache(str(tmp_path / "tavily"))
+        leftover = tmp_path / "tavily" / ".deadbeef.abc.tmp"
+        leftover.write_bytes(b'{"timest')
+        old = time.time() - 2 * SimpleCache.STALE_TEMP_SECONDS
+        os.utime(leftover, (old, old))
+
+        cache.evict_expired()
+        assert not leftover.exists()
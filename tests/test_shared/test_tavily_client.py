@@ -0,0 +1,145 @@
+# tests/test_shared/test_tavily_client.py
+"""
+Tests for the shared Tavily search client (shared/tavily_client.py)
+
+Run from project root:
+python -m pytest tests/test_shared/test_tavily_client.py -v
+"""
+
+import os
+import sys
+import asyncio
+
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import shared.simple_cache as simple_cache
+from shared.simple_cache import SimpleCache
+from shared.rate_limiter import reset_provider_limiters
+from shared.tavily_client import (
+    TavilyConfigError, TavilyError, TavilySearchClient, get_search_client, reset_search_client
+)
+
+
+class FakeTavilyClient:
+    """Stand-in for tavily.TavilyClient that records its session and searches"""
+
+    instances = []
+
+    def __init__(self, api_key, session=None):
+        self.session = session
+        self.queries = []
+        self.domain_filters = []
+        FakeTavilyClient.instances.append(self)
+
+    def search(self, query, **kwargs):
+        if 'fail' in query:
+            raise ConnectionError("boom")
+        self.queries.append((query, kwargs['max_results'], kwargs['search_depth']))
+        self.domain_filters.append((kwargs.get('include_domains'), kwargs.get('exclude_domains')))
+        return {'results': [{'title': query, 'url': f'https://example.com/{i}'} for i in range(kwargs['max_results'])]}
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def fake_tavily(monkeypatch, tmp_path):
+    """Fake Tavily SDK, temporary cache, telemetry off"""
+    import tavily
+
+    FakeTavilyClient.instances = []
+    monkeypatch.setattr(tavily, 'TavilyClient', FakeTavilyClient)
+    monkeypatch.setenv('TAVILY_API_KEY', 'tvly-test')
+    monkeypatch.setenv('TELEMETRY_ENABLED', 'false')
+    monkeypatch.setenv('TAVILY_NEAR_DUPLICATE_CACHE', 'false')
+    monkeypatch.delenv('TAVILY_CACHE_SWR', raising=False)
+    monkeypatch.setenv('TAVILY_RETRIES', '0')
+    monkeypatch.setattr(simple_cache, '_tavily_cache', SimpleCache(str(tmp_path / "tavily")))
+    reset_search_client()
+    reset_provider_limiters()
+    yield
+    reset_search_client()
+    reset_provider_limiters()
+
+
+class TestTavilySearchClient:
+    """Test pooling, caching and error semantics"""
+
+    def test_one_pooled_session_per_process(self, fake_tavily):
+        client = get_search_client()
+        client.search("acme", max_results=2)
+        client.search("globex", max_results=2)
+
+        assert get_search_client() is client
+        assert len(FakeTavilyClient.instances) == 1
+        assert FakeTavilyClient.instances[0].session is not None
+
+    def test_cached_searches_hit_api_once(self, fake_tavily):
+        client = get_search_client()
+        first = client.search("acme", max_results=2)
+
+        assert client.search("acme", max_results=2) == first
+        assert FakeTavilyClient.instances[0].queries == [("acme", 2, "advanced")]
+
+    def test_search_depth_cached_separately(self, fake_tavily):
+        client = get_search_client()
+        client.search("acme", max_results=2)
+        client.search("acme", max_results=2, search_depth="basic")
+
+        assert [q[2] for q in FakeTavilyClient.instances[0].queries] == ["advanced", "basic"]
+
+    def test_domain_filter_only_when_requested(self, fake_tavily):
+        """Searches are unfiltered by default; a filtered search is cached separately"""
+        from agents.research_engine.tavily_client import EXCLUDE_DOMAINS, INCLUDE_DOMAINS, search_tavily
+
+        client = get_search_client()
+        client.search("acme", max_results=2)
+        search_tavily("acme", max_results=2)
+        search_tavily("acme", max_results=2)
+
+        assert FakeTavilyClient.instances[0].domain_filters == [(None, None), (INCLUDE_DOMAINS, EXCLUDE_DOMAINS)]
+
+    def test_errors_raise_and_are_not_cached(self, fake_tavily):
+        client = get_search_client()
+        with pytest.raises(TavilyError):
+            client.search("fail acme")
+
+        assert simple_cache.get_tavily_cache().get("tavily_fail acme_5") is None
+        assert simple_cache.cached_tavily_search("fail acme") == []
+
+    def test_missing_key(self, fake_tavily, monkeypatch):
+        monkeypatch.delenv('TAVILY_API_KEY')
+        reset_search_client()
+
+        with pytest.raises(TavilyConfigError):
+            get_search_client().search("acme", use_cache=False)
+
+
+class TestSearchMany:
+    """Test parallel sync and async searches"""
+
+    def test_results_in_query_order(self, fake_tavily):
+        client = TavilySearchClient(cache=None)
+        results = client.search_many(["a", ("b", 3), "c"], max_results=1)
+
+        assert [len(r) for r in results] == [1, 3, 1]
+        assert [r[0]['title'] for r in results] == ["a", "b", "c"]
+
+    def test_return_exceptions(self, fake_tavily):
+        client = TavilySearchClient(cache=None)
+
+        with pytest.raises(TavilyError):
+            client.search_many(["a", "fail b"])
+
+        results = client.search_many(["a", "fail b"], return_exceptions=True)
+        assert results[0][0]['title'] == "a"
+        assert isinstance(results[1], TavilyError)
+
+    def test_async_search_many(self, fake_tavily):
+        client = TavilySearchClient(cache=None)
+
+        results = asyncio.run(client.asearch_many(["a", ("b", 2)], max_results=1, max_concurrency=2))
+        assert [len(r) for r in results] == [1, 2]
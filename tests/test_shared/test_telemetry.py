@@ -0,0 +1,128 @@
+# tests/test_shared/test_telemetry.py
+"""
+Tests for token, cost and latency telemetry (shared/telemetry.py)
+
+Run from project root:
+python -m pytest tests/test_shared/test_telemetry.py -v
+"""
+
+import os
+import sys
+import contextvars
+from types import SimpleNamespace
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import shared.telemetry as telemetry
+from shared.telemetry import (
+    TelemetrySink, _percentile, estimate_cost, set_telemetry_context, usage_tokens
+)
+
+
+class TestTelemetrySink:
+    """Test recording calls and summarizing them by stage"""
+
+    def test_report_groups_by_stage(self, tmp_path):
+        """Misses count as spend, hits as savings, each under the active stage"""
+        sink = TelemetrySink(str(tmp_path / "telemetry.db"))
+
+        def run():
+            set_telemetry_context(stage='deep_research', email_index=2)
+            sink.record('tavily', 'search_tavily', 1.2, model='tavily', cost_usd=0.008)
+            sink.record('tavily', 'cached_tavily_search', 0.01, model='tavily', cache_hit=True, cost_usd=0.008)
+            set_telemetry_context(stage='prep_guide', email_index=2)
+            sink.record('llm', 'generate_completion', 3.0, model='gpt-4o', prompt_tokens=1000,
+                        completion_tokens=500, cost_usd=estimate_cost('gpt-4o', 1000, 500))
+
+        contextvars.copy_context().run(run)
+        report = sink.report()
+
+        research = report['stages']['deep_research']
+        assert research['calls'] == 2
+        assert research['cache_hits'] == 1
+        assert research['tavily_searches'] == 1
+        assert research['hit_rate'] == 0.5
+        assert research['saved_usd'] == 0.008
+
+        guide = report['stages']['prep_guide']
+        assert guide['prompt_tokens'] == 1000
+        assert guide['completion_tokens'] == 500
+        assert abs(guide['cost_usd'] - 0.0075) < 1e-9
+        assert report['saved_usd_by_kind'] == {'tavily': 0.008}
+        assert {row['email_index'] for row in sink.rows()} == {2}
+
+    def test_latency_table_splits_api_and_cache(self, tmp_path):
+        """p50/p95 are reported separately for API calls and cache hits"""
+        sink = TelemetrySink(str(tmp_path / "telemetry.db"))
+        for latency in range(1, 21):
+            sink.record('llm', 'call_llm', float(latency), model='gpt-4o-mini')
+        sink.record('llm', 'call_llm', 0.001, model='gpt-4o-mini', cache_hit=True)
+
+        rows = {row['source']: row for row in sink.report()['latency']}
+
+        assert rows['api']['calls'] == 20
+        assert rows['api']['p50'] == 10.0
+        assert rows['api']['p95'] == 19.0
+        assert rows['cache']['calls'] == 1
+        assert sink.report()['stages']['unattributed']['calls'] == 21
+
+    def test_records_buffered_until_flush(self, tmp_path):
+        """Records reach the database in batches, and always before it is read"""
+        db_path = tmp_path / "telemetry.db"
+        sink = TelemetrySink(str(db_path))
+        other = TelemetrySink(str(db_path))
+
+        for _ in range(TelemetrySink.FLUSH_EVERY - 1):
+            sink.record('tavily', 'cached_tavily_search', 0.01, model='tavily', cache_hit=True)
+        assert other.rows() == []
+
+        sink.record('tavily', 'cached_tavily_search', 0.01, model='tavily', cache_hit=True)
+        assert len(other.rows()) == TelemetrySink.FLUSH_EVERY
+
+        sink.record('llm', 'call_llm', 1.0, model='gpt-4o')
+        assert sink.report()['total_calls'] == TelemetrySink.FLUSH_EVERY + 1
+        sink.record('llm', 'call_llm', 1.0, model='gpt-4o')
+        sink.close()
+        assert len(other.rows()) == TelemetrySink.FLUSH_EVERY + 2
+        other.close()
+
+    def test_default_sink_under_cache_dir(self, tmp_path, monkeypatch):
+        """Without TELEMETRY_DB_PATH the sink lives under CACHE_DIR like every other store"""
+        monkeypatch.setenv('CACHE_DIR', str(tmp_path / "elsewhere"))
+        telemetry.reset_telemetry_sink()
+
+        assert telemetry.get_telemetry_sink().db_path == tmp_path / "elsewhere" / "telemetry.db"
+
+    def test_recording_disabled(self, tmp_path, monkeypatch):
+        """TELEMETRY_ENABLED=false records nothing"""
+        sink = TelemetrySink(str(tmp_path / "telemetry.db"))
+        monkeypatch.setattr(telemetry, '_sink', sink)
+        monkeypatch.setenv('TELEMETRY_ENABLED', 'false')
+
+        telemetry.record_llm_call('call_llm', 'gpt-4o', 10, 10, 0.5)
+        telemetry.record_tavily_call('search_tavily', 0.5)
+
+        assert sink.rows() == []
+
+
+class TestTelemetryHelpers:
+    """Test cost estimates, percentiles and token extraction"""
+
+    def test_estimate_cost_uses_model_prefix(self):
+        assert estimate_cost('gpt-4o-mini-2024-07-18', 1_000_000, 0) == 0.15
+        assert estimate_cost('gpt-4', 0, 1_000_000) == 60.0
+        assert estimate_cost('unknown-model', 1000, 1000) == 0.0
+
+    def test_percentile_nearest_rank(self):
+        assert _percentile([], 95) == 0.0
+        assert _percentile([3.0], 50) == 3.0
+        assert _percentile([4.0, 1.0, 3.0, 2.0], 50) == 2.0
+        assert _percentile([4.0, 1.0, 3.0, 2.0], 95) == 4.0
+
+    def test_usage_tokens_prefers_reported_usage(self):
+        response = SimpleNamespace(usage=SimpleNamespace(prompt_tokens=12, completion_tokens=34))
+        assert usage_tokens(response, 'prompt', 'completion', 'gpt-4o') == (12, 34)
+
+        prompt_tokens, completion_tokens = usage_tokens(None, 'hello world', 'hi', 'gpt-4o')
+        assert prompt_tokens > 0 and completion_tokens > 0
@@ -0,0 +1,75 @@
+# tests/test_shared/test_term_matcher.py
+"""
+Tests for the vocabulary matcher used by source validation (shared/term_matcher.py)
+
+Run from project root:
+python -m pytest tests/test_shared/test_term_matcher.py -v
+"""
+
+import os
+import sys
+import random
+
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+import shared.term_matcher as term_matcher
+from shared.term_matcher import TermMatcher, compile_terms
+
+
+def random_case(rng):
+    """Small alphabet so terms overlap, nest and repeat"""
+    alphabet = 'ab c\x00'
+    terms = [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 4))) for _ in range(rng.randint(1, 40))]
+    texts = [''.join(rng.choice(alphabet[:-1]) for _ in range(rng.randint(0, 30))) for _ in range(2)]
+    return terms, texts
+
+
+@pytest.fixture(params=['scan', 'automaton'])
+def matcher_mode(request, monkeypatch):
+    """Run each test with str.__contains__ and, if installed, the Aho-Corasick automaton"""
+    if request.param == 'automaton':
+        if term_matcher.ahocorasick is None:
+            pytest.skip("pyahocorasick not installed")
+        monkeypatch.setattr(term_matcher, 'AUTOMATON_MIN_TERMS', 1)
+    else:
+        monkeypatch.setattr(term_matcher, 'ahocorasick', None)
+    return request.param
+
+
+class TestTermMatcher:
+    """Test that matching is exactly the `in` operator"""
+
+    def test_find_matches_in_operator(self, matcher_mode):
+        rng = random.Random(7)
+        for _ in range(2000):
+            terms, (text, _) = random_case(rng)
+            assert TermMatcher(terms).find(text) == {t for t in terms if t in text}
+
+    def test_find_any_matches_title_or_content(self, matcher_mode):
+        rng = random.Random(11)
+        for _ in range(2000):
+            terms, (title, content) = random_case(rng)
+            expected = {t for t in terms if t in title or t in content}
+            assert TermMatcher(terms).find_any(title, content) == expected
+
+    def test_overlapping_and_nested_terms(self, matcher_mode):
+        matcher = TermMatcher(['inc', 'corp', 'corporation', 'ai', ''])
+        assert matcher.find('incorporation') == {'inc', 'corp', 'corporation', ''}
+        assert matcher.find('') == {''}
+        assert matcher.find_any('acme in', 'c') == {''}
+
+    def test_batch_scans_repeated_documents_once(self, monkeypatch):
+        matcher = TermMatcher(['acme', 'data'])
+        scans = []
+        find_any = matcher.find_any
+        monkeypatch.setattr(matcher, 'find_any', lambda *texts: scans.append(texts) or find_any(*texts))
+
+        found = matcher.find_any_many([('acme', 'x'), ('data', ''), ('acme', 'x')])
+        assert found == [{'acme'}, {'data'}, {'acme'}]
+        assert len(scans) == 2
+
+    def test_compiled_matchers_cached(self):
+        assert compile_terms(['a', 'b'], ['c']) is compile_terms(['c', 'b'], ['a'])
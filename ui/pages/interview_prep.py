@@ -188,13 +188,22 @@ def generate_prep_guide():
         return
         
     try:
+        # Live preview of the prep guide currently being generated
+        live_preview = st.empty()
+        
+        def show_partial_guide(company: str, content: str):
+            with live_preview.container():
+                st.markdown(f"#### ✍️ Generating prep guide for {company}...")
+                st.markdown(content)
+        
         with st.spinner("🔄 Generating interview prep guides..."):
-            # Initialize workflow
-            workflow = InterviewPrepWorkflow()
+            # Initialize workflow (streams partial guides into the live preview)
+            workflow = InterviewPrepWorkflow(stream_callback=show_partial_guide)
             
             # Run workflow with folder parameter
             folder = st.session_state.interview_folder if st.session_state.interview_folder else None
             results = workflow.run_workflow(folder=folder)
+            live_preview.empty()
             
             if results and results.get('success') and results.get('individual_results'):
                 # Extract prep guides from individual results
@@ -15,14 +15,22 @@ Usage:
     python workflows/cache_manager.py --clear-openai   # Clear AI cache (recommended for testing)
     python workflows/cache_manager.py --clear-all      # Clear everything
     python workflows/cache_manager.py --info           # Detailed information
+    python workflows/cache_manager.py --migrate-sqlite # Import JSON caches into cache/cache.db
+    python workflows/cache_manager.py --clear-company "Acme"  # Drop cached LLM responses for one company
+    python workflows/cache_manager.py --recompress     # Rewrite cache files with a compressed codec
+    python workflows/cache_manager.py --warm           # Prefetch research for upcoming interviews
+    python workflows/cache_manager.py --report         # Token, cost and latency report by pipeline stage
 """
 
 import os
 import sys
+import time
 import argparse
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -42,6 +50,14 @@ def get_tavily_cache_info() -> Dict[str, Any]:
             'expired_files': stats.get('expired_files', 0),
             'cache_size_mb': stats.get('total_size_mb', 0),
             'cache_directory': stats.get('cache_dir', 'cache/tavily'),
+            'hits': stats.get('hits', 0),
+            'misses': stats.get('misses', 0),
+            'evictions': stats.get('evictions', 0),
+            'corrupt_entries': stats.get('corrupt_entries', 0),
+            'hit_rate': stats.get('hit_rate', 0.0),
+            'max_size_mb': stats.get('max_size_mb'),
+            'max_entries': stats.get('max_entries'),
+            'eviction_policy': stats.get('eviction_policy', 'lru'),
             'message': f"Tavily cache contains {stats.get('valid_files', 0)} queries ({stats.get('total_size_mb', 0):.2f} MB)"
         }
         
@@ -56,6 +72,16 @@ def get_tavily_cache_info() -> Dict[str, Any]:
         }
 
 
+def _estimated_llm_savings() -> float:
+    """USD of LLM calls avoided by cache hits, from the telemetry sink"""
+    try:
+        from shared.telemetry import get_telemetry_sink
+        
+        return get_telemetry_sink().report()['saved_usd_by_kind'].get('llm', 0.0)
+    except Exception:
+        return 0.0
+
+
 def get_openai_cache_info() -> Dict[str, Any]:
     """Get information about the current OpenAI cache"""
     try:
@@ -66,10 +92,19 @@ def get_openai_cache_info() -> Dict[str, Any]:
         
         return {
             'cache_exists': True,
+            'estimated_savings': _estimated_llm_savings(),
             'cached_responses': stats.get('valid_files', 0),
             'expired_files': stats.get('expired_files', 0),
             'cache_size_mb': stats.get('total_size_mb', 0),
             'cache_directory': stats.get('cache_dir', 'cache/openai'),
+            'hits': stats.get('hits', 0),
+            'misses': stats.get('misses', 0),
+            'evictions': stats.get('evictions', 0),
+            'corrupt_entries': stats.get('corrupt_entries', 0),
+            'hit_rate': stats.get('hit_rate', 0.0),
+            'max_size_mb': stats.get('max_size_mb'),
+            'max_entries': stats.get('max_entries'),
+            'eviction_policy': stats.get('eviction_policy', 'lru'),
             'message': f"OpenAI cache contains {stats.get('valid_files', 0)} responses ({stats.get('total_size_mb', 0):.2f} MB)"
         }
         
@@ -130,26 +165,91 @@ def clear_openai_cache() -> Dict[str, Any]:
         }
 
 
+def clear_research_artifacts() -> Dict[str, Any]:
+    """Clear the stored company/role/interviewer research analyses"""
+    try:
+        from shared.research_artifacts import get_artifact_store
+        
+        removed = get_artifact_store().clear()
+        
+        return {
+            'success': True,
+            'message': f'Successfully cleared research artifacts - {removed} analyses removed',
+            'artifacts_removed': removed
+        }
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e),
+            'message': f'Failed to clear research artifacts: {str(e)}',
+            'artifacts_removed': 0
+        }
+
+
+def clear_company_responses(company_name: str) -> Dict[str, Any]:
+    """Clear cached LLM responses tagged with a company"""
+    try:
+        from shared.openai_cache import OpenAICache
+        
+        removed = OpenAICache().invalidate_company(company_name)
+        
+        return {
+            'success': True,
+            'message': f"Removed {removed} cached responses for '{company_name}'",
+            'responses_removed': removed
+        }
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e),
+            'message': f"Failed to clear responses for '{company_name}': {str(e)}",
+            'responses_removed': 0
+        }
+
+
 def clear_all_caches() -> Dict[str, Any]:
-    """Clear both Tavily and OpenAI caches"""
+    """Clear the Tavily and OpenAI caches and the stored research analyses"""
     print("🧹 Clearing Tavily cache...")
     tavily_result = clear_tavily_cache()
     
     print("🧹 Clearing OpenAI cache...")
     openai_result = clear_openai_cache()
     
-    total_items_removed = tavily_result.get('files_removed', 0) + openai_result.get('responses_removed', 0)
-    overall_success = tavily_result.get('success', False) and openai_result.get('success', False)
+    print("🧹 Clearing research artifacts...")
+    research_result = clear_research_artifacts()
+    
+    total_items_removed = (tavily_result.get('files_removed', 0) + openai_result.get('responses_removed', 0)
+                           + research_result.get('artifacts_removed', 0))
+    overall_success = all(r.get('success', False) for r in (tavily_result, openai_result, research_result))
     
     return {
         'success': overall_success,
         'tavily_result': tavily_result,
         'openai_result': openai_result,
+        'research_result': research_result,
         'total_items_removed': total_items_removed,
         'message': f'Cleared {total_items_removed} total cached items'
     }
 
 
+def _print_cache_usage(info: Dict[str, Any]):
+    """Print hit/miss/eviction counters and size budget for one cache"""
+    print(f"   🎯 Hits / Misses: {info.get('hits', 0)} / {info.get('misses', 0)} ({info.get('hit_rate', 0.0) * 100:.1f}% hit rate)")
+    print(f"   ♻️  Evictions: {info.get('evictions', 0)}")
+    if info.get('corrupt_entries'):
+        print(f"   ⚠️  Corrupt entries removed: {info['corrupt_entries']}")
+    
+    limits = []
+    if info.get('max_size_mb'):
+        limits.append(f"{info['max_size_mb']:.0f} MB")
+    if info.get('max_entries'):
+        limits.append(f"{info['max_entries']} entries")
+    budget = ', '.join(limits) if limits else 'unbounded'
+    print(f"   📏 Budget: {budget} ({info.get('eviction_policy', 'lru').upper()} eviction)")
+
+
 def display_cache_status():
     """Display current cache status in a formatted way"""
     print("📊 INTERVIEW PREP WORKFLOW - CACHE STATUS")
@@ -166,6 +266,7 @@ def display_cache_status():
             print(f"   ✅ Valid Files: {tavily_info['valid_files']}")
             print(f"   ⏰ Expired Files: {tavily_info.get('expired_files', 0)}")
         print(f"   💾 Size: {tavily_info.get('cache_size_mb', 0)} MB")
+        _print_cache_usage(tavily_info)
         if cached_queries > 0:
             print(f"   🟢 Status: Active with cached data")
         else:
@@ -185,6 +286,7 @@ def display_cache_status():
         cached_responses = openai_info.get('cached_responses', 0)
         print(f"   📊 Cached Responses: {cached_responses}")
         print(f"   💾 Size: {openai_info.get('cache_size_mb', 0)} MB")
+        _print_cache_usage(openai_info)
         if openai_info.get('estimated_savings', 0) > 0:
             print(f"   💰 Estimated Savings: ${openai_info.get('estimated_savings', 0):.3f}")
         if cached_responses > 0:
@@ -252,10 +354,10 @@ def optimize_caches():
     
     # Optimize Tavily cache
     try:
-        from shared.tavily_cache import get_tavily_cache
+        from shared.simple_cache import get_tavily_cache
         
         cache = get_tavily_cache()
-        expired_removed = cache.clear_expired_cache()
+        expired_removed = cache.evict_expired()
         
         if expired_removed > 0:
             print(f"🔍 Tavily: Removed {expired_removed} expired cache files")
@@ -265,12 +367,243 @@ def optimize_caches():
     except Exception as e:
         print(f"🔍 Tavily: Error optimizing cache - {str(e)}")
     
-    # OpenAI cache doesn't typically have expiration, but we can check
-    print(f"🤖 OpenAI: Cache optimization not needed (no expiration)")
+    # Optimize OpenAI cache
+    try:
+        from shared.simple_cache import get_openai_cache
+        
+        cache = get_openai_cache()
+        expired_removed = cache.evict_expired()
+        
+        if expired_removed > 0:
+            print(f"🤖 OpenAI: Removed {expired_removed} expired cached responses")
+        else:
+            print(f"🤖 OpenAI: No expired cached responses found")
+            
+    except Exception as e:
+        print(f"🤖 OpenAI: Error optimizing cache - {str(e)}")
     
     print("✅ Cache optimization completed")
 
 
+def recompress_caches(codec: str) -> Dict[str, Any]:
+    """Rewrite Tavily and OpenAI cache files with the given payload codec"""
+    try:
+        from shared.simple_cache import get_tavily_cache, get_openai_cache
+        
+        results = {}
+        for name, cache in (('tavily', get_tavily_cache()), ('openai', get_openai_cache())):
+            if not hasattr(cache, 'recompress'):
+                results[name] = {'rewritten': 0, 'skipped': 0, 'bytes_before': 0, 'bytes_after': 0,
+                                 'note': 'SQLite payloads are already compressed'}
+                continue
+            results[name] = cache.recompress(codec)
+        
+        bytes_before = sum(r['bytes_before'] for r in results.values())
+        bytes_after = sum(r['bytes_after'] for r in results.values())
+        
+        return {
+            'success': True,
+            'results': results,
+            'bytes_before': bytes_before,
+            'bytes_after': bytes_after,
+            'message': f"Recompressed caches with '{codec}': {bytes_before / (1024 * 1024):.2f} MB → {bytes_after / (1024 * 1024):.2f} MB"
+        }
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e),
+            'message': f'Failed to recompress caches: {str(e)}'
+        }
+
+
+class _RequestPacer:
+    """Spaces request start times across worker threads to a maximum rate"""
+    
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def plan_warm_queries(max_interviews: int = 10) -> Tuple[List[Dict[str, Any]], List[Tuple[str, int]]]:
+    """
+    Tavily searches the Deep Research Pipeline will run for upcoming interviews
+    
+    Returns:
+        (interviews, unique (query, max_results) pairs in first-seen order)
+    """
+    from agents.memory_systems.shared_memory import SharedMemorySystem
+    from pipelines.deep_research_pipeline import DeepResearchPipeline
+    
+    interviews = SharedMemorySystem().get_unprepped_interviews(max_results=max_interviews)
+    
+    planned = {}
+    for interview in interviews:
+        for search in DeepResearchPipeline.research_queries(
+            (interview.get('company') or '').strip(),
+            (interview.get('role') or '').strip(),
+            (interview.get('interviewer') or '').strip()
+        ):
+            planned.setdefault(search, None)
+    
+    return interviews, list(planned)
+
+
+def warm_caches(max_interviews: int = 10, workers: int = 4, requests_per_second: float = 2.0) -> Dict[str, Any]:
+    """
+    Prefetch research for unprepped interviews into the Tavily cache
+    
+    Queries already cached are served from the cache; the rest are fetched in
+    parallel, started at no more than `requests_per_second`.
+    """
+    try:
+        from shared.simple_cache import cached_tavily_search
+        
+        interviews, searches = plan_warm_queries(max_interviews)
+        if not searches:
+            return {
+                'success': True,
+                'interviews': len(interviews),
+                'queries': 0,
+                'with_results': 0,
+                'empty': 0,
+                'failed': 0,
+                'elapsed_seconds': 0.0,
+                'message': f'No research to warm for {len(interviews)} upcoming interviews'
+            }
+        
+        pacer = _RequestPacer(requests_per_second)
+        
+        def warm(query: str, max_results: int) -> list:
+            pacer.wait()
+            # Entries past the soft TTL are refetched rather than served stale
+            return cached_tavily_search(query, max_results=max_results, stale_while_revalidate=False)
+        
+        start = time.time()
+        with_results = empty = failed = 0
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="cache-warm") as executor:
+            futures = [executor.submit(warm, query, max_results) for query, max_results in searches]
+            for future in as_completed(futures):
+                try:
+                    if future.result():
+                        with_results += 1
+                    else:
+                        empty += 1
+                except Exception:
+                    failed += 1
+        elapsed = time.time() - start
+        
+        return {
+            'success': True,
+            'interviews': len(interviews),
+            'queries': len(searches),
+            'with_results': with_results,
+            'empty': empty,
+            'failed': failed,
+            'elapsed_seconds': elapsed,
+            'message': f'Warmed {len(searches)} research queries for {len(interviews)} upcoming interviews in {elapsed:.1f}s'
+        }
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e),
+            'message': f'Failed to warm caches: {str(e)}'
+        }
+
+
+def generate_report(since_hours: float = None) -> Dict[str, Any]:
+    """Token, cost and latency summary from the telemetry sink"""
+    try:
+        from shared.telemetry import get_telemetry_sink
+        
+        since = time.time() - since_hours * 3600 if since_hours else None
+        report = get_telemetry_sink().report(since)
+        window = f"the last {since_hours:g}h" if since_hours else "all recorded runs"
+        
+        return {
+            'success': True,
+            **report,
+            'message': f"{report['total_calls']} calls over {window}: "
+                       f"${report['total_cost_usd']:.3f} spent, ${report['total_saved_usd']:.3f} saved by caches"
+        }
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e),
+            'message': f'Failed to build telemetry report: {str(e)}'
+        }
+
+
+def display_report(since_hours: float = None):
+    """Print per-stage cost and p50/p95 latency tables"""
+    print("📈 TOKEN, COST AND LATENCY REPORT")
+    print("=" * 60)
+    result = generate_report(since_hours)
+    
+    if not result['success']:
+        print(f"❌ {result['message']}")
+        return
+    
+    print(f"✅ {result['message']}")
+    if not result['total_calls']:
+        print("💡 Run the workflow to record telemetry (TELEMETRY_ENABLED=true)")
+        return
+    
+    print(f"\n📊 BY PIPELINE STAGE")
+    print(f"   {'Stage':<16}{'Calls':>7}{'Hit %':>8}{'Prompt tok':>12}{'Compl tok':>11}{'Tavily':>8}{'Cost $':>9}{'Saved $':>9}")
+    for name, stage in sorted(result['stages'].items()):
+        print(f"   {name:<16}{stage['calls']:>7}{stage['hit_rate']:>8.0%}{stage['prompt_tokens']:>12}"
+              f"{stage['completion_tokens']:>11}{stage['tavily_searches']:>8}"
+              f"{stage['cost_usd']:>9.3f}{stage['saved_usd']:>9.3f}")
+        if stage['errors']:
+            print(f"      ❌ {stage['errors']} failed calls")
+    
+    print(f"\n⏱️  LATENCY (seconds)")
+    print(f"   {'Call':<8}{'Model':<22}{'Source':<8}{'Calls':>7}{'p50':>9}{'p95':>9}")
+    for row in result['latency']:
+        print(f"   {row['kind']:<8}{row['model']:<22}{row['source']:<8}{row['calls']:>7}"
+              f"{row['p50']:>9.3f}{row['p95']:>9.3f}")
+
+
+def migrate_to_sqlite() -> Dict[str, Any]:
+    """Import the JSON file caches into the single SQLite cache store"""
+    try:
+        from shared.simple_cache import SQLiteCache, cache_path
+        database = cache_path("cache.db")
+        
+        tavily_store = SQLiteCache(database, "tavily", ttl_hours=24)
+        openai_store = SQLiteCache(database, "openai", ttl_hours=168)
+        
+        tavily_imported = tavily_store.import_json_dir(cache_path("tavily"))
+        openai_imported = openai_store.import_json_dir(cache_path("openai"))
+        
+        return {
+            'success': True,
+            'tavily_imported': tavily_imported,
+            'openai_imported': openai_imported,
+            'database': database,
+            'message': f'Imported {tavily_imported + openai_imported} entries into {database}'
+        }
+        
+    except Exception as e:
+        return {
+            'success': False,
+            'error': str(e),
+            'message': f'Failed to migrate caches to SQLite: {str(e)}'
+        }
+
+
 def main():
     """Main entry point for cache manager"""
     parser = argparse.ArgumentParser(
@@ -282,8 +615,14 @@ Examples:
   python workflows/cache_manager.py --info            # Show detailed cache info
   python workflows/cache_manager.py --clear-tavily    # Clear only Tavily cache
   python workflows/cache_manager.py --clear-openai    # Clear only OpenAI cache
-  python workflows/cache_manager.py --clear-all       # Clear both caches
+  python workflows/cache_manager.py --clear-all       # Clear both caches and research artifacts
+  python workflows/cache_manager.py --clear-research  # Clear stored company/role/interviewer analyses
+  python workflows/cache_manager.py --clear-company "Acme"  # Clear LLM responses tagged with a company
   python workflows/cache_manager.py --optimize        # Remove expired cache entries
+  python workflows/cache_manager.py --migrate-sqlite  # Import JSON caches into SQLite (use with CACHE_BACKEND=sqlite)
+  python workflows/cache_manager.py --recompress --codec zstd  # Compress existing cache files (set CACHE_CODEC to keep new writes compressed)
+  python workflows/cache_manager.py --warm --warm-workers 8  # Prefetch research for unprepped interviews
+  python workflows/cache_manager.py --report --since-hours 24  # Tokens, cost and p50/p95 latency by stage
 
 Cache Integration:
   📧 Email Pipeline: Entity extraction caching
@@ -293,6 +632,7 @@ Cache Integration:
 Cache Locations:
   Tavily Research: cache/tavily/
   OpenAI LLM: .openai_cache/
+  Research Artifacts: cache/research_artifacts.db
         """
     )
     
@@ -305,14 +645,38 @@ Cache Locations:
     parser.add_argument('--clear-openai', action='store_true',
                        help='Clear OpenAI response cache (used by Prep Guide Pipeline)')
     parser.add_argument('--clear-all', action='store_true',
-                       help='Clear both Tavily and OpenAI caches')
+                       help='Clear Tavily and OpenAI caches and research artifacts')
+    parser.add_argument('--clear-research', action='store_true',
+                       help='Clear stored company/role/interviewer research analyses (Deep Research Pipeline)')
+    parser.add_argument('--clear-company', type=str, metavar='COMPANY',
+                       help='Clear cached LLM responses tagged with the given company')
     parser.add_argument('--optimize', action='store_true',
                        help='Optimize caches by removing expired entries')
+    parser.add_argument('--migrate-sqlite', action='store_true',
+                       help='Import existing JSON cache files into the SQLite cache store')
+    parser.add_argument('--recompress', action='store_true',
+                       help='Rewrite existing cache files with a compressed payload codec')
+    parser.add_argument('--codec', choices=['json', 'compact', 'zlib', 'zstd'],
+                       default=os.getenv('CACHE_CODEC', 'zlib'),
+                       help='Payload codec for --recompress (default: CACHE_CODEC or zlib)')
+    parser.add_argument('--warm', action='store_true',
+                       help='Prefetch Tavily research for unprepped interviews in the interview store')
+    parser.add_argument('--warm-interviews', type=int, default=10, metavar='N',
+                       help='Maximum number of upcoming interviews to warm (default: 10)')
+    parser.add_argument('--warm-workers', type=int, default=4, metavar='N',
+                       help='Parallel searches while warming (default: 4)')
+    parser.add_argument('--warm-rate', type=float, default=2.0, metavar='RPS',
+                       help='Maximum searches started per second while warming (default: 2.0)')
+    parser.add_argument('--report', action='store_true',
+                       help='Show token, cost and latency telemetry by pipeline stage')
+    parser.add_argument('--since-hours', type=float, metavar='HOURS',
+                       help='Only report calls from the last HOURS hours')
     
     args = parser.parse_args()
     
-    # If no arguments provided, show status by default
-    if not any(vars(args).values()):
+    # If no action provided, show status by default
+    option_args = {'codec', 'warm_interviews', 'warm_workers', 'warm_rate', 'since_hours'}
+    if not any(value for name, value in vars(args).items() if name not in option_args):
         args.status = True
     
     print(f"🗂️  Interview Prep Workflow Cache Manager")
@@ -329,11 +693,68 @@ Cache Locations:
         display_detailed_info()
         return
     
+    # Handle telemetry report
+    if args.report:
+        display_report(args.since_hours)
+        return
+    
     # Handle cache optimization
     if args.optimize:
         optimize_caches()
         return
     
+    # Handle payload recompression
+    if args.recompress:
+        print(f"🗜️  RECOMPRESSING CACHE FILES ({args.codec})")
+        print("-" * 40)
+        result = recompress_caches(args.codec)
+        
+        if result['success']:
+            print(f"✅ {result['message']}")
+            for name, label in (('tavily', '🔍 Tavily Research'), ('openai', '🤖 OpenAI LLM')):
+                stats = result['results'][name]
+                if stats.get('note'):
+                    print(f"   {label}: {stats['note']}")
+                else:
+                    print(f"   {label}: {stats['rewritten']} files rewritten, {stats['skipped']} unreadable files skipped")
+            if args.codec != os.getenv('CACHE_CODEC', 'json'):
+                print(f"💡 Set CACHE_CODEC={args.codec} so new entries are written the same way")
+        else:
+            print(f"❌ {result['message']}")
+        return
+    
+    # Handle cache warm-up
+    if args.warm:
+        print("🔥 WARMING RESEARCH CACHE FOR UPCOMING INTERVIEWS")
+        print("-" * 50)
+        result = warm_caches(args.warm_interviews, args.warm_workers, args.warm_rate)
+        
+        if result['success']:
+            print(f"✅ {result['message']}")
+            if result['queries']:
+                print(f"   📥 With results: {result['with_results']}")
+                print(f"   📭 Empty: {result['empty']}")
+                if result['failed']:
+                    print(f"   ❌ Failed: {result['failed']}")
+        else:
+            print(f"❌ {result['message']}")
+        return
+    
+    # Handle JSON -> SQLite migration
+    if args.migrate_sqlite:
+        print("🚚 MIGRATING JSON CACHES TO SQLITE")
+        print("-" * 40)
+        result = migrate_to_sqlite()
+        
+        if result['success']:
+            print(f"✅ {result['message']}")
+            print(f"   🔍 Tavily Research: {result['tavily_imported']} entries")
+            print(f"   🤖 OpenAI LLM: {result['openai_imported']} entries")
+            print(f"💡 Set CACHE_BACKEND=sqlite to use the SQLite cache store")
+        else:
+            print(f"❌ {result['message']}")
+        return
+    
     # Handle cache clearing operations
     if args.clear_all:
         print("🗑️  CLEARING ALL INTERVIEW PREP WORKFLOW CACHES")
@@ -349,6 +770,7 @@ Cache Locations:
             
             print(f"   🔍 Tavily Research: {tavily_result.get('files_removed', 0)} files")
             print(f"   🤖 OpenAI LLM: {openai_result.get('responses_removed', 0)} responses")
+            print(f"   ♻️  Research Artifacts: {result['research_result'].get('artifacts_removed', 0)} analyses")
             
             print(f"\n💡 Note: Next workflow run will rebuild caches as needed")
         else:
@@ -357,6 +779,8 @@ Cache Locations:
                 print(f"   🔍 Tavily: {result['tavily_result'].get('message')}")
             if not result['openai_result'].get('success'):
                 print(f"   🤖 OpenAI: {result['openai_result'].get('message')}")
+            if not result['research_result'].get('success'):
+                print(f"   ♻️  Research Artifacts: {result['research_result'].get('message')}")
         
         return
     
@@ -381,6 +805,29 @@ Cache Locations:
             print(f"❌ {result['message']}")
         return
     
+    if args.clear_research:
+        print("🗑️  CLEARING RESEARCH ARTIFACTS")
+        print("-" * 40)
+        result = clear_research_artifacts()
+        
+        if result['success']:
+            print(f"✅ {result['message']}")
+            print(f"💡 Next research will re-validate sources for every company, role and interviewer")
+        else:
+            print(f"❌ {result['message']}")
+        return
+    
+    if args.clear_company:
+        print(f"🗑️  CLEARING CACHED LLM RESPONSES FOR '{args.clear_company}'")
+        print("-" * 40)
+        result = clear_company_responses(args.clear_company)
+        
+        if result['success']:
+            print(f"✅ {result['message']}")
+        else:
+            print(f"❌ {result['message']}")
+        return
+    
     if args.clear_openai:
         print("🗑️  CLEARING OPENAI LLM CACHE")
         print("-" * 40)
@@ -19,7 +19,7 @@ import os
 import sys
 import argparse
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable
 from dotenv import load_dotenv
 
 # Add project root to path
@@ -36,6 +36,9 @@ from shared.google_oauth.google_email_functions import get_email_messages, get_e
 
 # Import cache management
 from workflows.cache_manager import get_openai_cache_info, clear_openai_cache
+from shared.simple_cache import get_singleflight_stats, get_near_duplicate_stats, swr_stats
+from shared.rate_limiter import get_rate_limit_stats
+from shared.telemetry import set_telemetry_context, tavily_cost
 
 
 class InterviewPrepWorkflow:
@@ -43,13 +46,18 @@ class InterviewPrepWorkflow:
     Main Interview Prep Workflow - Orchestrates all pipeline components
     """
     
-    def __init__(self):
+    def __init__(self, stream: bool = False, stream_callback: Optional[Callable[[str, str], None]] = None):
+        """
+        Args:
+            stream: Stream prep guides into their output files as they are generated
+            stream_callback: Called with (company, partial prep guide) while streaming
+        """
         load_dotenv()
         
         # Initialize pipeline components
         self.email_pipeline = EmailPipeline()
         self.research_pipeline = DeepResearchPipeline()
-        self.prep_guide_pipeline = EnhancedPrepGuidePipeline()
+        self.prep_guide_pipeline = EnhancedPrepGuidePipeline(stream=stream, stream_callback=stream_callback)
 
         print("🚀 INTERVIEW PREP WORKFLOW INITIALIZED")
         print("Pipeline Components Loaded:")
@@ -111,8 +119,15 @@ class InterviewPrepWorkflow:
             workflow_result['total_emails_fetched'] = len(emails)
             print(f"✅ Fetched {len(emails)} emails from Gmail")
             
-            # Step 2: Process each email individually through pipeline
-            print(f"\n🔄 STEP 2: Processing emails individually through pipeline")
+            # Step 2: Classify every email and plan the run's research queries once
+            print(f"\n🧭 STEP 2: Classifying emails and planning research queries")
+            email_pipeline_results = [
+                self._run_email_pipeline(email, email_index) for email_index, email in enumerate(emails, 1)
+            ]
+            workflow_result['query_plan_stats'] = self._plan_run_research(email_pipeline_results)
+            
+            # Step 3: Process each email individually through pipeline
+            print(f"\n🔄 STEP 3: Processing emails individually through pipeline")
             
             for email_index, email in enumerate(emails, 1):
                 print(f"\n" + "🌟" * 25 + f" EMAIL {email_index}/{len(emails)} " + "🌟" * 25)
@@ -120,7 +135,7 @@ class InterviewPrepWorkflow:
                 print(f"📧 Subject: {email.get('subject', 'No subject')[:60]}{'...' if len(email.get('subject', '')) > 60 else ''}")
                 print(f"📅 Date: {email.get('date', 'Unknown')}")
                 
-                email_result = self._process_single_email(email, email_index)
+                email_result = self._process_single_email(email, email_index, email_pipeline_results[email_index - 1])
                 workflow_result['individual_results'].append(email_result)
                 
                 # Update workflow statistics
@@ -138,8 +153,12 @@ class InterviewPrepWorkflow:
             
             workflow_result['success'] = True
             workflow_result['processing_time'] = (datetime.now() - workflow_start_time).total_seconds()
+            workflow_result['singleflight_stats'] = get_singleflight_stats()
+            workflow_result['swr_stats'] = dict(swr_stats)
+            workflow_result['near_duplicate_stats'] = get_near_duplicate_stats()
+            workflow_result['rate_limit_stats'] = get_rate_limit_stats()
             
-            # Step 3: Display final workflow summary
+            # Step 4: Display final workflow summary
             self._display_final_workflow_summary(workflow_result)
             
             return workflow_result
@@ -149,6 +168,40 @@ class InterviewPrepWorkflow:
             workflow_result['processing_time'] = (datetime.now() - workflow_start_time).total_seconds()
             print(f"💥 WORKFLOW FAILED: {str(e)}")
             return workflow_result
+        
+        finally:
+            self.research_pipeline.clear_run_research()
+    
+    def _run_email_pipeline(self, email: Dict[str, Any], email_index: int) -> Optional[Dict[str, Any]]:
+        """Stage 1 for one email ahead of research planning; None if it failed (retried per email)"""
+        try:
+            set_telemetry_context(stage='email_pipeline', email_index=email_index)
+            return self.email_pipeline.process_email(email, email_index)
+        except Exception as e:
+            print(f"❌ Email pipeline error for email {email_index}: {str(e)}")
+            return None
+    
+    def _plan_run_research(self, email_pipeline_results: List[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Fetch the research searches of every unprepped interview email once
+        
+        Emails about the same company, role or interviewer share searches; each
+        unique search runs once and serves every email's research.
+        """
+        entities_list = [
+            pipeline_result.get('entities', {})
+            for pipeline_result in email_pipeline_results
+            if pipeline_result and pipeline_result.get('is_interview') and not pipeline_result.get('already_prepped')
+        ]
+        if not entities_list:
+            return {}
+        
+        set_telemetry_context(stage='deep_research')
+        try:
+            return self.research_pipeline.plan_run_research(entities_list)
+        except Exception as e:
+            print(f"⚠️ Run-level query plan failed, researching each email separately: {str(e)}")
+            return {}
     
     def _fetch_emails_from_gmail(self, folder_name: str, max_results: int) -> List[Dict[str, Any]]:
         """Fetch emails from Gmail folder"""
@@ -167,13 +220,15 @@ class InterviewPrepWorkflow:
             print(f"❌ Error fetching emails from Gmail: {str(e)}")
             return []
     
-    def _process_single_email(self, email: Dict[str, Any], email_index: int) -> Dict[str, Any]:
+    def _process_single_email(self, email: Dict[str, Any], email_index: int,
+                              email_pipeline_result: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Process single email through all pipeline stages
         
         Args:
             email: Email data dictionary
             email_index: Index of email being processed
+            email_pipeline_result: Stage 1 result if already computed by run_workflow
             
         Returns:
             Complete processing result for this email
@@ -200,7 +255,11 @@ class InterviewPrepWorkflow:
         try:
             # PIPELINE STAGE 1: Email Processing (Classification + Entity Extraction + Memory Check)
             print(f"\n🔄 PIPELINE STAGE 1: Email Processing")
-            email_pipeline_result = self.email_pipeline.process_email(email, email_index)
+            set_telemetry_context(stage='email_pipeline', email_index=email_index)
+            if email_pipeline_result is None:
+                email_pipeline_result = self.email_pipeline.process_email(email, email_index)
+            else:
+                print(f"✅ Classified during run planning")
             result['pipeline_results']['email_pipeline'] = email_pipeline_result
             result['detailed_logs']['email_pipeline'] = self._extract_email_pipeline_logs(email_pipeline_result)
             
@@ -219,6 +278,7 @@ class InterviewPrepWorkflow:
             
             # PIPELINE STAGE 2: Deep Research (Multi-agent Research + Reflection Loops)
             print(f"\n🔄 PIPELINE STAGE 2: Deep Research")
+            set_telemetry_context(stage='deep_research', email_index=email_index)
             research_pipeline_result = self.research_pipeline.conduct_deep_research(
                 email_pipeline_result.get('entities', {}), 
                 email_index
@@ -253,6 +313,7 @@ class InterviewPrepWorkflow:
             
             # PIPELINE STAGE 4: Prep Guide Generation
             print(f"\n🔄 PIPELINE STAGE 4: Prep Guide Generation")
+            set_telemetry_context(stage='prep_guide', email_index=email_index)
             prep_guide_result = self.prep_guide_pipeline.generate_prep_guide(
                 email,
                 email_pipeline_result.get('entities', {}),
@@ -324,6 +385,50 @@ class InterviewPrepWorkflow:
         print(f"   🔬 Deep Research Pipeline: {'✅ USED' if workflow_result['research_conducted_count'] > 0 else '❌ NOT USED'} ({workflow_result['research_conducted_count']}/{interview_emails} interviews)")
         print(f"   📚 Prep Guide Pipeline: {'✅ USED' if workflow_result['prep_guides_generated'] > 0 else '❌ NOT USED'} ({workflow_result['prep_guides_generated']}/{interview_emails} interviews)")
         
+        # Duplicate API calls avoided by request coalescing
+        singleflight_stats = workflow_result.get('singleflight_stats', {})
+        if singleflight_stats:
+            print(f"\n🔗 API REQUEST COALESCING:")
+            for provider, label in (('tavily', '🔍 Tavily'), ('openai', '🤖 OpenAI')):
+                stats = singleflight_stats.get(provider, {})
+                print(f"   {label}: {stats.get('executions', 0)} calls made, {stats.get('coalesced', 0)} duplicate calls coalesced")
+        
+        stale_served = workflow_result.get('swr_stats', {}).get('stale_served', 0)
+        if stale_served:
+            print(f"   ♻️  Stale Tavily results served while refreshing: {stale_served}")
+        
+        near_duplicates = workflow_result.get('near_duplicate_stats', {})
+        reused = near_duplicates.get('normalized_hits', 0) + near_duplicates.get('fuzzy_hits', 0)
+        if reused:
+            print(f"   🔁 Near-duplicate Tavily queries reused: {reused} "
+                  f"({near_duplicates.get('fuzzy_hits', 0)} fuzzy, {near_duplicates.get('normalized_hits', 0)} normalized)")
+        
+        # Searches shared by several emails, fetched once for the run
+        query_plan = workflow_result.get('query_plan_stats', {})
+        if query_plan:
+            print(f"\n🧭 RUN-LEVEL QUERY PLAN:")
+            fetched = "searched per email within the research budget" if query_plan.get('budgeted') else "fetched once"
+            print(f"   🔍 {query_plan['planned']} research searches for {query_plan['emails']} interview emails, "
+                  f"{query_plan['unique']} unique {fetched}")
+            print(f"   💰 Duplicate searches avoided: {query_plan['duplicates_avoided']} "
+                  f"(~${query_plan['duplicates_avoided'] * tavily_cost():.3f} saved)")
+            if query_plan.get('artifacts_reused'):
+                print(f"   ♻️  Stored company/role/interviewer analyses reused: {query_plan['artifacts_reused']}")
+        
+        # Provider throttling, retries and circuit breakers
+        rate_limit_stats = workflow_result.get('rate_limit_stats', {})
+        if rate_limit_stats:
+            print(f"\n🚦 RATE LIMITING & RETRIES:")
+            for provider, label in (('tavily', '🔍 Tavily'), ('openai', '🤖 OpenAI')):
+                stats = rate_limit_stats.get(provider)
+                if not stats:
+                    continue
+                print(f"   {label}: {stats['calls']} calls, {stats['retries']} retries "
+                      f"({stats['rate_limited']} rate limited), {stats['failures']} failed")
+                print(f"      ⏳ Throttled {stats['throttled']} times ({stats['wait_seconds']:.1f}s waiting); "
+                      f"circuit {stats['circuit_state']} (opened {stats['circuit_opened']}x, "
+                      f"{stats['circuit_rejected']} calls rejected)")
+        
         # Success rate calculation
         if interview_emails > 0:
             success_rate = (workflow_result['prep_guides_generated'] / interview_emails) * 100
@@ -472,6 +577,8 @@ if __name__ == "__main__":
                        help='Maximum number of emails to process (default: 10)')
     parser.add_argument('--folder', type=str, default='demo', 
                        help='Gmail folder to process (default: demo)')
+    parser.add_argument('--stream', action='store_true',
+                       help='Stream prep guides into outputs/fullworkflow section by section as they are generated')
     
     args = parser.parse_args()
     
@@ -514,7 +621,7 @@ if __name__ == "__main__":
         print(f"⚠️ Cache status check error: {str(e)}")
     
     try:
-        workflow = InterviewPrepWorkflow()
+        workflow = InterviewPrepWorkflow(stream=args.stream)
         results = workflow.run_workflow(max_emails=args.max_emails, folder=args.folder)
         
         if results['success']: